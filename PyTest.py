@@ -1 +1 @@
-#!/usr/bin/env python3# -*- coding: utf-8 -*-"""Created on Tue Dec 19 14:55:52 2023@author: A00315995# Program Name: PyTest.py# Purpose: This program performs unit testing of the statistics functions in main.py"""from main import calculate_mean, calculate_median, calculate_mode, calculate_range, calculate_interquartile, calculate_std_deviation, calculate_skewness, calculate_correlationimport pytestdef test_calculate_mean():    """    Test function for the calculate_mean function.    Returns    -------    None.    """    assert calculate_mean([11, 12, 13, 14, 15]) == 13    def test_calculate_median():    """    Test function for the calculate_median function.    Returns    -------    None.    """    data1 = [1, 2, 3, 4, 5]     # For odd number of values    data2 = [1, 2, 3, 4]        # For even number of values    assert calculate_median(data1) == 3    assert calculate_median(data2) == 2.5def test_calculate_mode():    """    Test function for the calculate_mode function.    Returns    -------    None.    """    data = [1, 2, 2, 3, 4, 4, 4, 5, 5, 5, 5]    assert calculate_mode(data) == 5def test_calculate_range():    """    Test function for the calculate_range function    Returns    -------    None.    """    assert calculate_range([1, 5, 9, 3, 7]) == 8     def test_calculate_interquartile():    """    Test function for the calculate_interquartile function    Returns    -------    None.    """    data1 = [1.1, 2, 3, 4, 5]    # For odd number of values    data2 = [1.1, 2, 3, 4]       # For even number of values    assert calculate_interquartile(data1) == pytest.approx(2.95,0.01)    assert calculate_interquartile(data2) == pytest.approx(1.95,0.01)     def test_calculate_std_deviation():    """    Test function for the calculate_std_deviation function    Returns    -------    None.    """    data = [1, 2, 3, 4, 5.5]    assert calculate_std_deviation(data) == pytest.approx(1.74,0.01)    def test_calculate_skewness():    """    Test function for the calculate_skewness function    Returns    -------    None.    """    data = [1, 2, 2, 3, 3, 3, 4, 4, 4, 4]    assert calculate_skewness(data,True) == pytest.approx(-0.95,0.01)    assert calculate_skewness(data,False) == pytest.approx(0.0,0.01)def test_calculate_correlation():    """    Test function for the calculate_correlation function    Returns    -------    None.    """    test_input1 = [10, 20, 30, 40, 50]    test_input2 = [5, 15, 25, 35, 45]    assert calculate_correlation(test_input1, test_input2) == pytest.approx(1.0,0.01)    if __name__ == "__main__":    pytest.main([__file__,"-v"])
\ No newline at end of file
+#!/usr/bin/env python3# -*- coding: utf-8 -*-"""Created on Tue Dec 19 14:55:52 2023@author: A00315995# Program Name: PyTest.py# Purpose: This program performs unit testing of the statistics functions in main.py"""from array import arrayimport ioimport jsonimport mathimport osimport pickleimport subprocessimport sysfrom main import calculate_mean, calculate_median, calculate_mode, calculate_range, calculate_interquartile, calculate_std_deviation, calculate_skewness, calculate_correlationfrom main import show_rank_of_titlefrom table import Movie, load_tablefrom describe import describefrom frequency import FrequencyTablefrom quantiles import KLLSketch, quantiles, _select_pythonfrom online import Accumulatorfrom cache import load_cached, read_cachefrom cli import ANALYSES, main as run_command_line, run_statsfrom backend import set_backendfrom groupby import group_byfrom render import render_allfrom histogram import Histogram, choose_width, count_bins, count_bins_2d, nice_widthfrom charts import box_summaryfrom benchmarks import compare_results, load_column_lists, retained_bytes, write_synthetic_datasetfrom rank_index import RankIndex, rank_index, row_of_titlefrom title_index import TitleIndex, normalise_title, searchfrom ingest import CHUNK_SIZE, chunk_ranges, ingestfrom shards import load_source, shard_paths, summarise_shardsfrom correlation import CovarianceMatrix, correlation_matrixfrom memo import Memo, table_fingerprintfrom views import Selection, TableView, between, decades, filter_table, parse_condition, where, year_rangeimport profilingfrom bootstrap import STATISTICS as BOOTSTRAP_STATISTICS, batch_sizes, bootstrap, statistic_offrom trends import RollingMedian, year_trendfrom derived import DERIVED_COLUMNSimport pytest@pytest.fixture(autouse=True, params=["python", "numpy"])def backend(request):    """    Run every test once with the pure-Python backend and once with the NumPy backend.    Returns    -------    str        The name of the backend in use.    """    if request.param == "numpy":        pytest.importorskip("numpy")    yield set_backend(request.param)    set_backend()def test_calculate_mean():    """    Test function for the calculate_mean function.    Returns    -------    None.    """    assert calculate_mean([11, 12, 13, 14, 15]) == 13def test_calculate_median():    """    Test function for the calculate_median function.    Returns    -------    None.    """    data1 = [1, 2, 3, 4, 5]     # For odd number of values    data2 = [1, 2, 3, 4]        # For even number of values    assert calculate_median(data1) == 3    assert calculate_median(data2) == 2.5def test_calculate_mode():    """    Test function for the calculate_mode function.    Returns    -------    None.    """    data = [1, 2, 2, 3, 4, 4, 4, 5, 5, 5, 5]    assert calculate_mode(data) == 5def test_calculate_range():    """    Test function for the calculate_range function    Returns    -------    None.    """    assert calculate_range([1, 5, 9, 3, 7]) == 8     def test_calculate_interquartile():    """    Test function for the calculate_interquartile function    Returns    -------    None.    """    data1 = [1.1, 2, 3, 4, 5]    # For odd number of values    data2 = [1.1, 2, 3, 4]       # For even number of values    assert calculate_interquartile(data1) == pytest.approx(2.95,0.01)    assert calculate_interquartile(data2) == pytest.approx(1.95,0.01)     def test_calculate_std_deviation():    """    Test function for the calculate_std_deviation function    Returns    -------    None.    """    data = [1, 2, 3, 4, 5.5]    assert calculate_std_deviation(data) == pytest.approx(1.74,0.01)def test_calculate_skewness():    """    Test function for the calculate_skewness function    Returns    -------    None.    """    data = [1, 2, 2, 3, 3, 3, 4, 4, 4, 4]    assert calculate_skewness(data,True) == pytest.approx(-0.95,0.01)    assert calculate_skewness(data,False) == pytest.approx(0.0,0.01)def test_calculate_correlation():    """    Test function for the calculate_correlation function    Returns    -------    None.    """    test_input1 = [10, 20, 30, 40, 50]    test_input2 = [5, 15, 25, 35, 45]    assert calculate_correlation(test_input1, test_input2) == pytest.approx(1.0,0.01)def test_load_table(tmp_path):    """    Test function for the load_table function    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    dataset.write_text("\ufeffdecade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"                       "international gross,international ,year\n"                       "2000's,Paranormal Activity ,0.015,194,1293333,107.9,55.6,85.4,44,2009\n"                       "2010's,Sleight,0.25,4,1572,3.9,100,0,0,2017\n"                       "2010's,Broken,abc,4,1572,3.9,100,0,0,2017\n", encoding="utf-8")    table = load_table(str(dataset))    assert len(table) == 2    assert list(table["budget"]) == [0.015, 0.25]    assert list(table["year"]) == [2009, 2017]    assert table["title"][0] == "Paranormal Activity "    assert table["decade"].categories == ["2000's", "2010's"]    assert table.memory_per_row() > 0def test_describe():    """    Test function for the describe function, checked against the individual calculate_* functions    Returns    -------    None.    """    budget = [1, 2, 2, 3, 3, 3, 4, 4, 4, 4.5]    gross = [10, 30, 20, 35, 30, 40, 45, 41, 60, 50]    titles = [f"Movie {index}" for index in range(len(budget))]    description = describe({"budget": budget, "gross": gross}, titles, correlate=("budget", "gross"))    summary = description["budget"]    assert summary.count == 10    assert summary.mean == calculate_mean(budget)    assert summary.median == calculate_median(budget)    assert summary.mode == calculate_mode(budget)    assert summary.range == calculate_range(budget)    assert summary.interquartile == pytest.approx(calculate_interquartile(budget))    assert summary.std_deviation == calculate_std_deviation(budget)    assert summary.mode_skewness == calculate_skewness(budget, True)    assert summary.median_skewness == calculate_skewness(budget, False)    assert (summary.max_title, summary.min_title) == ("Movie 9", "Movie 0")    assert description.correlation == calculate_correlation(budget, gross)def test_frequency_table():    """    Test function for the FrequencyTable class    Returns    -------    None.    """    table = FrequencyTable([3, 1, 1, 3, 2])    assert table.mode() == 3    assert table.modes() == [(3, 2), (1, 2)]    assert table.most_common(1) == [(3, 2)]    binned = FrequencyTable([101.2, 104.9, 99.0, 250.0], bin_width=5)    assert binned.mode() == 100    assert binned[100] == 2    assert binned.merge(FrequencyTable([97.5], bin_width=5))[95] == 2def test_quantiles():    """    Test function for the quantiles function and the pure-Python selection    Returns    -------    None.    """    data = [7, 1, 9, 3, 3, 8, 2, 6, 5, 4, 10]    assert quantiles(data, [0, 0.5, 1]) == [1, 5, 10]    assert quantiles(data, [0.25, 0.75], method="halves") == [3, 8]    assert quantiles([1.1, 2, 3, 4], [0.25, 0.75], method="halves") == pytest.approx([1.55, 3.5])    assert quantiles([1, 2, 3, 4], [0.5]) == [2.5]    values = [float((index * 7919) % 1000) for index in range(1000)]    assert _select_python(values, [0, 499, 999]) == sorted(values)[0:1] + sorted(values)[499:500] + sorted(values)[999:]    with pytest.raises(ValueError):        quantiles(data, [0.95], method="halves")def test_kll_sketch():    """    Test function for the KLLSketch class    Returns    -------    None.    """    values = [float((index * 7919) % 100000) for index in range(100000)]    sketch = KLLSketch()    sketch.extend(values[:50000])    other = KLLSketch(seed=1)    other.extend(values[50000:])    sketch.merge(other)    assert sketch.count == 100000    assert sum(len(items) for items in sketch.compactors) < 1000    for probability, estimate in zip([0.05, 0.5, 0.95, 0.99], sketch.quantiles([0.05, 0.5, 0.95, 0.99])):        assert abs(estimate - probability * 100000) < 2000    assert sketch.quantiles([0, 1]) == [0.0, 99999.0]def test_accumulator(tmp_path):    """    Test function for the Accumulator class reading appended rows from a file    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    state = tmp_path / "state.json"    rows = ["2000's,A,1,10,0,0,0,0,0,2001\n", "2000's,B,2,30,0,0,0,0,0,2002\n",            "2010's,C,3,20,0,0,0,0,0,2011\n", "2010's,D,4.5,50,0,0,0,0,0,2012\n"]    dataset.write_text("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"                       "international gross,international ,year\n" + "".join(rows[:2]) + "2010's,C,3,2")    accumulator = Accumulator()    assert accumulator.update_from_file(str(dataset)) == 2    accumulator.save(str(state))    with open(dataset, "a") as datafile:        datafile.write("0,0,0,0,0,0,2011\n" + rows[3])    accumulator = Accumulator.load(str(state))    assert accumulator.update_from_file(str(dataset)) == 2    budget, gross = [1, 2, 3, 4.5], [10, 30, 20, 50]    assert accumulator.count() == 4    assert accumulator.mean("budget") == calculate_mean(budget)    assert accumulator.std_deviation("worldwide_gross") == calculate_std_deviation(gross)    assert accumulator.correlation() == calculate_correlation(budget, gross)    assert accumulator.decade_totals == {"2000's": 40.0, "2010's": 70.0}def test_load_cached(tmp_path):    """    Test function for the load_cached function, including invalidation when the CSV changes    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    header = ("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"              "international gross,international ,year\n")    dataset.write_text(header + "2000's,Amélie,10,174,0,33,19,141,81,2001\n", encoding="utf-8")    first = load_cached(str(dataset))    assert (tmp_path / "dataset.csv.cache").exists()    cached = load_cached(str(dataset))    assert cached["title"][0] == "Amélie"    assert list(cached["budget"]) == list(first["budget"])    dataset.write_text(header + "2010's,Sleight,0.25,4,1572,3.9,100,0,0,2017\n", encoding="utf-8")    reloaded = load_cached(str(dataset))    assert list(reloaded["year"]) == [2017]def test_command_line(capsys):    """    Test function for the stats command of the command line    Returns    -------    None.    """    assert run_command_line(["stats", "--stats", "mean,iqr,correlation,most_movies", "--format", "json"]) == 0    results = json.loads(capsys.readouterr().out)    assert results["rows"] == 500    assert results["columns"]["budget"]["mean"] == pytest.approx(121.04, 0.01)    assert results["correlation"]["budget,worldwide_gross"] == 0.53    assert results["decades"]["most_movies"] == {"decade": "2010's", "movies": 250}    code = "import sys, main; main.calculate_mean([1]); print('matplotlib' in sys.modules)"    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True).stdout    assert output.strip() == "False"def test_group_by():    """    Test function for the group_by function    Returns    -------    None.    """    table = {"decade": ["2000's", "1990's", "2000's", "2010's", "1990's"],             "year": [2001, 1995, 2004, 2011, 1999],             "budget": [10.0, 2.0, 30.0, 5.0, 4.0]}    result = group_by(table, "decade", {"budget": ["count", "sum", "mean", "min", "max", "median", "values"]})    assert result.counts == {"2000's": 2, "1990's": 2, "2010's": 1}    assert result.measure("budget", "sum") == {"2000's": 40.0, "1990's": 6.0, "2010's": 5.0}    assert result.measure("budget", "mean")["1990's"] == 3.0    assert result.measure("budget", "max")["2000's"] == 30.0    assert result.measure("budget", "median")["2000's"] == 20.0    assert list(result.measure("budget", "values")["1990's"]) == [2.0, 4.0]    buckets = group_by(table, ("budget", lambda budget: int(budget // 10) * 10))    assert buckets.counts == {10: 1, 0: 3, 30: 1}def test_render_all(tmp_path):    """    Test function for the render_all function writing charts and their manifest without a display    Returns    -------    None.    """    pytest.importorskip("matplotlib")    manifest = render_all(output_dir=str(tmp_path), names=["budget_histogram", "category_boxplot"],                          formats=("png", "svg"), workers=1)    assert [entry["chart"] for entry in manifest["charts"]] == ["budget_histogram"] * 2 + ["category_boxplot"] * 2    for entry in manifest["charts"]:        assert (tmp_path / f"{entry['chart']}.{entry['format']}").stat().st_size == entry["bytes"] > 0    assert (tmp_path / "manifest.json").exists()def test_chart_summaries():    """    Test function for the bin counts and box statistics the charts are drawn from    Returns    -------    None.    """    data_list = [1.0, 2.0, 2.0, 3.0, 4.0, 5.0, 50.0]    assert count_bins(data_list, [0, 2, 4, 6]) == [1, 3, 2]    assert count_bins(data_list, [0, 5, 50]) == [5, 2]    x_edges, y_edges, counts = count_bins_2d([0.0, 1.0, 1.0, 2.0], [0.0, 0.0, 2.0, 2.0], 2)    assert x_edges == [0.0, 1.0, 2.0] and y_edges == [0.0, 1.0, 2.0]    assert counts == [[1, 1], [0, 2]]    stats = box_summary(data_list, "all")    assert (stats["q1"], stats["med"], stats["q3"]) == (2.0, 3.0, 4.5)    assert (stats["whislo"], stats["whishi"]) == (1.0, 5.0)    assert stats["mean"] == pytest.approx(67 / 7) and stats["label"] == "all"    cbook = pytest.importorskip("matplotlib.cbook")    expected = cbook.boxplot_stats(data_list)[0]    for key in ("q1", "med", "q3", "whislo", "whishi", "mean"):        assert stats[key] == pytest.approx(expected[key])def test_histogram():    """    Test function for the bin width rules and the mergeable streaming Histogram    Returns    -------    None.    """    assert [nice_width(width) for width in (25.2, 89.0, 0.073, 1.0, 1234.0)] == [50.0, 100.0, 0.1, 1.0, 2000.0]    data_list = [float(value) for value in range(1, 101)]    assert choose_width(data_list, "fd") == 25.0    assert choose_width(data_list, "sturges") == 20.0    with pytest.raises(ValueError):        choose_width(data_list, "square-root")    whole = Histogram.from_values(data_list, "sturges")    assert whole.edges() == [0.0, 20.0, 40.0, 60.0, 80.0, 100.0, 120.0]    assert whole.bin_counts() == [19, 20, 20, 20, 20, 1] and whole.total() == 100    chunked = Histogram(20.0)    for start in range(0, 100, 30):        part = Histogram(20.0)        part.update(data_list[start:start + 30])        chunked.merge(part)    assert chunked.counts == whole.counts    assert Histogram.from_dict(whole.to_dict()).bin_counts() == whole.bin_counts()    with pytest.raises(ValueError):        chunked.merge(Histogram(10.0))    money = Histogram(1.0, log=True)    money.update([0.0, 5.0, 50.0, 60.0, 500.0])    assert money.edges() == [1.0, 10.0, 100.0, 1000.0]    assert money.bin_counts() == [1, 2, 1] and money.nonpositive == 1def test_benchmark_suite(tmp_path):    """    Test function for the synthetic dataset generator and the regression check of the benchmark suite    Returns    -------    None.    """    path = str(tmp_path / "synthetic.csv")    write_synthetic_dataset(path, 300, seed=4)    table = load_table(path)    assert len(table) == 300    assert set(table["decade"]) <= {"1970's", "1980's", "1990's", "2000's", "2010's", "2020's"}    assert min(table["budget"]) > 0 and min(table["year"]) >= 1970    baseline = {"sizes": {"500": {"stat.mode": {"seconds": 0.10}, "stat.mean": {"seconds": 0.001}}}}    current = {"sizes": {"500": {"stat.mode": {"seconds": 0.20}, "stat.mean": {"seconds": 0.004}},                         "5000": {"stat.mode": {"seconds": 1.0}}}}    regressions = compare_results(baseline, current, threshold=0.25)    assert [(regression["size"], regression["task"]) for regression in regressions] == [(500, "stat.mode")]    assert regressions[0]["ratio"] == pytest.approx(2.0)    assert compare_results(baseline, current, threshold=1.5) == []def test_rank_index():    """    Test function for the sorted rank index: top/bottom k, ranks with ties and range queries    Returns    -------    None.    """    index = RankIndex([5.0, 1.0, 9.0, 5.0, 3.0], ["A", "B", "C", "D", "E"])    assert index.top_k(3) == [2, 0, 3]    assert index.bottom_k(2) == [1, 4]    assert index.top_k(10) == [2, 0, 3, 4, 1]    assert [index.rank_of_row(row) for row in range(5)] == [2, 5, 1, 2, 4]    assert index.between(3.0, 5.0) == [4, 0, 3] and index.count_between(3.0, 5.0) == 3    assert index.between(3.0, 5.0, limit=1) == [4] and index.between(6.0, 8.0) == []    assert index.entries([2]) == [{"rank": 1, "title": "C", "value": 9.0}]    table = load_table()    gross = rank_index(table, "worldwide_gross")    assert rank_index(table, "worldwide_gross") is gross    highest = table["worldwide_gross"].index(max(table["worldwide_gross"]))    assert table["title"][gross.top_k(1)[0]] == table["title"][highest]    assert gross.rank_of_row(row_of_title(table, "Avatar ")) == 1    with pytest.raises(ValueError):        row_of_title(table, "Not a movie")    table.append_row(["2020's", "Extra", "1", "2", "3", "4", "5", "6", "7", "2021"])    assert not table.indexesdef test_title_index():    """    Test function for the title index: normalisation, exact, prefix and typo-tolerant lookups    Returns    -------    None.    """    assert normalise_title("  Paranormal   Activity ") == "paranormal activity"    index = TitleIndex(["Star Wars", "Paranormal Activity ", "star trek", "Avatar", "STAR WARS", "Up"])    assert index.exact("star  wars") == [0, 4]    assert index.exact("paranormal activity") == [1] and index.exact("Star") == []    assert index.prefix("star") == [2, 0, 4]    assert index.prefix("STAR ", limit=1) == [2] and index.prefix("x") == []    matches = index.fuzzy("Paranormal Activty")    assert matches[0][0] == 1 and 0.5 < matches[0][1] < 1    assert index.fuzzy("qqqq") == [] and index.fuzzy("") == []    table = load_table()    movie = search(table, "titanic")[0]    assert movie["match"] == "exact" and movie["year"] == 1997 and movie["worldwide_gross"] == 2202.0    assert [movie["title"] for movie in search(table, "the dark k")] == ["The Dark Knight", "The Dark Knight Rises"]    assert search(table, "Avengrs Endgame")[0]["title"] == "Avengers: Endgame"    with pytest.raises(ValueError):        search(table, "titanic", mode="regex")def test_ingest(tmp_path):    """    Test function for the chunked, parallel ingestion: quoted fields, the BOM, rejected rows and chunk merging    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    dataset.write_text("\ufeffdecade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"                       "international gross,international ,year\n"                       "2000's,\"Crouching Tiger, Hidden Dragon\",17,213.5,1256,128.1,60,85.4,40,2000\n"                       "2010's,Sleight,0.25,4,1572,3.9,100,0,0,2017\n"                       "\n"                       "2010's,Broken,abc,4,1572,3.9,100,0,0,2017\n"                       "2020's,\"The \"\"Quoted\"\" Movie\",1,2,200,1,50,1,50,2021\n"                       "2020's,Short,1,2\n"                       "1990's,Titanic,200,2202,1101,674.3,30.6,1527.7,69.4,1997\n", encoding="utf-8")    serial = ingest(str(dataset), workers=1)    assert serial.chunks == 1 and len(serial.table) == 4    assert serial.table["title"][0] == "Crouching Tiger, Hidden Dragon" and serial.table["budget"][0] == 17.0    assert serial.table["title"][2] == 'The "Quoted" Movie'    assert serial.table["decade"][0] == "2000's"    assert [(reject.line, reject.reason.split(":")[0]) for reject in serial.rejects] == [        (5, "budget"), (7, "expected 10 fields, got 4")]    quarantine = (tmp_path / "dataset.csv.rejects.csv").read_text(encoding="utf-8").splitlines()    assert len(quarantine) == 3 and quarantine[1].startswith("5,budget: cannot convert 'abc',2010's,Broken,abc")    assert len(chunk_ranges(str(dataset), 40)) > 3    chunked = ingest(str(dataset), workers=2, chunk_size=40, quarantine=str(tmp_path / "rejects.csv"))    assert chunked.chunks > 3 and chunked.rejects == serial.rejects    for name in ("title", "decade", "budget", "year"):        assert list(chunked.table[name]) == list(serial.table[name])    assert list(load_cached(str(dataset))["title"]) == list(serial.table["title"])    dataset.write_text("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"                       "international gross,international ,year\n2010's,Sleight,0.25,4,1572,3.9,100,0,0,2017\n")    assert not ingest(str(dataset), workers=1).rejects    assert not (tmp_path / "dataset.csv.rejects.csv").exists()    shared = tmp_path / "rejects.csv"    assert shared.exists() and ingest(str(dataset), workers=1, quarantine=str(shared)).quarantine is None    assert shared.exists()    (tmp_path / "dataset.csv.rejects.csv").write_text("not written by ingest\n")    ingest(str(dataset), workers=1)    assert (tmp_path / "dataset.csv.rejects.csv").exists()    with open(dataset, "ab") as datafile:        datafile.write(b"2010's,Caf\xe9,1,2,200,1,50,1,50,2011\n"                       b"1990's,Titanic,200,2202,1101,674.3,30.6,1527.7,69.4,1997\n")    for workers, chunk_size in ((1, CHUNK_SIZE), (2, 40)):        result = ingest(str(dataset), workers=workers, chunk_size=chunk_size)        assert list(result.table["title"]) == ["Sleight", "Titanic"]        assert [(reject.line, reject.reason.split(" (")[0]) for reject in result.rejects] == [(3, "not UTF-8 text")]        assert result.rejects[0].fields[1] == "Caf\ufffd"def test_shards(tmp_path):    """    Test function for the sharded dataset: merged per-shard summaries against the statistics of one file,    and cached summaries reused for unchanged shards    Returns    -------    None.    """    with open("dataset.csv", encoding="utf-8-sig") as datafile:        lines = datafile.readlines()    for number, start in enumerate(range(1, len(lines), 180)):        shard = "".join(lines[start:start + 180]).rstrip("\n") + "\n"        (tmp_path / f"part-{number}.csv").write_text(lines[0] + shard, encoding="utf-8")    source = str(tmp_path / "part-*.csv")    assert len(shard_paths(str(tmp_path))) == 3 and len(load_source(source)) == 500    columns = ["budget", "worldwide_gross", "year"]    expected = run_stats(load_table(), ANALYSES, columns)    merged = run_stats(summarise_shards(source, workers=2, exact_columns=columns), ANALYSES, columns)    assert merged == expected    cached = [(tmp_path / f"part-{number}.csv.summary.json").stat().st_mtime_ns for number in range(3)]    with open(tmp_path / "part-2.csv", "a") as shard:        shard.write("2020's,Extra,1000,5000,500,2500,50,2500,50,2021\n")    summary = summarise_shards(source)    assert len(summary) == 501 and summary.describe(["budget"])["budget"].max_title == "Extra"    assert [(tmp_path / f"part-{number}.csv.summary.json").stat().st_mtime_ns for number in range(2)] == cached[:2]    assert (tmp_path / "part-2.csv.summary.json").stat().st_mtime_ns != cached[2]    assert abs(summary.quantiles("budget", [0.5], exact=False)[0] - summary.quantiles("budget", [0.5])[0]) < 20    budget = list(load_table()["budget"]) + [1000]    assert summary.quantiles("budget", [0.1, 0.5, 0.95]) == quantiles(budget, [0.1, 0.5, 0.95])    assert summary.quantiles("budget", [0.25, 0.75], "halves") == quantiles(budget, [0.25, 0.75], "halves")    with pytest.raises(ValueError):        summary.describe(["year"])    for column in ("domestic_pct", "international_gross"):        assert summarise_shards(source, exact_columns=[column]).describe([column])[column].mean == \            describe({column: load_source(source)[column]})[column].mean    with open(tmp_path / "part-0.csv.summary.json") as summaryfile:        assert list(json.load(summaryfile)["summary"]["frequencies"]) == ["international_gross"]def test_correlation():    """    Test function for the correlation matrix: Pearson against calculate_correlation, Spearman ranks with ties,    merging partial matrices and constant columns    Returns    -------    None.    """    columns = {"a": [1.0, 2.0, 3.0, 4.0, 10.0], "b": [2.0, 1.0, 4.0, 3.0, 5.0], "c": [7.0] * 5,               "d": [5.0, 5.0, 1.0, 2.0, 3.0]}    matrix = correlation_matrix(columns, ["a", "b", "d"])    assert round(matrix[0][1], 2) == calculate_correlation(columns["a"], columns["b"])    assert matrix[1][0] == pytest.approx(matrix[0][1]) and matrix[2][2] == pytest.approx(1.0)    assert correlation_matrix(columns, ["a", "c"])[0] == [pytest.approx(1.0), None]    spearman = correlation_matrix(columns, ["a", "b", "d"], method="spearman")    assert spearman[0][1] == pytest.approx(0.8) and spearman[0][2] == pytest.approx(-5.5 / 95 ** 0.5)    whole = CovarianceMatrix(["a", "b"]).update(columns)    part = CovarianceMatrix(["a", "b"]).update({name: values[:2] for name, values in columns.items()})    part.merge(CovarianceMatrix(["a", "b"]).update({name: values[2:] for name, values in columns.items()}))    assert part.co_moments == [[pytest.approx(value) for value in row] for row in whole.co_moments]    table = load_table()    matrix = correlation_matrix(table)    assert len(matrix) == 8 and round(matrix[0][1], 2) == 0.53    assert round(matrix[1][5], 2) == calculate_correlation(table["worldwide_gross"], table["international_gross"])    with pytest.raises(ValueError):        correlation_matrix(table, method="kendall")def test_movie_view(tmp_path):    """    Test function for the Movie views of a MovieTable and the memory they save against lists of every column    Returns    -------    None.    """    table = load_table()    movie = table[0]    assert movie.title == "Paranormal Activity " and movie.year == 2009 and movie["budget"] == 0.015    assert dict(movie) == table.record(0) and table[-1] == table.movie(499) and table[-1].row == 499    assert [movie.decade for movie in table][:3] == list(table["decade"][:3]) and sum(1 for _ in table) == 500    assert not hasattr(movie, "__dict__") and isinstance(movie, Movie)    with pytest.raises(IndexError):        table[500]    table.append_row(["2020's", "Paranormal Activity ", "1", "2", "3", "4", "5", "6", "7", "2021"])    assert table["title"].count("Paranormal Activity ") == 2 and table[500].decade == "2020's"    path = str(tmp_path / "synthetic.csv")    write_synthetic_dataset(path, 2000)    assert retained_bytes(load_table, path) * 2 < retained_bytes(load_column_lists, path)def test_memo(tmp_path):    """    Test function for the memoization of results: hits and misses, invalidation when the table changes,    least recently used eviction and saving between sessions    Returns    -------    None.    """    table = load_table()    memo = Memo(path=str(tmp_path / "dataset.csv.memo"))    calls = []    compute = lambda: calls.append(1) or calculate_mean(table["budget"])    mean = memo.get(table, "budget", "mean", compute)    assert memo.get(table, "budget", "mean", compute) == mean and len(calls) == 1 and (memo.hits, memo.misses) == (1, 1)    memo.get(table, "budget", "mean", compute, params=(2,))    fingerprint = table_fingerprint(table)    table.append_row(["2020's", "Extra", "1000", "2", "3", "4", "5", "6", "7", "2021"])    assert table_fingerprint(table) != fingerprint    assert memo.get(table, "budget", "mean", compute) == calculate_mean(table["budget"]) != mean    assert len(calls) == 3 and memo.stats()["entries"] == 3    memo.save()    saved = Memo(path=memo.path)    assert saved.get(table, "budget", "mean", compute) == calculate_mean(table["budget"])    assert len(calls) == 3 and saved.stats()["hits"] == 1    small = Memo(max_bytes=100)    small.put("a", b"x" * 60)    small.put("b", b"y" * 30)    small.put("c", b"z" * 30)    assert list(small.entries) == ["b", "c"] and small.evictions == 1 and small.size == 60    small.put("d", b"w" * 101)    assert "d" not in small.entries    pytest.importorskip("matplotlib")    png = memo.figure(table, "piechart")    assert png.startswith(b"\x89PNG") and memo.figure(table, "piechart") is pngdef test_views():    """    Test function for the filtered views: conditions, bitmap combinations and statistics, group-by, charts and    memoized results computed on the selected movies only    Returns    -------    None.    """    table = load_table()    rows = [row for row, year in enumerate(table["year"]) if 2010 <= year <= 2019 and table["budget"][row] > 100]    view = filter_table(table, [("year", ">=", 2010), ("year", "<=", 2019), ("budget", ">", 100)])    assert list(view.rows) == rows and len(view) == len(rows) == view.selection.count()    budget = [table["budget"][row] for row in rows]    assert calculate_mean(view["budget"]) == calculate_mean(budget)    assert calculate_median(view["budget"]) == calculate_median(budget)    assert calculate_mode(view["budget"]) == calculate_mode(budget)    assert calculate_interquartile(view["budget"]) == calculate_interquartile(budget)    assert calculate_std_deviation(view["budget"]) == calculate_std_deviation(budget)    assert view["title"][0] == table["title"][rows[0]] and view.movie(-1).row == rows[-1]    assert group_by(view, "decade", {"budget": ["sum"]}).measure("budget", "sum") == {"2010's": sum(budget)}    selection = year_range(table, 2010, 2019)    assert selection.to_bytes() == decades(table, "2010's").to_bytes()    assert where(table, "decade", ">=", "2010's").count() == 280    assert (selection | ~selection).count() == 500 and (selection & ~selection).count() == 0    assert (selection & ~between(table, "budget", high=100)).to_bytes() == view.selection.to_bytes()    assert where(table, "year", "in", [1997, 2009]).count() == table["year"].count(1997) + table["year"].count(2009)    assert Selection(b"\x01\x00\x01").rows().tolist() == [0, 2]    assert parse_condition("decade=2000's,2010's") == ("decade", "in", ["2000's", "2010's"])    assert parse_condition(" gross >= 100 ") == ("gross", ">=", "100")    with pytest.raises(ValueError):        parse_condition("budget")    with pytest.raises(ValueError):        where(table, "budget", "~", 1)    with pytest.raises(ValueError):        TableView(table, Selection(b"\x01"))    memo = Memo()    assert memo.get(view, "budget", "mean", lambda: 1) == 1    assert memo.get(TableView(table, selection), "budget", "mean", lambda: 2) == 2    pytest.importorskip("matplotlib")    assert memo.figure(view, "category_boxplot").startswith(b"\x89PNG")def test_profiling():    """    Test function for the profiler: nested phases, call counts, the JSON and collapsed stack reports, and    no recording while profiling is disabled    Returns    -------    None.    """    table = load_table()    assert profiling.phase("load") is profiling.phase("draw")    assert calculate_mean(table["budget"]) == calculate_mean(list(table["budget"]))    profiler = profiling.enable()    try:        with profiling.phase("load"):            with profiling.phase("parse"):                pass        for _ in range(3):            calculate_mean(table["budget"])        describe({"budget": table["budget"]})    finally:        assert profiling.disable() is profiler    assert profiling.phase("load") is profiling.phase("draw")    report = profiler.report()    phases = [(entry["phase"], entry["calls"]) for entry in report["phases"]]    assert phases[:3] == [("load", 1), ("load;parse", 1), ("calculate_mean", 3)]    assert ("describe", 1) in phases    for entry in report["phases"]:        assert entry["wall_seconds"] >= entry["self_seconds"] >= 0 and entry["peak_bytes"] is None    lines = profiler.collapsed().splitlines()    assert len(lines) == len(phases) and lines[1].startswith("load;parse ")    assert json.loads(json.dumps(report)) == report    profiler = profiling.enable(memory=True)    try:        with profiling.phase("allocate"):            data = bytearray(1 << 20)    finally:        profiling.disable()    assert profiler.report()["phases"][0]["peak_bytes"] >= len(data)def test_bootstrap():    """    Test function for the bootstrap confidence intervals: the statistics of the whole data, intervals around    them, batching, and the same intervals from the same seed in one process and in a process pool    Returns    -------    None.    """    table = load_table()    columns = (table["budget"], table["worldwide_gross"])    assert statistic_of("mean", columns[:1]) == pytest.approx(calculate_mean(table["budget"]))    assert statistic_of("median", columns[:1]) == calculate_median(table["budget"])    assert statistic_of("iqr", columns[:1]) == calculate_interquartile(table["budget"])    assert round(statistic_of("std", columns[:1]), 2) == calculate_std_deviation(table["budget"])    assert round(statistic_of("correlation", columns), 2) == calculate_correlation(*columns)    assert batch_sizes(10, 500, 4) == [4, 4, 2] and sum(batch_sizes(10000, 500)) == 10000    for statistic in BOOTSTRAP_STATISTICS:        for method in ("percentile", "bca"):            interval = bootstrap(columns, statistic, resamples=200, method=method, workers=1)            assert interval.low <= interval.high and interval.resamples == 200 and interval.standard_error > 0            assert interval.low <= interval.estimate <= interval.high    serial = bootstrap(columns, "median", resamples=300, seed=7, workers=1, batch_size=100)    assert serial == bootstrap(columns, "median", resamples=300, seed=7, workers=2, batch_size=100)    assert serial != bootstrap(columns, "median", resamples=300, seed=8, workers=1, batch_size=100)    with pytest.raises(ValueError):        bootstrap(columns, "mode")    with pytest.raises(ValueError):        bootstrap(columns, "mean", confidence=1.5)def test_trends():    """    Test function for the yearly trends: rolling windows updated year by year against each window computed    from scratch, the two-heap rolling median, cumulative totals and year-over-year changes    Returns    -------    None.    """    table = load_table()    trend = year_trend(table, "budget")    assert trend.years == list(range(min(table["year"]), max(table["year"]) + 1))    assert sum(trend.counts) == len(table) and trend.cumulative()[-1] == pytest.approx(sum(table["budget"]))    rolling = trend.rolling(5, ("count", "total", "mean", "std", "median"))    for position, year in enumerate(trend.years):        window = [budget for released, budget in zip(table["year"], table["budget"]) if year - 5 < released <= year]        if position < 4 or not window:            assert rolling["mean"][position] is None and rolling["median"][position] is None            continue        assert rolling["count"][position] == len(window)        assert rolling["mean"][position] == pytest.approx(calculate_mean(window))        assert rolling["median"][position] == calculate_median(window)        if len(window) > 1:            assert rolling["std"][position] == pytest.approx(calculate_std_deviation(window), abs=0.005)    changes = trend.year_over_year("total")    assert changes[0] is None and len(changes) == len(trend)    position = trend.years.index(2019)    assert changes[position] == pytest.approx((trend.totals[position] / trend.totals[position - 1] - 1) * 100)    with pytest.raises(ValueError):        trend.rolling(0)    median, window = RollingMedian(), []    for step, value in enumerate([5.0, 1.0, 3.0, 3.0, 8.0, 2.0, 3.0, 9.0, 1.0, 4.0] * 3):        median.add(value)        window.append(value)        if len(window) > 4:            median.remove(window.pop(step % len(window)))        assert median.median() == calculate_median(window)def test_derived_columns():    """    Test function for the derived columns: computed on first use, kept until rows are appended, NaN where a    value divides by zero, and usable in views, rankings and statistics like a stored column    Returns    -------    None.    """    table = load_table()    assert not any(key[0] == "derived" for key in table.indexes if isinstance(key, tuple))    roi = table["roi"]    assert roi is table.column("roi") and len(roi) == len(table)    assert list(roi) == [gross / budget for gross, budget in zip(table["worldwide_gross"], table["budget"])]    assert list(table["profit"]) == [gross - budget for gross, budget in                                     zip(table["worldwide_gross"], table["budget"])]    assert table["domestic_share"][0] == pytest.approx(table["domestic_pct"][0], abs=0.05)    assert table.movie(0)["roi"] == roi[0]    top = rank_index(table, "roi").top_k(1)[0]    assert table["title"][top].strip() == "Paranormal Activity"    assert calculate_mean(filter_table(table, [("roi", ">", 100)])["roi"]) == pytest.approx(        calculate_mean([value for value in roi if value > 100]))    table.append_row(["2020's", "Zero Budget", "0", "10", "0", "5", "50", "5", "50", "2024"])    assert table["roi"] is not roi and len(table["roi"]) == len(table)    assert math.isnan(table["roi"][-1]) and table["profit"][-1] == 10    with pytest.raises(KeyError):        table.column("margin")    assert set(DERIVED_COLUMNS) >= {"roi", "profit", "domestic_share", "international_share"}def test_rank_of_title_in_view(capsys):    """    Test function for the rank of a title in a filtered view: ranked among the selected movies only, for    movies whose row in the dataset is beyond the size of the view    Returns    -------    None.    """    view = filter_table(load_table(), [("year", ">=", 2015)])    assert len(view) == 165    show_rank_of_title(view, "Sleight")    assert "Rank of Sleight by budget: 165 of 165" in capsys.readouterr().out    for title in ("Avengers: Endgame", "Suicide Squad"):        position = row_of_title(view, title)        show_rank_of_title(view, title)        output = capsys.readouterr().out        rank = rank_index(view, "budget").rank_of_row(position)        assert f"Rank of {title} by budget: {rank} of 165 ({view['budget'][position]:.2f} million USD)" in outputdef test_menu_of_filtered_view(capsys, monkeypatch):    """    Test function for the menu command on the movies selected by --where: rankings, the rank of a title and the    derived columns are computed on the view    Returns    -------    None.    """    answers = ["1", "17", "", "19", "Sleight", "", "19", "Avengers: Endgame", "", "20", "100", "200", "",               "22", "roi", "", "23", "roi", "", "q", "3", "Avengers", "", "4"]    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(answers) + "\n"))    assert run_command_line(["--where", "year>=2015", "menu"]) == 0    output = capsys.readouterr().out    assert "Rank of Sleight by budget: 165 of 165 (0.25 million USD)" in output    assert "Rank of Avengers: Endgame by worldwide gross: 1 of 165 (2798.00 million USD)" in output    assert "Traceback" not in output and "Program is exiting" in outputdef test_accumulator_rewritten_file(tmp_path):    """    Test function for the Accumulator class reading quoted fields and rebuilding its statistics when the file    is rewritten, even into a larger file    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    header = ("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"              "international gross,international ,year\n")    dataset.write_text(header + '2000\'s,"Crouching Tiger, Hidden Dragon",17,213,0,0,0,0,0,2000\n')    accumulator = Accumulator()    assert accumulator.update_from_file(str(dataset)) == 1 and accumulator.rejected == 0    assert accumulator.mean("budget") == 17    dataset.write_text(header + "2010's,A,1,10,0,0,0,0,0,2011\n" * 3)    assert accumulator.update_from_file(str(dataset)) == 3    assert accumulator.count() == 3 and accumulator.mean("budget") == 1    with open(dataset, "a") as datafile:        datafile.write("2010's,B,4,20,0,0,0,0,0,2012\n")    assert accumulator.update_from_file(str(dataset)) == 1 and accumulator.count() == 4    state = tmp_path / "state.json"    state.write_text(json.dumps({"offset": 10, "file_size": 10}))    assert Accumulator.load(str(state)).count() == 0def test_render_all_workers(tmp_path):    """    Test function for the render_all function in worker processes: the table is sent once to each worker,    every format of a chart is saved from one figure and the phases of the workers are added to the profile    Returns    -------    None.    """    pytest.importorskip("matplotlib")    view = filter_table(load_table(), [("year", ">=", 2015)])    profiler = profiling.enable()    try:        with profiling.phase("render"):            manifest = render_all(output_dir=str(tmp_path), names=["budget_histogram", "category_boxplot"],                                  formats=("png", "svg"), workers=2, where=[("year", ">=", 2015)], table=view)    finally:        profiling.disable()    assert [(entry["chart"], entry["format"]) for entry in manifest["charts"]] == [        ("budget_histogram", "png"), ("budget_histogram", "svg"), ("category_boxplot", "png"),        ("category_boxplot", "svg")]    phases = {entry["phase"]: entry for entry in profiler.report()["phases"]}    assert "render;load" not in phases    for name in ("budget_histogram", "category_boxplot"):        assert phases[f"render;chart.{name};draw"]["calls"] == 1        assert phases[f"render;chart.{name};rasterise"]["calls"] == 2def test_cache_versions(tmp_path, monkeypatch):    """    Test function for the binary cache written by another parser version: it is not read, and the CSV is    parsed again    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    cache_file = str(tmp_path / "dataset.csv.cache")    dataset.write_text("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"                       "international gross,international ,year\n2000's,Amélie,10,174,0,33,19,141,81,2001\n",                       encoding="utf-8")    monkeypatch.setattr("cache.PARSER_VERSION", 1)    load_cached(str(dataset))    assert read_cache(cache_file, str(dataset)) is not None    monkeypatch.undo()    assert read_cache(cache_file, str(dataset)) is None    assert list(load_cached(str(dataset))["year"]) == [2001]    assert read_cache(cache_file, str(dataset)) is not Nonedef test_derived_zero_budget():    """    Test function for a derived column with a movie whose value cannot be computed (a budget of 0): the movie    is left out of the rank index, the histograms and the yearly trends    Returns    -------    None.    """    table = load_table()    table.append_row(["2020's", "Zero Budget", "0", "10", "0", "5", "50", "5", "50", "2024"])    roi = table["roi"]    assert math.isnan(roi[500])    index = rank_index(table, "roi")    assert len(index) == 500 and index.rank_of_row(500) is None and 500 not in index.bottom_k(500)    assert table["title"][index.top_k(1)[0]].strip() == "Paranormal Activity"    assert index.rank_of_row(index.bottom_k(1)[0]) == 500    ranks = index.fractional_ranks()    assert math.isnan(ranks[500]) and sum(ranks[:500]) == 500 * 501 / 2    for rule in ("fd", "log"):        histogram = Histogram.from_values(roi, rule)        assert histogram.missing == 1 and histogram.total() + histogram.nonpositive == 500    assert Histogram.from_values(roi, "fd").width == choose_width(roi[:500], "fd")    trend = year_trend(table, "roi")    assert sum(trend.counts) == 500    medians = trend.rolling(5, ("median", "mean"))    assert medians["median"][-1] == calculate_median([value for value, year in zip(roi, table["year"])                                                      if year >= trend.years[-5] and value == value])    with pytest.raises(ValueError):        year_trend({"year": array("i", [2020]), "roi": array("d", [float("nan")])}, "roi")def test_memo_foreign_file(tmp_path):    """    Test function for loading memo files the program did not save: truncated, foreign or writable by others    Returns    -------    None.    """    table = load_table()    path = tmp_path / "dataset.csv.memo"    memo = Memo(path=str(path))    memo.get(table, "budget", "mean", lambda: calculate_mean(table["budget"]))    memo.save()    saved = path.read_bytes()    assert len(Memo(path=str(path))) == 1    for content in (saved[:len(saved) // 2], b"not a pickle", pickle.dumps({"a": 1}), pickle.dumps([1, 2]),                    pickle.dumps([([1], 2)]), pickle.dumps(None)):        path.write_bytes(content)        assert len(Memo(path=str(path))) == 0    if hasattr(os, "getuid"):        path.write_bytes(saved)        path.chmod(0o666)        assert len(Memo(path=str(path))) == 0def test_accumulator_half_written_row(tmp_path):    """    Test function for the Accumulator class leaving a row without a line break, which may still be being    written, for the next call    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    dataset.write_text("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"                       "international gross,international ,year\n2010's,Foo ,10,100,1000,50,50,50,50,20")    accumulator = Accumulator()    assert accumulator.update_from_file(str(dataset)) == 0 and accumulator.count() == 0    with open(dataset, "a") as datafile:        datafile.write("15\n2010's,Bar ,3")    assert accumulator.update_from_file(str(dataset)) == 1 and accumulator.mean("budget") == 10    with open(dataset, "a") as datafile:        datafile.write("0,100,1000,50,50,50,50,2016\n")    assert accumulator.update_from_file(str(dataset)) == 1 and accumulator.mean("budget") == 20    assert accumulator.count() == 2 and accumulator.rejected == 0 and accumulator.update_from_file(str(dataset)) == 0def test_empty_where(capsys):    """    Test function for the command line on conditions that select no movie: an error, not a crash    Returns    -------    None.    """    for command in (["stats", "--all"], ["histogram"], ["query", "--top", "3"], ["correlation"], ["trends"],                    ["menu"]):        assert run_command_line(["--where", "year>3000"] + command) == 1        captured = capsys.readouterr()        assert captured.out == "" and "no movie satisfies the --where conditions" in captured.errdef test_derived_zero_budget_statistics(tmp_path, capsys):    """    Test function for the statistics, correlations and bootstrap intervals of a derived column with a movie    whose value cannot be computed (a budget of 0): the movie is left out and the output stays valid JSON    Returns    -------    None.    """    dataset = tmp_path / "dataset.csv"    with open("dataset.csv", encoding="utf-8-sig") as datafile:        dataset.write_text(datafile.read().rstrip("\n") + "\n2020's,Zero Budget,0,10,0,5,50,5,50,2024\n")    def run(*command):        assert run_command_line(list(command) + ["--format", "json"]) == 0        return json.loads(capsys.readouterr().out, parse_constant=pytest.fail)    for analysis in (["stats", "--all", "--columns", "roi,budget"], ["correlation", "--columns", "roi,budget,gross"],                     ["bootstrap", "--stats", "mean,correlation", "--columns", "roi,budget", "--resamples", "200"]):        results, expected = run("--dataset", str(dataset), *analysis), run(*analysis)        assert results.pop("rows") == 501 and expected.pop("rows") == 500        if analysis[0] == "stats":            assert results["columns"]["budget"]["count"] == 501 and results["columns"]["budget"]["minimum"] == 0            assert results["columns"]["roi"] == expected["columns"]["roi"]        elif analysis[0] == "correlation":            assert results["matrix"] == expected["matrix"]        else:            assert results["intervals"][0] == expected["intervals"][0]    table = load_table(str(dataset))    roi = [value for value in table["roi"] if value == value]    assert correlation_matrix(table, ["roi", "budget"], "spearman") == correlation_matrix(        {"roi": roi, "budget": table["budget"][:500]}, ["roi", "budget"], "spearman")def test_arguments_checked_before_load(monkeypatch, capsys):    """    Test function for the command line rejecting wrong options before the dataset is loaded    Returns    -------    None.    """    monkeypatch.setattr("cli.load_source", lambda path: pytest.fail("the dataset was loaded"))    for command in (["stats", "--stats", "mean,nope"], ["stats", "--all", "--columns", "budgett"],                    ["histogram", "--width", "0"], ["trends", "--window", "0"], ["query", "--column", "gross"],                    ["correlation", "--columns", "budget"], ["bootstrap", "--stats", "nope"],                    ["render", "--charts", "nope"], ["render", "--format", "gif"]):        with pytest.raises(SystemExit):            run_command_line(command)        assert "error:" in capsys.readouterr().errif __name__ == "__main__":    pytest.main([__file__,"-v"])
\ No newline at end of file
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:14:02 2026
+
+@author: A00315995
+
+# Program Name: backend.py
+# purpose: This program selects the compute backend of the statistics functions: 'numpy' runs them as
+# vectorized reductions over contiguous float64 arrays, 'python' runs the original pure-Python code.
+# The backend is chosen with the HOLLYWOOD_BACKEND environment variable, set_backend() or the --backend
+# option of the command line; 'auto' (the default) uses NumPy when it is installed.
+"""
+import os
+
+BACKENDS = ("auto", "python", "numpy")
+ENVIRONMENT_VARIABLE = "HOLLYWOOD_BACKEND"
+
+_selected = None
+_numpy = None
+
+
+def set_backend(name=None):
+    """
+    This function selects the compute backend.
+
+    Parameters
+    ----------
+    name : str, optional
+        One of BACKENDS. None re-reads the HOLLYWOOD_BACKEND environment variable ('auto' if unset).
+
+    Raises
+    ------
+    ValueError
+        If the name is not a known backend.
+    ImportError
+        If 'numpy' is requested but NumPy is not installed.
+
+    Returns
+    -------
+    str
+        The backend in use, 'python' or 'numpy'.
+
+    """
+    global _selected, _numpy
+    if name is None:
+        name = os.environ.get(ENVIRONMENT_VARIABLE, "auto")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}', expected one of: {', '.join(BACKENDS)}")
+    _selected = "python"
+    if name != "python":
+        try:
+            import numpy
+        except ImportError:
+            if name == "numpy":
+                raise
+        else:
+            _numpy = numpy
+            _selected = "numpy"
+    return _selected
+
+
+def get_backend():
+    """
+    Return the backend in use, 'python' or 'numpy', selecting it from the environment on first use.
+    """
+    if _selected is None:
+        set_backend()
+    return _selected
+
+
+def numpy_module():
+    """
+    Return the numpy module when the NumPy backend is in use, otherwise None.
+    """
+    return _numpy if get_backend() == "numpy" else None
+
+
+def as_array(data_list):
+    """
+    Return 'data_list' as a contiguous float64 NumPy array. array('d') columns are wrapped without copying.
+    """
+    return _numpy.asarray(data_list, dtype=_numpy.float64)
+
+
+def mean(data_list):
+    """
+    Return the mean of 'data_list' as a Python float.
+    """
+    return float(as_array(data_list).mean())
+
+
+def sum_sq_deviation(values):
+    """
+    Return the sum of squared deviations from the mean of a float64 array.
+    """
+    deviation = values - values.mean()
+    return float(_numpy.dot(deviation, deviation))
+
+
+def std_deviation(data_list):
+    """
+    Return the unrounded sample standard deviation of 'data_list'.
+
+    Raises
+    ------
+    ZeroDivisionError
+        If 'data_list' holds a single value, like the pure-Python version.
+
+    """
+    values = as_array(data_list)
+    if len(values) < 2:
+        raise ZeroDivisionError("standard deviation of a single value")
+    return (sum_sq_deviation(values) / (len(values) - 1)) ** 0.5
+
+
+def mode(data_list):
+    """
+    Return the most frequent value of 'data_list', breaking ties by first occurrence.
+    """
+    values = _numpy.asarray(data_list)
+    uniques, first_index, counts = _numpy.unique(values, return_index=True, return_counts=True)
+    tied = first_index[counts == counts.max()]
+    return data_list[int(tied.min())]
+
+
+def correlation(x_list, y_list):
+    """
+    Return the unrounded Pearson correlation of two columns.
+
+    Raises
+    ------
+    ZeroDivisionError
+        If either column is constant, like the pure-Python version.
+
+    """
+    x_values = as_array(x_list)
+    y_values = as_array(y_list)
+    x_deviation = x_values - x_values.mean()
+    y_deviation = y_values - y_values.mean()
+    denominator = (float(_numpy.dot(x_deviation, x_deviation)) ** 0.5
+                   * float(_numpy.dot(y_deviation, y_deviation)) ** 0.5)
+    if not denominator:
+        raise ZeroDivisionError("correlation with a constant column")
+    return float(_numpy.dot(x_deviation, y_deviation)) / denominator
@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:41:18 2026
+
+@author: A00315995
+
+# Program Name: benchmarks.py
+# purpose: This program times the statistics functions in main.py on synthetic data of increasing size.
+# Run it with 'python benchmarks.py mode', 'python benchmarks.py startup --sizes 500,1000000,10000000'
+# 'python benchmarks.py import' or 'python benchmarks.py backend --sizes 1000000,10000000'.
+# 'python benchmarks.py ingest --sizes 1000000,10000000' compares serial and parallel CSV parsing.
+# 'python benchmarks.py search --sizes 1000000' times title lookups on a synthetic catalogue.
+# 'python benchmarks.py memory --sizes 500,1000000' reports the bytes held per movie by each data layout.
+# 'python benchmarks.py bootstrap --sizes 500,1000000 --resamples 2000' reports bootstrap resamples per second.
+# 'python benchmarks.py suite --output baseline.json' times and memory-profiles loading, every statistic and
+# every chart at each size, and 'python benchmarks.py suite --baseline baseline.json' (or
+# 'python benchmarks.py check baseline.json current.json') reports the tasks that became slower.
+"""
+import argparse
+from array import array
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+from backend import get_backend, set_backend
+from bootstrap import bootstrap
+from cache import load_cached
+from charts import CHARTS
+from correlation import correlation_matrix
+from frequency import FrequencyTable
+from groupby import group_by
+from ingest import ingest
+import main as analysis
+from render import render_bytes
+from table import COLUMNS, Movie, load_table
+from title_index import TitleIndex
+
+HEADER = ("decade,title ,budget,worldwide gross, budget recovered,domestic gross,domestic ,"
+          "international gross,international ,year\n")
+# Share of the movies of dataset.csv released in each decade, which the synthetic datasets follow
+DECADE_WEIGHTS = {1970: 4, 1980: 15, 1990: 59, 2000: 142, 2010: 250, 2020: 30}
+# A slowdown is reported when a task takes more than (1 + threshold) times its baseline time, and at
+# least NOISE_SECONDS longer, so that timer noise on very short tasks is not reported
+DEFAULT_THRESHOLD = 0.25
+NOISE_SECONDS = 0.005
+# The naive and pure-Python bootstraps of bench_bootstrap() resample at most this many values per size
+PYTHON_BOOTSTRAP_VALUES = 2000000
+
+
+def quadratic_mode(data_list):
+    """
+    The original list.count() based calculate_mode, kept as a reference for the benchmark.
+    """
+    frequencies = []
+    for value in data_list:
+        frequencies.append(data_list.count(value))
+    return data_list[frequencies.index(max(frequencies))]
+
+
+def synthetic_money_column(size, seed=0):
+    """
+    Return 'size' budget-like values in million USD, rounded to one decimal place so that values repeat.
+    """
+    rng = random.Random(seed)
+    return [round(rng.lognormvariate(3.0, 1.2), 1) for _ in range(size)]
+
+
+def write_synthetic_dataset(path, rows, seed=0):
+    """
+    This function writes a dataset.csv-shaped file with 'rows' synthetic movies that follow the distributions
+    of dataset.csv: most movies are from the 2000's and 2010's, budgets are log-normal (median about 90M)
+    with a few micro-budget movies, and the worldwide gross is a heavy-tailed multiple of the budget.
+
+    Parameters
+    ----------
+    path : str
+        Where to write the file.
+    rows : int
+        The number of movies.
+    seed : int
+        The random seed, so the same file is produced every time.
+
+    Returns
+    -------
+    None.
+
+    """
+    rng = random.Random(seed)
+    decades = rng.choices(list(DECADE_WEIGHTS), weights=list(DECADE_WEIGHTS.values()), k=rows)
+    with open(path, "w", encoding="utf-8") as datafile:
+        datafile.write(HEADER)
+        for index, decade in enumerate(decades):
+            year = decade + rng.randint(0, 3 if decade == 2020 else 9)
+            if rng.random() < 0.03:
+                budget = round(rng.lognormvariate(0.5, 1.5), 3)
+            else:
+                budget = float(round(rng.lognormvariate(4.5, 0.9)))
+            budget = max(budget, 0.001)
+            gross = round(budget * rng.lognormvariate(1.7, 0.8), 1)
+            domestic_pct = round(100 * rng.betavariate(2.2, 3.3), 1)
+            domestic = round(gross * domestic_pct / 100, 1)
+            datafile.write(f"{year // 10 * 10}'s,Movie {index},{budget},{gross},{round(100 * gross / budget)},"
+                           f"{domestic},{domestic_pct},{round(gross - domestic, 1)},{round(100 - domestic_pct, 1)},"
+                           f"{year}\n")
+
+
+def time_call(function, *args):
+    """
+    Return the wall time in seconds of one call of function(*args).
+    """
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+
+def bench_mode(sizes, quadratic_limit=20000):
+    """
+    This function compares the original quadratic mode with the FrequencyTable mode at each size.
+    The quadratic version is skipped above 'quadratic_limit' values.
+
+    Returns
+    -------
+    list
+        One dictionary per size with the timings in seconds.
+
+    """
+    results = []
+    # a first call outside the timings, so that the backend (and NumPy's import) is not counted at the first size
+    FrequencyTable(synthetic_money_column(10)).mode()
+    for size in sizes:
+        data = synthetic_money_column(size)
+        result = {"size": size, "frequency_table": time_call(lambda values: FrequencyTable(values).mode(), data)}
+        result["quadratic"] = time_call(quadratic_mode, data) if size <= quadratic_limit else None
+        results.append(result)
+        quadratic = f"{result['quadratic']:.4f}s" if result["quadratic"] is not None else "skipped"
+        print(f"{size:>10} values: frequency table {result['frequency_table']:.4f}s, quadratic {quadratic}")
+    return results
+
+
+def bench_startup(sizes):
+    """
+    This function compares parsing the CSV (cold start) with loading the binary cache (warm start) at each size.
+
+    Returns
+    -------
+    list
+        One dictionary per size with the timings in seconds.
+
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"dataset_{size}.csv")
+            write_synthetic_dataset(path, size)
+            result = {"size": size, "csv_parse": time_call(load_table, path)}
+            load_cached(path)
+            result["warm_cache"] = time_call(load_cached, path)
+            results.append(result)
+            print(f"{size:>10} rows: CSV parse {result['csv_parse']:.4f}s, warm cache {result['warm_cache']:.4f}s "
+                  f"({result['csv_parse'] / result['warm_cache']:.0f}x)")
+    return results
+
+
+def bench_ingest(sizes, workers=None):
+    """
+    This function compares parsing the CSV in this process (load_table) with the parallel ingestion of
+    ingest.py, which cuts the file into one byte range per worker.
+
+    Returns
+    -------
+    list
+        One dictionary per size with the timings in seconds.
+
+    """
+    workers = workers or os.cpu_count()
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"dataset_{size}.csv")
+            write_synthetic_dataset(path, size)
+            chunk_size = os.path.getsize(path) // workers + 1
+            result = {"size": size, "workers": workers, "serial": time_call(load_table, path),
+                      "parallel": time_call(ingest, path, workers, chunk_size)}
+            results.append(result)
+            print(f"{size:>10} rows: serial {result['serial']:.4f}s ({size / result['serial']:,.0f} rows/s), "
+                  f"{workers} workers {result['parallel']:.4f}s ({size / result['parallel']:,.0f} rows/s)")
+    return results
+
+
+def load_lists(path):
+    """
+    The original load_dataset of main.py, kept as a reference for the memory benchmark: parallel lists of
+    budgets, grosses and titles, the number of movies of each decade, and every gross a second time in
+    a list per decade.
+    """
+    budget, worldwide_gross, title = list(), list(), list()
+    decade_freq_dict, decade_numerical_dict = dict(), dict()
+    with open(path) as datafile:
+        _ = datafile.readline()
+        for line in datafile:
+            temp_list = line.strip().split(",")
+            budget.append(float(temp_list[2]))
+            worldwide_gross.append(float(temp_list[3]))
+            title.append(temp_list[1])
+            decade_numerical_dict.setdefault(temp_list[0], []).append(float(temp_list[3]))
+            decade_freq_dict[temp_list[0]] = decade_freq_dict.get(temp_list[0], 0) + 1
+    return budget, worldwide_gross, title, decade_freq_dict, decade_numerical_dict
+
+
+def parse_rows(path):
+    """
+    Yield the converted values of each row of a dataset file, every field a new object as the csv module makes it.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as datafile:
+        _ = datafile.readline()
+        for fields in csv.reader(datafile):
+            yield [field if storage == "category" else (float(field) if storage == "d" else int(field))
+                   for field, (_, storage) in zip(fields, COLUMNS)]
+
+
+def load_column_lists(path):
+    """
+    Return every column of the dataset as a list, with a decade string per movie: the original layout
+    extended to the ten columns.
+    """
+    columns = {name: [] for name, _ in COLUMNS}
+    for values in parse_rows(path):
+        for (name, _), value in zip(COLUMNS, values):
+            columns[name].append(value)
+    return columns
+
+
+def load_records(path):
+    """
+    Return one dictionary per movie holding its ten columns.
+    """
+    names = [name for name, _ in COLUMNS]
+    return [dict(zip(names, values)) for values in parse_rows(path)]
+
+
+def retained_bytes(function, *args):
+    """
+    Return the number of bytes allocated by function(*args) that are still in use while its result is held.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def bench_memory(sizes):
+    """
+    This function compares the memory a loaded dataset holds per movie in the original layout of main.py
+    (four columns, every gross stored twice), in lists or dictionaries of all ten columns, and in a MovieTable.
+    Movie views are made on demand and hold no values, so they add nothing to the table.
+
+    Returns
+    -------
+    list
+        One dictionary per size with the bytes per movie of each layout.
+
+    """
+    results = []
+    layouts = (("original lists (4 columns)", load_lists), ("column lists", load_column_lists),
+               ("record dicts", load_records), ("MovieTable", load_table))
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"dataset_{size}.csv")
+            write_synthetic_dataset(path, size)
+            result = {"size": size}
+            for name, loader in layouts:
+                loader(path)
+                result[name] = retained_bytes(loader, path) / size
+            results.append(result)
+            print(f"{size:>10} rows, bytes per movie: "
+                  + ", ".join(f"{name} {result[name]:.0f}" for name, _ in layouts)
+                  + f"; Movie view {sys.getsizeof(Movie(None, 0))} each while it is held")
+    return results
+
+
+def bench_import(repeats=5):
+    """
+    This function measures the start-up cost a batch invocation pays: importing main.py on its own, and
+    importing it together with matplotlib.pyplot (what every run paid before matplotlib was imported lazily).
+    Each measurement is the median wall time of 'repeats' fresh interpreter processes.
+
+    Returns
+    -------
+    dict
+        The median times in seconds.
+
+    """
+    commands = {"interpreter": "pass", "import_main": "import main",
+                "import_main_and_matplotlib": "import main, matplotlib.pyplot"}
+    results = dict()
+    for name, code in commands.items():
+        timings = [time_call(subprocess.run, [sys.executable, "-c", code]) for _ in range(repeats)]
+        results[name] = statistics.median(timings)
+        print(f"{name:>28}: {results[name]:.4f}s")
+    print(f"{'saving per invocation':>28}: {results['import_main_and_matplotlib'] - results['import_main']:.4f}s")
+    return results
+
+
+def bench_backend(sizes):
+    """
+    This function times the calculate_* functions of main.py with the pure-Python and the NumPy backend
+    on array('d') columns of each size.
+
+    Returns
+    -------
+    list
+        One dictionary per size and backend with the timings in seconds.
+
+    """
+    functions = ("calculate_mean", "calculate_median", "calculate_mode", "calculate_interquartile",
+                 "calculate_std_deviation", "calculate_correlation")
+    results = []
+    for size in sizes:
+        budget = array("d", synthetic_money_column(size, seed=1))
+        gross = array("d", synthetic_money_column(size, seed=2))
+        for name in ("python", "numpy"):
+            set_backend(name)
+            result = {"size": size, "backend": name}
+            for function in functions:
+                arguments = (budget, gross) if function == "calculate_correlation" else (budget,)
+                result[function] = time_call(getattr(analysis, function), *arguments)
+            results.append(result)
+            print(f"{size:>10} values, {name:>6}: " + ", ".join(f"{function[10:]} {result[function]:.4f}s"
+                                                                for function in functions))
+    set_backend()
+    return results
+
+
+def naive_bootstrap(function, columns, resamples, seed=0):
+    """
+    Re-run a calculate_* function of main.py on 'resamples' resamples built as lists, the straightforward
+    Python bootstrap that bootstrap.py replaces.
+    """
+    rng = random.Random(seed)
+    rows = len(columns[0])
+    for _ in range(resamples):
+        indexes = rng.choices(range(rows), k=rows)
+        function(*([column[index] for index in indexes] for column in columns))
+
+
+def bench_bootstrap(sizes, resamples=2000, workers=None):
+    """
+    This function compares the throughput, in resamples per second, of the naive Python bootstrap with
+    bootstrap.py under the pure-Python backend and under the NumPy backend in one process and in a process
+    pool. The Python bootstraps run at most PYTHON_BOOTSTRAP_VALUES resampled values at each size.
+
+    Returns
+    -------
+    list
+        One dictionary per size and statistic with the resamples per second.
+
+    """
+    statistics = {"mean": "calculate_mean", "median": "calculate_median", "correlation": "calculate_correlation"}
+    results = []
+    for size in sizes:
+        budget = array("d", synthetic_money_column(size, seed=1))
+        gross = array("d", synthetic_money_column(size, seed=2))
+        python_resamples = max(2, min(resamples, PYTHON_BOOTSTRAP_VALUES // size))
+        for statistic, function in statistics.items():
+            columns = (budget, gross) if statistic == "correlation" else (budget,)
+            result = {"size": size, "statistic": statistic}
+            set_backend("python")
+            result["naive"] = python_resamples / time_call(naive_bootstrap, getattr(analysis, function), columns,
+                                                           python_resamples)
+            result["python"] = python_resamples / time_call(bootstrap, columns, statistic, python_resamples,
+                                                            0.95, "percentile", 0, 1)
+            set_backend("numpy")
+            result["numpy"] = resamples / time_call(bootstrap, columns, statistic, resamples, 0.95, "percentile",
+                                                    0, 1)
+            result["numpy_pool"] = resamples / time_call(bootstrap, columns, statistic, resamples, 0.95,
+                                                         "percentile", 0, workers or os.cpu_count())
+            results.append(result)
+            print(f"{size:>10} rows, {statistic:>11}: naive {result['naive']:10.1f}/s, "
+                  f"python {result['python']:10.1f}/s, numpy {result['numpy']:10.1f}/s, "
+                  f"numpy pool {result['numpy_pool']:10.1f}/s")
+    set_backend()
+    return results
+
+
+def synthetic_titles(count, seed=0):
+    """
+    Return 'count' movie titles of one to four pseudo-words (with the occasional "The", "of" or sequel
+    number, as in real titles) drawn from a vocabulary of 20000 English-like words.
+    """
+    rng = random.Random(seed)
+    onsets = ["", "b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w", "z",
+              "bl", "br", "ch", "cl", "cr", "dr", "fl", "gr", "pl", "pr", "sh", "sl", "sp", "st", "th", "tr"]
+    nuclei = ["a", "e", "i", "o", "u", "y", "ai", "ea", "ee", "ou", "oo", "ie"]
+    codas = ["", "", "", "n", "r", "s", "t", "l", "m", "d", "ck", "ng", "st", "nd", "x"]
+    words = ["".join(rng.choice(onsets) + rng.choice(nuclei) + rng.choice(codas)
+                     for _ in range(rng.randint(1, 3))).capitalize() for _ in range(20000)]
+    titles = []
+    for _ in range(count):
+        title = rng.choices(words, k=rng.randint(1, 4))
+        if rng.random() < 0.2:
+            title.insert(0, "The")
+        if rng.random() < 0.1:
+            title.insert(len(title) // 2, "of")
+        if rng.random() < 0.1:
+            title.append(str(rng.randint(2, 5)))
+        titles.append(" ".join(title))
+    return titles
+
+
+def misspell(title, rng):
+    """
+    Return 'title' with one character deleted, doubled or replaced.
+    """
+    position = rng.randrange(len(title))
+    edit = rng.choice(("delete", "double", "replace"))
+    if edit == "delete":
+        return title[:position] + title[position + 1:]
+    if edit == "double":
+        return title[:position] + title[position] + title[position:]
+    return title[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + title[position + 1:]
+
+
+def bench_search(sizes, queries=200):
+    """
+    This function builds a TitleIndex over a synthetic catalogue of each size and measures the average time
+    of exact, prefix (first 10 matches) and fuzzy (misspelt title, 5 best matches) lookups.
+
+    Returns
+    -------
+    list
+        One dictionary per size with the build time and the average lookup times in seconds.
+
+    """
+    results = []
+    for size in sizes:
+        titles = synthetic_titles(size)
+        rng = random.Random(1)
+        sample = rng.sample(titles, min(queries, size))
+        result = {"size": size, "build": time_call(TitleIndex, titles)}
+        index = TitleIndex(titles)
+        result["build_trigrams"] = time_call(index.postings)
+        lookups = {"exact": lambda title: index.exact(title),
+                   "prefix": lambda title: index.prefix(title[:4], 10),
+                   "fuzzy": lambda title: index.fuzzy(misspell(title, rng), 5)}
+        for name, lookup in lookups.items():
+            result[name] = time_call(lambda: [lookup(title) for title in sample]) / len(sample)
+        results.append(result)
+        print(f"{size:>10} titles: build {result['build']:.2f}s (+ trigrams {result['build_trigrams']:.2f}s), "
+              f"exact {result['exact'] * 1000:.3f}ms, prefix {result['prefix'] * 1000:.3f}ms, "
+              f"fuzzy {result['fuzzy'] * 1000:.3f}ms")
+    return results
+
+
+def measure(function, *args, repeats=3):
+    """
+    This function times function(*args) and measures the memory it allocates. The time is the best of
+    'repeats' calls; the peak is measured in one more call under tracemalloc, which slows the call down
+    and is therefore not timed.
+
+    Returns
+    -------
+    tuple
+        (seconds, peak bytes allocated during the call, result of the last call)
+
+    """
+    seconds = min(time_call(function, *args) for _ in range(repeats))
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def suite_tasks(table, charts=True):
+    """
+    Return the tasks of the benchmark suite on a loaded table as (name, function, arguments) triples:
+    every statistic of the statistical menu and, with 'charts', every chart of the visualisation menu.
+    """
+    budget, gross = table["budget"], table["worldwide_gross"]
+    tasks = [(f"stat.{name[10:]}", getattr(analysis, name), (budget,))
+             for name in ("calculate_mean", "calculate_median", "calculate_mode", "calculate_range",
+                          "calculate_interquartile", "calculate_std_deviation")]
+    tasks += [("stat.skewness", analysis.calculate_skewness, (budget, 1)),
+              ("stat.correlation", analysis.calculate_correlation, (budget, gross)),
+              ("stat.correlation_matrix", correlation_matrix, (table,)),
+              ("stat.decades", group_by, (table, "decade", {"worldwide_gross": ["sum"]}))]
+    if charts:
+        tasks += [(f"chart.{name}", render_bytes, (table, name)) for name in CHARTS]
+    return tasks
+
+
+def bench_suite(sizes, charts=True, repeats=3):
+    """
+    This function generates a synthetic dataset of each size and times and memory-profiles loading it
+    (parsing the CSV, and loading the binary cache), every statistic and every chart.
+
+    Parameters
+    ----------
+    sizes : list
+        Numbers of rows.
+    charts : bool
+        Whether to include the charts (they need matplotlib).
+    repeats : int
+        Each time is the best of this many runs.
+
+    Returns
+    -------
+    dict
+        The results, ready to be written as a JSON baseline: for each size, the seconds and peak bytes
+        of each task.
+
+    """
+    results = {"python": platform.python_version(), "backend": get_backend(), "sizes": dict()}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"dataset_{size}.csv")
+            write_synthetic_dataset(path, size)
+            tasks = [("load.csv_parse", load_table, (path,))]
+            table = load_cached(path)
+            tasks.append(("load.warm_cache", load_cached, (path,)))
+            tasks += suite_tasks(table, charts)
+            timings = dict()
+            for name, function, arguments in tasks:
+                seconds, peak, _ = measure(function, *arguments, repeats=repeats)
+                timings[name] = {"seconds": seconds, "peak_bytes": peak}
+                print(f"{size:>10} rows {name:>24}: {seconds:.4f}s, peak {peak / 1024:,.0f} KiB")
+            results["sizes"][str(size)] = timings
+    return results
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, noise_seconds=NOISE_SECONDS):
+    """
+    This function compares two bench_suite() results and lists the tasks that became slower.
+
+    Parameters
+    ----------
+    baseline, current : dict
+        bench_suite() results; only the sizes and tasks present in both are compared.
+    threshold : float
+        The allowed relative slowdown, e.g. 0.25 for 25%.
+    noise_seconds : float
+        Slowdowns smaller than this are ignored.
+
+    Returns
+    -------
+    list
+        One dictionary per regression with the size, task, both times and the ratio.
+
+    """
+    regressions = []
+    for size, timings in current["sizes"].items():
+        for name, result in timings.items():
+            before = baseline["sizes"].get(size, dict()).get(name)
+            if before is None:
+                continue
+            seconds = result["seconds"]
+            if seconds > before["seconds"] * (1 + threshold) and seconds - before["seconds"] > noise_seconds:
+                regressions.append({"size": int(size), "task": name, "baseline_seconds": before["seconds"],
+                                    "seconds": seconds, "ratio": seconds / before["seconds"]})
+    return regressions
+
+
+def report_regressions(regressions, threshold):
+    """
+    Print the regressions found by compare_results() and return the process exit code (1 if any).
+    """
+    for regression in regressions:
+        print(f"SLOWER {regression['size']:>10} rows {regression['task']:>24}: "
+              f"{regression['baseline_seconds']:.4f}s -> {regression['seconds']:.4f}s "
+              f"({regression['ratio']:.2f}x)")
+    if not regressions:
+        print(f"No task is more than {threshold:.0%} slower than the baseline")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the Hollywood top 500 analysis")
+    parser.add_argument("benchmark", choices=["mode", "startup", "ingest", "import", "backend", "search", "memory",
+                                              "bootstrap", "suite", "check"])
+    parser.add_argument("files", nargs="*", help="for check: the baseline and the current suite results")
+    parser.add_argument("--sizes", default="500,5000,20000,100000,1000000",
+                        help="comma separated numbers of rows")
+    parser.add_argument("--output", help="suite: write the results to this JSON file")
+    parser.add_argument("--baseline", help="suite: compare the results with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown against the baseline (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=3, help="suite: best of this many runs per task")
+    parser.add_argument("--no-charts", action="store_true", help="suite: skip the charts")
+    parser.add_argument("--workers", type=int,
+                        help="ingest, bootstrap: the number of worker processes (default: all CPUs)")
+    parser.add_argument("--resamples", type=int, default=2000, help="bootstrap: resamples per statistic")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+    if args.benchmark == "check":
+        if len(args.files) != 2:
+            parser.error("check needs the baseline and the current results files")
+        with open(args.files[0]) as baselinefile, open(args.files[1]) as currentfile:
+            baseline, current = json.load(baselinefile), json.load(currentfile)
+        return report_regressions(compare_results(baseline, current, args.threshold), args.threshold)
+    if args.benchmark == "suite":
+        results = bench_suite(sizes, charts=not args.no_charts, repeats=args.repeats)
+        if args.output:
+            with open(args.output, "w") as outputfile:
+                json.dump(results, outputfile, indent=2)
+        if args.baseline:
+            with open(args.baseline) as baselinefile:
+                baseline = json.load(baselinefile)
+            return report_regressions(compare_results(baseline, results, args.threshold), args.threshold)
+        return 0
+    if args.benchmark == "mode":
+        bench_mode(sizes)
+    elif args.benchmark == "startup":
+        bench_startup(sizes)
+    elif args.benchmark == "ingest":
+        bench_ingest(sizes, args.workers)
+    elif args.benchmark == "import":
+        bench_import()
+    elif args.benchmark == "backend":
+        bench_backend(sizes)
+    elif args.benchmark == "search":
+        bench_search(sizes)
+    elif args.benchmark == "memory":
+        bench_memory(sizes)
+    elif args.benchmark == "bootstrap":
+        bench_bootstrap(sizes, args.resamples, args.workers)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
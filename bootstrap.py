@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 09:42:15 2026
+
+@author: A00315995
+
+# Program Name: bootstrap.py
+# purpose: This program computes bootstrap confidence intervals of the statistics of the statistical menu
+# (mean, median, IQR, standard deviation, range, median skewness and the correlation of two columns).
+# Resamples are drawn in batches: under the NumPy backend a batch is one (resamples x rows) array of random
+# row numbers and the statistic is computed for every resample of the batch at once. Batches are spread over
+# a process pool; each batch has its own seed derived from the run's seed and the batch number, so the
+# intervals are the same whatever the number of workers. Percentile and BCa (bias-corrected and accelerated)
+# intervals are returned.
+"""
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from math import sqrt
+import os
+import random
+from statistics import NormalDist
+
+from backend import get_backend, numpy_module, set_backend
+from profiling import profiled
+from quantiles import interquartile, quantiles
+
+# The statistics that can be bootstrapped; 'correlation' is computed from a pair of columns
+STATISTICS = ("mean", "median", "iqr", "std", "range", "skewness", "correlation")
+# Interval methods: the percentiles of the bootstrap estimates, or BCa, which corrects them for the bias and
+# the skew of the estimates (Efron, 1987)
+METHODS = ("percentile", "bca")
+DEFAULT_RESAMPLES = 10000
+# A batch holds at most this many resamples, and at most BATCH_VALUES resampled values (8 bytes each, plus
+# as many row numbers), so that the arrays of a batch stay within a few tens of MiB
+BATCH_RESAMPLES = 1000
+BATCH_VALUES = 1 << 22
+# The jackknife estimating the BCa acceleration leaves out one of at most this many blocks of rows at a time
+# (one row at a time for datasets of up to JACKKNIFE_BLOCKS rows)
+JACKKNIFE_BLOCKS = 500
+
+BootstrapInterval = namedtuple("BootstrapInterval", ("statistic", "estimate", "low", "high", "standard_error",
+                                                     "confidence", "method", "resamples"))
+
+# The columns being resampled in a worker process, set once per worker by _start_worker()
+_worker_columns = None
+
+
+def _std(values):
+    mean = sum(values) / len(values)
+    return sqrt(sum((value - mean) ** 2 for value in values) / (len(values) - 1))
+
+
+def _correlation(x_values, y_values):
+    x_mean, y_mean = sum(x_values) / len(x_values), sum(y_values) / len(y_values)
+    xy = xx = yy = 0.0
+    for x, y in zip(x_values, y_values):
+        x_deviation, y_deviation = x - x_mean, y - y_mean
+        xy += x_deviation * y_deviation
+        xx += x_deviation * x_deviation
+        yy += y_deviation * y_deviation
+    return xy / sqrt(xx * yy) if xx and yy else float("nan")
+
+
+def _python_statistic(statistic, columns):
+    """
+    Return the unrounded statistic of one sample (a list per column) under the pure-Python backend.
+    """
+    values = columns[0]
+    if statistic == "mean":
+        return sum(values) / len(values)
+    if statistic == "median":
+        return quantiles(values, [0.5], method="halves")[0]
+    if statistic == "iqr":
+        return interquartile(values)
+    if statistic == "std":
+        return _std(values)
+    if statistic == "range":
+        return max(values) - min(values)
+    if statistic == "skewness":
+        return 3 * (sum(values) / len(values) - quantiles(values, [0.5], method="halves")[0]) / _std(values)
+    return _correlation(*columns)
+
+
+def _halves(np, samples, probability):
+    """
+    Return the 'halves' quantile (see quantiles.py) of every row of a 2-D array, by one partition per batch.
+    """
+    count = samples.shape[1]
+    mid_index = count // 2
+    if probability == 0.5:
+        start, stop = 0, count
+    elif probability == 0.25:
+        start, stop = 0, mid_index
+    else:
+        start, stop = (mid_index + 1 if count % 2 else mid_index), count
+    middle = start + (stop - start) // 2
+    ranks = [middle] if (stop - start) % 2 else [middle - 1, middle]
+    return np.partition(samples, ranks, axis=1)[:, ranks].mean(axis=1)
+
+
+def _numpy_statistic(np, statistic, samples):
+    """
+    Return the unrounded statistic of every row of 2-D arrays (one array per column) under the NumPy backend.
+    """
+    values = samples[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if statistic == "mean":
+            return values.mean(axis=1)
+        if statistic == "median":
+            return _halves(np, values, 0.5)
+        if statistic == "iqr":
+            return _halves(np, values, 0.75) - _halves(np, values, 0.25)
+        if statistic == "std":
+            return values.std(axis=1, ddof=1)
+        if statistic == "range":
+            return np.ptp(values, axis=1)
+        if statistic == "skewness":
+            return 3 * (values.mean(axis=1) - _halves(np, values, 0.5)) / values.std(axis=1, ddof=1)
+        x_deviation = values - values.mean(axis=1, keepdims=True)
+        y_deviation = samples[1] - samples[1].mean(axis=1, keepdims=True)
+        return (np.einsum("ij,ij->i", x_deviation, y_deviation)
+                / np.sqrt(np.einsum("ij,ij->i", x_deviation, x_deviation)
+                          * np.einsum("ij,ij->i", y_deviation, y_deviation)))
+
+
+def statistic_of(statistic, columns):
+    """
+    This function computes a statistic of STATISTICS of the whole data, unrounded, with the same kernels
+    the resamples are computed with.
+
+    Parameters
+    ----------
+    statistic : str
+        One of STATISTICS.
+    columns : tuple
+        The column, or for 'correlation' the pair of columns.
+
+    Returns
+    -------
+    float
+        The statistic, NaN if it is undefined (e.g. the correlation with a constant column).
+
+    """
+    np = numpy_module()
+    if np is not None:
+        return float(_numpy_statistic(np, statistic, [np.asarray(column, dtype=np.float64)[None, :]
+                                                      for column in columns])[0])
+    try:
+        return _python_statistic(statistic, [list(column) for column in columns])
+    except ZeroDivisionError:
+        return float("nan")
+
+
+def _resample(columns, statistic, count, seed, batch):
+    """
+    Return the statistic of 'count' resamples of the columns, drawn with the seed of batch number 'batch'.
+    """
+    rows = len(columns[0])
+    np = numpy_module()
+    if np is not None:
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(batch,)))
+        indexes = rng.integers(0, rows, size=(count, rows))
+        return _numpy_statistic(np, statistic, [column[indexes] for column in columns])
+    rng = random.Random(f"{seed}:{batch}")
+    estimates = array("d")
+    for _ in range(count):
+        if len(columns) == 1:
+            samples = [rng.choices(columns[0], k=rows)]
+        else:
+            indexes = rng.choices(range(rows), k=rows)
+            samples = [list(map(column.__getitem__, indexes)) for column in columns]
+        try:
+            estimates.append(_python_statistic(statistic, samples))
+        except ZeroDivisionError:
+            estimates.append(float("nan"))
+    return estimates
+
+
+def _start_worker(columns, backend):
+    """
+    Keep the columns in the worker process, so that they are sent to each worker once, not with every batch.
+    """
+    global _worker_columns
+    _worker_columns = columns
+    set_backend(backend)
+
+
+def _resample_in_worker(statistic, count, seed, batch):
+    return _resample(_worker_columns, statistic, count, seed, batch)
+
+
+def batch_sizes(resamples, rows, batch_size=None):
+    """
+    Return the number of resamples of each batch: 'batch_size' each, or as many as BATCH_RESAMPLES and
+    BATCH_VALUES allow for 'rows' rows, the last batch holding the rest.
+    """
+    batch_size = batch_size or max(1, min(BATCH_RESAMPLES, BATCH_VALUES // max(rows, 1)))
+    return [min(batch_size, resamples - start) for start in range(0, resamples, batch_size)]
+
+
+def _jackknife(statistic, columns, blocks):
+    """
+    Return the statistic of the data with each of 'blocks' consecutive blocks of rows left out in turn.
+    """
+    rows = len(columns[0])
+    bounds = [rows * block // blocks for block in range(blocks + 1)]
+    np = numpy_module()
+    estimates = []
+    for start, stop in zip(bounds, bounds[1:]):
+        if np is not None:
+            kept = [np.concatenate((column[:start], column[stop:])) for column in columns]
+        else:
+            kept = [column[:start] + column[stop:] for column in columns]
+        estimates.append(statistic_of(statistic, kept))
+    return estimates
+
+
+def _bca_probabilities(resamples, below, jackknife, alpha):
+    """
+    Return the probabilities at which the bootstrap estimates are read for a BCa interval, from the number of
+    estimates below the statistic of the data (ties counting half) and the jackknife estimates.
+    """
+    normal = NormalDist()
+    # a bias correction of +-infinity (every estimate on one side) is limited to the most extreme estimate
+    proportion = min(max(below / resamples, 1 / (resamples + 1)), resamples / (resamples + 1))
+    bias = normal.inv_cdf(proportion)
+    jackknife_mean = sum(jackknife) / len(jackknife)
+    squares = sum((jackknife_mean - value) ** 2 for value in jackknife)
+    cubes = sum((jackknife_mean - value) ** 3 for value in jackknife)
+    acceleration = cubes / (6 * squares ** 1.5) if squares else 0.0
+    probabilities = []
+    for tail in (alpha / 2, 1 - alpha / 2):
+        z = bias + normal.inv_cdf(tail)
+        probabilities.append(normal.cdf(bias + z / (1 - acceleration * z)))
+    return probabilities
+
+
+@profiled()
+def bootstrap(columns, statistic="mean", resamples=DEFAULT_RESAMPLES, confidence=0.95, method="bca", seed=0,
+              workers=None, batch_size=None):
+    """
+    This function computes a bootstrap confidence interval of a statistic: the statistic is computed for
+    'resamples' samples of the rows drawn with replacement, and the interval is read from the distribution
+    of these estimates.
+
+    Parameters
+    ----------
+    columns : tuple
+        The column (a list, array or column view) to resample, or for 'correlation' the pair of columns,
+        whose rows are resampled together.
+    statistic : str
+        One of STATISTICS.
+    resamples : int
+        The number of resamples.
+    confidence : float
+        The confidence level of the interval, between 0 and 1.
+    method : str
+        One of METHODS, 'bca' by default.
+    seed : int
+        The seed the resamples are drawn from: the same seed, data and backend give the same interval,
+        whatever the number of workers.
+    workers : int, optional
+        The number of worker processes, os.cpu_count() by default. With 1, or when the resamples fit in
+        one batch, every batch is computed in this process.
+    batch_size : int, optional
+        The number of resamples per batch, chosen from BATCH_RESAMPLES and BATCH_VALUES by default.
+
+    Raises
+    ------
+    ValueError
+        If an argument is out of range, or the statistic is undefined for the data.
+
+    Returns
+    -------
+    BootstrapInterval
+        The statistic of the data, the interval, the standard deviation of the estimates and the number
+        of resamples the statistic was defined for.
+
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}', expected one of: {', '.join(STATISTICS)}")
+    if method not in METHODS:
+        raise ValueError(f"Unknown interval method '{method}', expected one of: {', '.join(METHODS)}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"The confidence level {confidence} is outside (0, 1)")
+    if resamples < 2:
+        raise ValueError("A bootstrap needs at least two resamples")
+    columns = tuple(columns[:2]) if statistic == "correlation" else tuple(columns[:1])
+    np = numpy_module()
+    columns = tuple(np.asarray(column, dtype=np.float64) if np is not None else array("d", column)
+                    for column in columns)
+    if len(columns[0]) < 2 or any(len(column) != len(columns[0]) for column in columns):
+        raise ValueError("A bootstrap needs at least two rows, and columns of the same length")
+    estimate = statistic_of(statistic, columns)
+    if estimate != estimate:
+        raise ValueError(f"The {statistic} of the data is undefined")
+    sizes = batch_sizes(resamples, len(columns[0]), batch_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sizes) == 1:
+        batches = [_resample(columns, statistic, count, seed, batch) for batch, count in enumerate(sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes)), initializer=_start_worker,
+                                 initargs=(columns, get_backend())) as pool:
+            batches = list(pool.map(_resample_in_worker, repeat(statistic), sizes, repeat(seed), range(len(sizes))))
+    if np is not None:
+        estimates = np.concatenate(batches)
+        estimates = estimates[np.isfinite(estimates)]
+    else:
+        estimates = array("d", (value for batch in batches for value in batch if value - value == 0))
+    if len(estimates) < 2:
+        raise ValueError(f"The {statistic} is undefined for almost every resample")
+    if np is not None:
+        below = np.count_nonzero(estimates < estimate) + np.count_nonzero(estimates == estimate) / 2
+        standard_error = float(estimates.std(ddof=1))
+    else:
+        below = sum(1 for value in estimates if value < estimate) + estimates.count(estimate) / 2
+        standard_error = _std(estimates)
+    alpha = 1 - confidence
+    if method == "bca":
+        jackknife = _jackknife(statistic, columns, min(len(columns[0]), JACKKNIFE_BLOCKS))
+        probabilities = _bca_probabilities(len(estimates), below, jackknife, alpha)
+    else:
+        probabilities = [alpha / 2, 1 - alpha / 2]
+    low, high = quantiles(estimates, probabilities)
+    return BootstrapInterval(statistic, estimate, float(low), float(high), standard_error, confidence, method,
+                             len(estimates))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:56:40 2026
+
+@author: A00315995
+
+# Program Name: cache.py
+# purpose: This program stores the parsed dataset columns in a compact binary file next to the CSV
+# (fixed-width numeric blocks plus a string table) and reads them back on later runs with one block copy per
+# column from a memory map of the file, so that the CSV does not need to be parsed again. The columns own
+# their memory (arrays that can be appended to and pickled), they are not views of the file. The cache is
+# validated against the version of its format and of the parser, and the size, modification time and hash
+# of the CSV.
+"""
+from array import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from ingest import ingest
+from profiling import phase
+from table import COLUMNS, DATASET, PARSER_VERSION, CategoryColumn, MovieTable, summarise_rejects
+
+MAGIC = b"HWT1"
+# Incremented whenever the layout of the cache file changes
+FORMAT_VERSION = 1
+# magic, header length
+PREAMBLE = struct.Struct("<4sQ")
+ALIGNMENT = 8
+
+
+def cache_path_for(path):
+    """
+    Return the path of the cache file belonging to the dataset at 'path'.
+    """
+    return path + ".cache"
+
+
+def file_hash(path):
+    """
+    Return the BLAKE2 hash of the file at 'path' as a hex string.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as datafile:
+        for block in iter(lambda: datafile.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(path, with_hash=True):
+    """
+    Return the size, modification time and (optionally) hash of the file at 'path'.
+
+    Returns
+    -------
+    dict
+        The fingerprint, with keys 'size', 'mtime_ns' and 'hash'.
+
+    """
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": file_hash(path) if with_hash else None}
+
+
+def _padding(position):
+    return -position % ALIGNMENT
+
+
+def write_cache(table, source_fingerprint, cache_path):
+    """
+    This function writes the columns of 'table' to a binary cache file. Numerical columns and category codes
+    are written as raw fixed-width blocks; the distinct strings of each category column are written once as a
+    NUL-separated UTF-8 string table. The file is written to a temporary name and renamed,
+    so a reader never sees a half-written cache.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The parsed dataset.
+    source_fingerprint : dict
+        The fingerprint of the CSV file the table was parsed from.
+    cache_path : str
+        Where to write the cache.
+
+    Returns
+    -------
+    None.
+
+    """
+    blocks = []
+    layout = dict()
+    position = 0
+
+    def add_block(data):
+        nonlocal position
+        position += _padding(position)
+        blocks.append((position, data))
+        offset = position
+        position += len(data)
+        return offset
+
+    for name, storage in COLUMNS:
+        column = table.columns[name]
+        if storage == "category":
+            strings = "\0".join(column.categories).encode("utf-8")
+            layout[name] = {"codes": add_block(column.codes.tobytes()), "count": len(column.categories),
+                            "strings": add_block(strings), "strings_length": len(strings)}
+        else:
+            layout[name] = {"typecode": storage, "data": add_block(column.tobytes())}
+    header = json.dumps({"format": FORMAT_VERSION, "parser": PARSER_VERSION, "fingerprint": source_fingerprint,
+                         "rows": len(table), "columns": layout}).encode("utf-8")
+    data_start = PREAMBLE.size + len(header)
+    data_start += _padding(data_start)
+    temporary_path = cache_path + ".tmp"
+    with open(temporary_path, "wb") as cachefile:
+        cachefile.write(PREAMBLE.pack(MAGIC, len(header)))
+        cachefile.write(header)
+        cachefile.write(b"\0" * (data_start - PREAMBLE.size - len(header)))
+        written = 0
+        for offset, data in blocks:
+            cachefile.write(b"\0" * (offset - written))
+            cachefile.write(data)
+            written = offset + len(data)
+    os.replace(temporary_path, cache_path)
+
+
+def is_fresh(cached_fingerprint, path):
+    """
+    Return True if the cache fingerprint still describes the CSV at 'path'. Size and modification time are
+    checked first; when only the modification time differs (e.g. the file was copied or touched) the hash decides.
+    """
+    current = fingerprint(path, with_hash=False)
+    if current["size"] != cached_fingerprint["size"]:
+        return False
+    if current["mtime_ns"] == cached_fingerprint["mtime_ns"]:
+        return True
+    return file_hash(path) == cached_fingerprint["hash"]
+
+
+def read_cache(cache_path, source_path=None):
+    """
+    This function memory-maps a cache file and rebuilds the MovieTable from it. Every column is copied
+    from the mapped file into its array with a single block copy; no text is parsed.
+
+    Parameters
+    ----------
+    cache_path : str
+        The path of the cache file.
+    source_path : str, optional
+        The CSV the cache was built from. If given, the cache is checked against it before any column is read.
+
+    Returns
+    -------
+    MovieTable
+        The cached table, or None if the cache is stale or was written with another format or parser version.
+
+    """
+    with open(cache_path, "rb") as cachefile, mmap.mmap(cachefile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, header_length = PREAMBLE.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{cache_path} is not a dataset cache")
+        header = json.loads(mapped[PREAMBLE.size:PREAMBLE.size + header_length])
+        if header.get("format") != FORMAT_VERSION or header.get("parser") != PARSER_VERSION:
+            return None
+        data_start = PREAMBLE.size + header_length
+        data_start += _padding(data_start)
+        if source_path is not None and not is_fresh(header["fingerprint"], source_path):
+            return None
+        rows = header["rows"]
+        table = MovieTable()
+        with memoryview(mapped) as view:
+            for name, storage in COLUMNS:
+                layout = header["columns"][name]
+                if storage == "category":
+                    codes = array("i")
+                    start = data_start + layout["codes"]
+                    codes.frombytes(view[start:start + rows * codes.itemsize])
+                    start = data_start + layout["strings"]
+                    categories = str(view[start:start + layout["strings_length"]], "utf-8").split("\0")
+                    if not layout["count"]:
+                        categories = []
+                    table.columns[name] = CategoryColumn.from_codes(codes, categories)
+                else:
+                    column = array(layout["typecode"])
+                    start = data_start + layout["data"]
+                    column.frombytes(view[start:start + rows * column.itemsize])
+                    table.columns[name] = column
+    return table
+
+
+def load_cached(path=DATASET, cache_path=None):
+    """
+    This function loads the dataset from its binary cache when the cache is up to date, and otherwise parses
+    the CSV with ingest() and writes a fresh cache for the next run. Rows that cannot be converted are written
+    to the quarantine file of ingest.py and counted in one line on stderr. A cache that cannot be written
+    (e.g. a read-only directory) is skipped silently.
+
+    Parameters
+    ----------
+    path : str
+        The path of the dataset CSV file.
+    cache_path : str, optional
+        The path of the cache file, 'path' + '.cache' by default.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the dataset file does not exist.
+
+    Returns
+    -------
+    MovieTable
+        The loaded table.
+
+    """
+    cache_path = cache_path or cache_path_for(path)
+    try:
+        with phase("read_cache"):
+            table = read_cache(cache_path, path)
+        if table is not None:
+            return table
+    except (OSError, ValueError, KeyError, struct.error):
+        pass
+    with phase("fingerprint"):
+        source_fingerprint = fingerprint(path)
+    with phase("ingest"):
+        table, rejects, _, quarantine = ingest(path)
+    if rejects:
+        print(summarise_rejects(rejects, quarantine), file=sys.stderr)
+    try:
+        with phase("write_cache"):
+            write_cache(table, source_fingerprint, cache_path)
+    except OSError:
+        pass
+    return table
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:20:09 2026
+
+@author: A00315995
+
+# Program Name: charts.py
+# purpose: This program draws the visualisations of the dataset onto matplotlib axes. The same drawing
+# functions are used by the interactive show_* functions in main.py and by the headless renderer in render.py.
+# Charts are drawn from precomputed summaries (bin counts, box statistics, density grids) rather than the raw
+# values, so matplotlib's time and memory depend on the number of bins, not the number of movies.
+# It does not import matplotlib itself.
+"""
+from collections import namedtuple
+
+import backend
+from backend import numpy_module
+from correlation import correlation_matrix
+from groupby import group_by
+from histogram import Histogram, count_bins_2d
+from quantiles import quantiles
+from table import NUMERIC_COLUMNS
+from trends import DEFAULT_WINDOW, year_trend
+
+# The binning rule of the histograms (see histogram.RULES) and the most bin edges labelled on the x axis
+HISTOGRAM_RULE = "fd"
+HISTOGRAM_TICK_LIMIT = 20
+# The columns of the trend line chart, with their legend labels
+TREND_COLUMNS = (("budget", "Budget"), ("worldwide_gross", "Worldwide Gross"))
+# Above this many points the scatter plot is drawn as a density grid of SCATTER_BINS x SCATTER_BINS cells
+SCATTER_POINT_LIMIT = 20000
+SCATTER_BINS = 200
+
+# figsize : the figure size in inches (None for the matplotlib default)
+# draw : function(ax, *data) drawing the chart onto the axes
+# data : function(table) returning the arguments of 'draw' from a MovieTable
+Chart = namedtuple("Chart", ("figsize", "draw", "data"))
+
+
+def box_summary(data_list, label=None):
+    """
+    This function computes the statistics of one box of a box plot in the form matplotlib's Axes.bxp expects:
+    quartiles from one quantile selection, and the mean and whisker ends (the furthest values within
+    1.5 IQR of the box, as Axes.boxplot draws them) from one pass over the data.
+
+    Parameters
+    ----------
+    data_list : sequence
+        Numeric values.
+    label : str, optional
+        The tick label of the box.
+
+    Returns
+    -------
+    dict
+        The box statistics, without outliers.
+
+    """
+    lower_quartile, median, upper_quartile = quantiles(data_list, [0.25, 0.5, 0.75])
+    spread = 1.5 * (upper_quartile - lower_quartile)
+    low_limit, high_limit = lower_quartile - spread, upper_quartile + spread
+    np = numpy_module()
+    if np is not None:
+        values = backend.as_array(data_list)
+        inside = values[(values >= low_limit) & (values <= high_limit)]
+        mean = float(values.mean())
+        whisker_low = float(inside.min()) if len(inside) else lower_quartile
+        whisker_high = float(inside.max()) if len(inside) else upper_quartile
+    else:
+        total = 0.0
+        whisker_low, whisker_high = upper_quartile, lower_quartile
+        for value in data_list:
+            total += value
+            if low_limit <= value < whisker_low:
+                whisker_low = value
+            if whisker_high < value <= high_limit:
+                whisker_high = value
+        mean = total / len(data_list)
+    stats = {"med": median, "q1": lower_quartile, "q3": upper_quartile, "whislo": min(whisker_low, lower_quartile),
+             "whishi": max(whisker_high, upper_quartile), "mean": mean, "fliers": []}
+    if label is not None:
+        stats["label"] = label
+    return stats
+
+
+def _draw_histogram(ax, data_list, rule):
+    """
+    Draw the bars of the histogram of 'data_list', with bins chosen by 'rule', onto 'ax'.
+    """
+    histogram = Histogram.from_values(data_list, rule)
+    edges = histogram.edges()
+    widths = [right - left for left, right in zip(edges, edges[1:])]
+    ax.bar(edges[:-1], histogram.bin_counts(), width=widths, align="edge", ec="black")
+    if histogram.log:
+        ax.set_xscale("log")
+    elif len(edges) <= HISTOGRAM_TICK_LIMIT:
+        ax.set_xticks(edges)
+
+
+def draw_budget_histogram(ax, budget_list, rule=HISTOGRAM_RULE):
+    """
+    Draw the histogram of budgets onto 'ax', with bins chosen by 'rule' (see histogram.RULES).
+    """
+    ax.set_title("Budgets of Most Profitable Movies")
+    ax.set_xlabel("Budget (in million USD)")
+    ax.set_ylabel("Number of movies")
+    _draw_histogram(ax, budget_list, rule)
+
+
+def draw_gross_histogram(ax, gross_list, rule=HISTOGRAM_RULE):
+    """
+    Draw the histogram of worldwide gross onto 'ax', with bins chosen by 'rule' (see histogram.RULES).
+    """
+    ax.set_title("Worldwide Gross of Most Profitable Movies")
+    ax.set_xlabel("Worldwide gross (in million USD)")
+    ax.set_ylabel("Number of movies")
+    _draw_histogram(ax, gross_list, rule)
+
+
+def draw_roi_histogram(ax, roi_list, rule="log"):
+    """
+    Draw the histogram of the return on investment (worldwide gross / budget, see derived.py) onto 'ax', with
+    logarithmic bins by default, as a few movies returned thousands of times their budget.
+    """
+    ax.set_title("Return on Investment of Most Profitable Movies")
+    ax.set_xlabel("Worldwide gross / budget")
+    ax.set_ylabel("Number of movies")
+    _draw_histogram(ax, roi_list, rule)
+
+
+def draw_budget_boxplot(ax, budget_list):
+    """
+    Draw the box plot of budgets onto 'ax', without outliers.
+    """
+    ax.set_title("Budgets of Most Profitable Movies")
+    ax.set_ylabel("Budget (in million USD)")
+    ax.bxp([box_summary(budget_list, "1")], showfliers=False, showmeans=True, meanline=True)
+
+
+def draw_gross_boxplot(ax, gross_list):
+    """
+    Draw the box plot of worldwide gross onto 'ax', without outliers.
+    """
+    ax.set_title("Worldwide Gross of Most Profitable Movies")
+    ax.set_ylabel("Worldwide gross (in million USD)")
+    ax.bxp([box_summary(gross_list, "1")], showfliers=False, showmeans=True, meanline=True)
+
+
+def draw_scatterplot(ax, budget_list, gross_list, max_points=SCATTER_POINT_LIMIT, bins=SCATTER_BINS):
+    """
+    Draw the scatter plot of budget against worldwide gross onto 'ax'. Above 'max_points' movies the points
+    are counted into a bins x bins grid and drawn as a density map with a logarithmic colour scale.
+    """
+    ax.set_title("Scatter Plot of Budget vs Worldwide gross")
+    ax.set_xlabel("Budget (in million USD)")
+    ax.set_ylabel("Worldwide gross (in million USD)")
+    if len(budget_list) <= max_points:
+        ax.scatter(budget_list, gross_list, marker='.')
+        return
+    from matplotlib.colors import LogNorm
+
+    x_edges, y_edges, counts = count_bins_2d(budget_list, gross_list, bins)
+    # empty cells become NaN so that they are left blank
+    counts = [[count or float("nan") for count in row] for row in counts]
+    mesh = ax.pcolormesh(x_edges, y_edges, counts, norm=LogNorm(), cmap="viridis")
+    ax.figure.colorbar(mesh, ax=ax, label="Number of movies")
+
+
+def draw_piechart(ax, decade_freq_dict):
+    """
+    Draw the pie chart of the number of movies per decade onto 'ax'.
+    """
+    decade_freq_dict = {k: decade_freq_dict[k] for k in sorted(decade_freq_dict)}
+    colors_list = ['tomato', 'cornflowerblue', 'gold', 'orchid', 'greenyellow', 'cyan']
+    ax.set_title("Distribution of Most Profitable Movies by Decade")
+    ax.pie(decade_freq_dict.values(), labels=decade_freq_dict.keys(), autopct="%.0f%%", pctdistance=0.8,
+           colors=colors_list)
+
+
+def draw_barchart(ax, decade_freq_dict):
+    """
+    Draw the horizontal bar chart of the number of movies per decade onto 'ax'.
+    """
+    decade_freq_dict = {k: decade_freq_dict[k] for k in sorted(decade_freq_dict)}
+    ax.set_title("Most Profitable Movies in each Decade")
+    ax.set_xlabel("Number of Movies")
+    ax.set_ylabel("Decade")
+    for index, value in enumerate(decade_freq_dict.values()):
+        ax.text(value, index - 0.1, str(value))
+    ax.barh(list(decade_freq_dict.keys()), decade_freq_dict.values())
+
+
+def draw_category_boxplot(ax, decade_numerical_dict):
+    """
+    Draw a box plot of the worldwide gross of each decade onto 'ax', without outliers.
+    """
+    decade_numerical_dict = {k: decade_numerical_dict[k] for k in sorted(decade_numerical_dict)}
+    ax.set_title("Worldwide Gross for each Decade")
+    ax.set_xlabel("Decade")
+    ax.set_ylabel("Worldwide Gross (in million USD)")
+    ax.bxp([box_summary(values, decade) for decade, values in decade_numerical_dict.items()], showfliers=False,
+           showmeans=True, meanline=True)
+
+
+def draw_correlation_heatmap(ax, names, matrix):
+    """
+    Draw the correlation matrix of the columns 'names' onto 'ax' as a heat map, with each coefficient written
+    in its cell. Pairs without a correlation (None, a constant column) are left blank.
+    """
+    labels = [name.replace("_", " ").capitalize() for name in names]
+    values = [[float("nan") if value is None else value for value in row] for row in matrix]
+    ax.set_title("Correlation between the Numerical Columns")
+    image = ax.imshow(values, cmap="coolwarm", vmin=-1, vmax=1)
+    ax.set_xticks(range(len(labels)), labels, rotation=45, ha="right")
+    ax.set_yticks(range(len(labels)), labels)
+    for row, line in enumerate(matrix):
+        for column, value in enumerate(line):
+            if value is not None:
+                ax.text(column, row, f"{value:.2f}", ha="center", va="center", fontsize=8)
+    ax.figure.colorbar(image, ax=ax, label="Pearson correlation")
+
+
+def draw_trend_lines(ax, years, series):
+    """
+    Draw the rolling means (solid lines) and medians (dashed lines) of 'series', a dictionary of
+    (label, statistic) -> one value per year, against the years onto 'ax'. Years without a value are left out.
+    """
+    ax.set_title(f"{DEFAULT_WINDOW}-Year Rolling Mean and Median by Release Year")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Million USD")
+    for (label, statistic), values in series.items():
+        ax.plot(years, [float("nan") if value is None else value for value in values],
+                linestyle="-" if statistic == "mean" else "--", label=f"{label} ({statistic})")
+    ax.legend()
+
+
+def _decade_counts(table):
+    return (group_by(table, "decade").counts,)
+
+
+def _decade_gross_values(table):
+    return (group_by(table, "decade", {"worldwide_gross": ["values"]}).measure("worldwide_gross", "values"),)
+
+
+def _correlations(table):
+    return NUMERIC_COLUMNS, correlation_matrix(table, NUMERIC_COLUMNS)
+
+
+def _trends(table):
+    series = dict()
+    for column, label in TREND_COLUMNS:
+        trend = year_trend(table, column)
+        for statistic, values in trend.rolling(DEFAULT_WINDOW, ("mean", "median")).items():
+            series[label, statistic] = values
+    return trend.years, series
+
+
+# Every chart of the visualisation menu, in menu order (choices 1-11)
+CHARTS = {
+    "budget_histogram": Chart((10, 5), draw_budget_histogram, lambda table: (table["budget"],)),
+    "gross_histogram": Chart((10, 5), draw_gross_histogram, lambda table: (table["worldwide_gross"],)),
+    "budget_boxplot": Chart(None, draw_budget_boxplot, lambda table: (table["budget"],)),
+    "gross_boxplot": Chart(None, draw_gross_boxplot, lambda table: (table["worldwide_gross"],)),
+    "scatterplot": Chart((10, 7), draw_scatterplot, lambda table: (table["budget"], table["worldwide_gross"])),
+    "piechart": Chart((10, 7), draw_piechart, _decade_counts),
+    "barchart": Chart((10, 7), draw_barchart, _decade_counts),
+    "category_boxplot": Chart((10, 7), draw_category_boxplot, _decade_gross_values),
+    "correlation_heatmap": Chart((10, 8), draw_correlation_heatmap, _correlations),
+    "trend_lines": Chart((11, 6), draw_trend_lines, _trends),
+    "roi_histogram": Chart((10, 5), draw_roi_histogram, lambda table: (table["roi"],)),
+}
@@ -0,0 +1,753 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:26 2026
+
+@author: A00315995
+
+# Program Name: cli.py
+# purpose: This program provides the non-interactive command line of main.py, e.g.
+#   python main.py stats --all --columns budget,gross --format json
+# It computes any subset of the 16 analyses of the statistical menu in one run and prints machine-readable
+# output, e.g. histogram bin counts with
+#   python main.py histogram --columns budget --rule log --format json
+# or rankings and range queries with
+#   python main.py query --column gross --top 10 --rank "Titanic" --between 100,200
+# or title lookups with
+#   python main.py search "avengrs" --format json
+# or the correlation matrix of every numerical column with
+#   python main.py correlation --method spearman --format csv
+# or yearly totals, cumulative totals, year-over-year changes and rolling-window statistics with
+#   python main.py trends --columns budget,gross --window 5 --format csv
+# or bootstrap confidence intervals of statistics with
+#   python main.py bootstrap --stats mean,median,iqr,correlation --resamples 10000 --method bca
+# --dataset also accepts a directory or a glob of shard files, e.g. --dataset "data/*.csv"; stats are then
+# merged from per-shard summaries (see shards.py) and the other commands read every shard.
+# --columns, --column and --where also accept the derived columns of derived.py (roi, profit, domestic_share,
+# international_share), e.g.
+#   python main.py query --column roi --top 10
+# --where restricts any command to the movies that satisfy a condition (see views.py), e.g.
+#   python main.py --where "year>=2010" --where "year<=2019" --where "budget>100" stats --all
+# --profile prints the wall and CPU time and the number of calls of every load phase, statistic and chart of
+# the run (see profiling.py), or writes them as JSON or as collapsed stacks for a flame graph, e.g.
+#   python main.py --profile --profile-output profile.json --profile-memory stats --all
+#   python main.py --profile menu
+# Only the render and menu commands import matplotlib.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from backend import BACKENDS, set_backend
+from correlation import METHODS as CORRELATION_METHODS, correlation_matrix
+from derived import DERIVED_COLUMNS
+from describe import describe
+from groupby import group_by
+from histogram import RULES, Histogram
+from profiling import disable, enable, phase, write_report
+from rank_index import rank_index, row_of_title
+from bootstrap import DEFAULT_RESAMPLES, METHODS as INTERVAL_METHODS, STATISTICS as BOOTSTRAP_STATISTICS, bootstrap
+import render
+from shards import ShardSummary, is_sharded, load_source, summarise_shards
+from table import COLUMNS, DATASET, NUMERIC_COLUMNS
+from title_index import MODES, search
+from trends import DEFAULT_WINDOW, year_trend
+from views import MEMBERSHIP, defined, filter_table, parse_condition
+
+# The analyses of the statistical menu, in menu order (choices 1-16)
+ANALYSES = ("count", "mean", "median", "mode", "max", "min", "range", "iqr", "std", "skewness", "correlation",
+            "categories", "most_movies", "fewest_movies", "highest_gross", "lowest_gross")
+DECADE_ANALYSES = ("categories", "most_movies", "fewest_movies", "highest_gross", "lowest_gross")
+# ColumnSummary attributes reported for each numerical analysis
+SUMMARY_FIELDS = {"count": ("count",), "mean": ("mean",), "median": ("median",), "mode": ("mode",),
+                  "max": ("maximum", "max_title"), "min": ("minimum", "min_title"), "range": ("range",),
+                  "iqr": ("interquartile",), "std": ("std_deviation",),
+                  "skewness": ("mode_skewness", "median_skewness")}
+COLUMN_ALIASES = {"gross": "worldwide_gross"}
+DEFAULT_COLUMNS = "budget,gross"
+
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def resolve_columns(names):
+    """
+    Translate column names given on the command line (e.g. 'gross') to table column names. The derived
+    columns of derived.py (e.g. 'roi') are accepted like the stored ones.
+
+    Raises
+    ------
+    ValueError
+        If a name is not a numerical or derived column.
+
+    """
+    columns = []
+    for name in names:
+        column = COLUMN_ALIASES.get(name, name)
+        if column not in NUMERIC_COLUMNS and column not in DERIVED_COLUMNS:
+            raise ValueError(f"Unknown column '{name}', expected one of: gross, "
+                             f"{', '.join(NUMERIC_COLUMNS + tuple(DERIVED_COLUMNS))}")
+        columns.append(column)
+    return columns
+
+
+def decade_analysis(decade_counts, decade_totals, analyses):
+    """
+    This function computes the decade analyses (menu choices 12-16) from the number of movies and the total
+    gross of each decade. Ties are resolved the same way as in the statistical menu.
+
+    Returns
+    -------
+    dict
+        The requested results.
+
+    """
+    results = dict()
+    if "categories" in analyses:
+        results["categories"] = list(decade_counts)
+    if "most_movies" in analyses:
+        decade = max(decade_counts, key=decade_counts.get)
+        results["most_movies"] = {"decade": decade, "movies": decade_counts[decade]}
+    if "fewest_movies" in analyses:
+        decade = min(decade_counts, key=decade_counts.get)
+        results["fewest_movies"] = {"decade": decade, "movies": decade_counts[decade]}
+    if "highest_gross" in analyses:
+        decade = max(reversed(decade_totals), key=decade_totals.get)
+        results["highest_gross"] = {"decade": decade, "total": decade_totals[decade]}
+    if "lowest_gross" in analyses:
+        decade = min(reversed(decade_totals), key=decade_totals.get)
+        results["lowest_gross"] = {"decade": decade, "total": decade_totals[decade]}
+    return results
+
+
+def run_stats(table, analyses, columns):
+    """
+    This function computes the requested analyses over the requested numerical columns. The numerical
+    statistics come from describe(), the correlations from one correlation_matrix() pass and the decade
+    analyses from one group_by() pass.
+
+    Parameters
+    ----------
+    table : MovieTable or ShardSummary
+        The loaded dataset, or the merged summary of a sharded dataset (see shards.py).
+    analyses : list
+        Names from ANALYSES.
+    columns : list
+        Numerical column names.
+
+    Returns
+    -------
+    dict
+        The results, ready to be written as JSON.
+
+    """
+    sharded = isinstance(table, ShardSummary)
+    results = {"rows": len(table), "columns": dict()}
+    numerical = [analysis for analysis in analyses if analysis in SUMMARY_FIELDS]
+    if numerical:
+        if sharded:
+            description = table.describe(columns)
+        else:
+            # each column over the movies where it is defined, so that a NaN derived value leaves out its movie
+            description = dict()
+            for column in columns:
+                view = defined(table, [column])
+                description[column] = describe({column: view[column]}, view["title"])[column]
+        for column in columns:
+            summary = description[column]
+            results["columns"][column] = {field: getattr(summary, field)
+                                          for analysis in numerical for field in SUMMARY_FIELDS[analysis]}
+    if "correlation" in analyses:
+        results["correlation"] = dict()
+        matrix = None if sharded else correlation_matrix(table, columns)
+        for i, x_name in enumerate(columns):
+            for j in range(i + 1, len(columns)):
+                if sharded:
+                    correlation = table.correlation(x_name, columns[j])
+                else:
+                    correlation = round(matrix[i][j], 2) if matrix[i][j] is not None else None
+                results["correlation"][f"{x_name},{columns[j]}"] = correlation
+    decade_analyses = [analysis for analysis in analyses if analysis in DECADE_ANALYSES]
+    if decade_analyses:
+        if sharded:
+            decade_counts, decade_totals = table.decade_counts, table.decade_totals
+        else:
+            decades = group_by(table, "decade", {"worldwide_gross": ["sum"]})
+            decade_counts, decade_totals = decades.counts, decades.measure("worldwide_gross", "sum")
+        results["decades"] = decade_analysis(decade_counts, decade_totals, decade_analyses)
+    return results
+
+
+def _flatten(results):
+    """
+    Yield (subject, statistic, value) rows of the results for CSV and text output.
+    """
+    yield "dataset", "rows", results["rows"]
+    for column, statistics in results["columns"].items():
+        for statistic, value in statistics.items():
+            yield column, statistic, value
+    for pair, value in results.get("correlation", dict()).items():
+        yield pair, "correlation", value
+    for analysis, value in results.get("decades", dict()).items():
+        if isinstance(value, dict):
+            for field, item in value.items():
+                yield "decade", f"{analysis}_{field}", item
+        else:
+            yield "decade", analysis, ";".join(value)
+
+
+def write_results(results, output_format, stream):
+    """
+    Write the results to 'stream' as 'json', 'csv' or 'text'.
+    """
+    if output_format == "json":
+        json.dump(results, stream, indent=2)
+        stream.write("\n")
+    elif output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("subject", "statistic", "value"))
+        writer.writerows(_flatten(results))
+    else:
+        for subject, statistic, value in _flatten(results):
+            stream.write(f"{subject} {statistic}: {value}\n")
+
+
+def run_histograms(table, columns, rule, width=None):
+    """
+    This function counts the histogram of each requested numerical column.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    columns : list
+        Numerical column names.
+    rule : str
+        The binning rule, one of histogram.RULES.
+    width : float, optional
+        A fixed bin width (in log10 units for the 'log' rule) instead of the one chosen by the rule.
+
+    Returns
+    -------
+    dict
+        The histograms, ready to be written as JSON.
+
+    """
+    results = {"rows": len(table), "rule": rule, "columns": dict()}
+    for column in columns:
+        if width:
+            histogram = Histogram(width, log=rule == "log")
+            histogram.update(table[column])
+        else:
+            histogram = Histogram.from_values(table[column], rule)
+        results["columns"][column] = histogram.to_dict()
+    return results
+
+
+def write_histograms(results, output_format, stream):
+    """
+    Write the histograms to 'stream' as 'json', 'csv' (one row per bin) or 'text'.
+    """
+    if output_format == "json":
+        json.dump(results, stream, indent=2)
+        stream.write("\n")
+        return
+    rows = [(column, lower, upper, count) for column, histogram in results["columns"].items()
+            for lower, upper, count in zip(histogram["edges"], histogram["edges"][1:], histogram["counts"])]
+    if output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("column", "lower", "upper", "count"))
+        writer.writerows(rows)
+    else:
+        for column, lower, upper, count in rows:
+            stream.write(f"{column} [{lower:g}, {upper:g}): {count}\n")
+
+
+def run_correlation(table, columns, method="pearson"):
+    """
+    This function computes the correlation matrix of the requested numerical columns.
+
+    Returns
+    -------
+    dict
+        The results, ready to be written as JSON: the matrix as a list of rows in the order of 'columns'.
+
+    """
+    return {"rows": len(table), "method": method, "columns": list(columns),
+            "matrix": correlation_matrix(table, columns, method)}
+
+
+def write_correlation(results, output_format, stream):
+    """
+    Write the correlation matrix to 'stream' as 'json', 'csv' (one row per pair of columns) or 'text' (a table).
+    """
+    if output_format == "json":
+        json.dump(results, stream, indent=2)
+        stream.write("\n")
+        return
+    columns, matrix = results["columns"], results["matrix"]
+    if output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("x", "y", results["method"]))
+        writer.writerows((x_name, y_name, matrix[i][j]) for i, x_name in enumerate(columns)
+                         for j, y_name in enumerate(columns) if i < j)
+        return
+    # the columns of the table are numbered like its rows, as the names are too long to head them
+    width = max(len(name) for name in columns) + 5
+    stream.write(" " * width + "".join(f" {f'({number})':>7}" for number in range(1, len(columns) + 1)) + "\n")
+    for number, (name, row) in enumerate(zip(columns, matrix), 1):
+        stream.write(f"{f'({number}) {name}':<{width}}" + "".join("       -" if value is None else f" {value:7.2f}"
+                                                                for value in row) + "\n")
+
+
+def run_bootstrap(table, statistics, columns, resamples=DEFAULT_RESAMPLES, confidence=0.95, method="bca", seed=0,
+                  workers=None):
+    """
+    This function computes a bootstrap confidence interval of each statistic for each numerical column;
+    'correlation' is computed once, for the first two columns.
+
+    Returns
+    -------
+    dict
+        The results, ready to be written as JSON: one entry per column (or pair of columns) and statistic.
+
+    """
+    results = {"rows": len(table), "resamples": resamples, "confidence": confidence, "method": method,
+               "seed": seed, "intervals": []}
+    for statistic in statistics:
+        subjects = [columns[:2]] if statistic == "correlation" else [(column,) for column in columns]
+        for subject in subjects:
+            view = defined(table, subject)
+            interval = bootstrap([view[column] for column in subject], statistic, resamples, confidence, method,
+                                 seed, workers)
+            results["intervals"].append({"subject": "-".join(subject), "statistic": statistic,
+                                         "estimate": interval.estimate, "low": interval.low, "high": interval.high,
+                                         "standard_error": interval.standard_error,
+                                         "resamples": interval.resamples})
+    return results
+
+
+def write_bootstrap(results, output_format, stream):
+    """
+    Write the intervals to 'stream' as 'json', 'csv' (one row per interval) or 'text'.
+    """
+    if output_format == "json":
+        json.dump(results, stream, indent=2)
+        stream.write("\n")
+        return
+    fields = ("subject", "statistic", "estimate", "low", "high", "standard_error", "resamples")
+    if output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(fields)
+        writer.writerows([interval[field] for field in fields] for interval in results["intervals"])
+        return
+    for interval in results["intervals"]:
+        stream.write(f"{interval['subject']} {interval['statistic']}: {interval['estimate']:.4g} "
+                     f"[{interval['low']:.4g}, {interval['high']:.4g}] ({results['confidence']:.0%} "
+                     f"{results['method']}, standard error {interval['standard_error']:.4g})\n")
+
+
+def run_trends(table, columns, window=DEFAULT_WINDOW):
+    """
+    This function follows each numerical column over the release years: per year its count, total, mean,
+    cumulative total, year-over-year change of the total, and the rolling mean, median and total of the
+    'window' years ending that year.
+
+    Returns
+    -------
+    dict
+        The results, ready to be written as JSON: one list of yearly entries per column.
+
+    """
+    results = {"rows": len(table), "window": window, "columns": dict()}
+    for column in columns:
+        trend = year_trend(table, column)
+        rolling = trend.rolling(window, ("mean", "median", "total"))
+        results["columns"][column] = [
+            {"year": year, "count": count, "total": total, "mean": mean, "cumulative": cumulative,
+             "yoy_percent": change, "rolling_mean": rolling_mean, "rolling_median": rolling_median,
+             "rolling_total": rolling_total}
+            for year, count, total, mean, cumulative, change, rolling_mean, rolling_median, rolling_total
+            in zip(trend.years, trend.counts, trend.totals, trend.means(), trend.cumulative(),
+                   trend.year_over_year("total"), rolling["mean"], rolling["median"], rolling["total"])]
+    return results
+
+
+def write_trends(results, output_format, stream):
+    """
+    Write the yearly trends to 'stream' as 'json', 'csv' (one row per column and year) or 'text'.
+    """
+    if output_format == "json":
+        json.dump(results, stream, indent=2)
+        stream.write("\n")
+        return
+    fields = ("year", "count", "total", "mean", "cumulative", "yoy_percent", "rolling_mean", "rolling_median",
+              "rolling_total")
+    if output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("column",) + fields)
+        writer.writerows([column] + ["" if entry[field] is None else entry[field] for field in fields]
+                         for column, entries in results["columns"].items() for entry in entries)
+        return
+    for column, entries in results["columns"].items():
+        stream.write(f"{column} ({results['window']}-year rolling windows)\n")
+        stream.write(f"{'year':>6} {'count':>6} {'total':>10} {'cumulative':>11} {'yoy %':>8} "
+                     f"{'roll mean':>10} {'roll median':>11}\n")
+        for entry in entries:
+            stream.write(f"{entry['year']:>6} {entry['count']:>6} {entry['total']:>10.2f} "
+                         f"{entry['cumulative']:>11.2f} {_optional(entry['yoy_percent'], 8, '+.1f')} "
+                         f"{_optional(entry['rolling_mean'], 10, '.2f')} "
+                         f"{_optional(entry['rolling_median'], 11, '.2f')}\n")
+
+
+def _derived(args):
+    """
+    Return True if the command asks for a derived column, which the summaries of sharded datasets do not hold.
+    """
+    names = _split(getattr(args, "columns", ""))
+    return any(COLUMN_ALIASES.get(name, name) in DERIVED_COLUMNS for name in names)
+
+
+def _optional(value, width, spec):
+    return f"{'-' if value is None else format(value, spec):>{width}}"
+
+
+def run_query(table, column, top=None, bottom=None, titles=(), between=None):
+    """
+    This function answers ranking and range queries on one numerical column from its rank index.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    column : str
+        A numerical column name.
+    top, bottom : int, optional
+        The number of movies with the highest / lowest values to list.
+    titles : list
+        Titles of movies whose rank is requested.
+    between : tuple, optional
+        A (low, high) range of values, both included.
+
+    Raises
+    ------
+    ValueError
+        If a title is not in the dataset.
+
+    Returns
+    -------
+    dict
+        The results, ready to be written as JSON. Every movie is listed with its rank, title and value.
+
+    """
+    index = rank_index(table, column)
+    results = {"rows": len(table), "column": column}
+    if top is not None:
+        results["top"] = index.entries(index.top_k(top))
+    if bottom is not None:
+        results["bottom"] = index.entries(index.bottom_k(bottom))
+    if titles:
+        results["ranks"] = index.entries([row_of_title(table, title) for title in titles])
+    if between is not None:
+        low, high = between
+        results["between"] = {"low": low, "high": high, "movies": index.entries(index.between(low, high))}
+    return results
+
+
+def write_query(results, output_format, stream):
+    """
+    Write the query results to 'stream' as 'json', 'csv' (one row per listed movie) or 'text'.
+    """
+    if output_format == "json":
+        json.dump(results, stream, indent=2)
+        stream.write("\n")
+        return
+    rows = [(query, entry["rank"], entry["title"], entry["value"])
+            for query in ("top", "bottom", "ranks") for entry in results.get(query, ())]
+    rows += [("between", entry["rank"], entry["title"], entry["value"])
+             for entry in results.get("between", dict()).get("movies", ())]
+    if output_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(("query", "rank", "title", results["column"]))
+        writer.writerows(rows)
+    else:
+        for query, rank, title, value in rows:
+            stream.write(f"{query} {rank}: {title} ({value:g})\n")
+
+
+def write_movies(movies, output_format, stream):
+    """
+    Write the movie records found by a search to 'stream' as 'json', 'csv' or 'text'.
+    """
+    if output_format == "json":
+        json.dump(movies, stream, indent=2)
+        stream.write("\n")
+    elif output_format == "csv":
+        writer = csv.DictWriter(stream, ["match", "similarity"] + [name for name, _ in COLUMNS],
+                                lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(movies)
+    else:
+        for movie in movies:
+            similarity = f" {movie['similarity']}" if "similarity" in movie else ""
+            stream.write(f"{movie['match']}{similarity}: {movie['title'].strip()} ({movie['year']}, "
+                         f"{movie['decade']}) budget {movie['budget']:g}, gross {movie['worldwide_gross']:g}\n")
+
+
+def _range(value):
+    try:
+        low, high = (float(bound) for bound in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LOW,HIGH, got '{value}'") from None
+    return low, high
+
+
+def _condition(value):
+    """
+    Read a --where condition (see views.parse_condition), translating the column name and checking the values.
+    """
+    try:
+        name, operator, operand = parse_condition(value)
+        column = COLUMN_ALIASES.get(name, name)
+        if column not in dict(COLUMNS) and column not in DERIVED_COLUMNS:
+            raise ValueError(f"Unknown column '{name}', expected one of: gross, "
+                             f"{', '.join(list(dict(COLUMNS)) + list(DERIVED_COLUMNS))}")
+        if column in NUMERIC_COLUMNS or column in DERIVED_COLUMNS:
+            for item in operand if operator == MEMBERSHIP else [operand]:
+                float(item)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+    return column, operator, operand
+
+
+def build_parser():
+    """
+    Return the argument parser of the command line.
+    """
+    parser = argparse.ArgumentParser(prog="main.py",
+                                     description="Statistical and visual analysis of the most profitable "
+                                                 "Hollywood movies. Run without arguments for the interactive menu.")
+    parser.add_argument("--dataset", default=DATASET,
+                        help="path of the dataset CSV, or a directory or glob of shard files (default: %(default)s)")
+    parser.add_argument("--backend", choices=BACKENDS,
+                        help="compute backend (default: the HOLLYWOOD_BACKEND environment variable, or 'auto')")
+    parser.add_argument("--where", type=_condition, action="append", default=[], metavar="CONDITION",
+                        help="only use the movies satisfying a condition such as year>=2010, budget<50 or "
+                             "decade=2000's,2010's; repeat to combine conditions")
+    parser.add_argument("--profile", action="store_true",
+                        help="time every load phase, statistic and chart of the run and print the report on stderr")
+    parser.add_argument("--profile-output", metavar="PATH",
+                        help="with --profile, write the report to PATH instead: JSON if PATH ends in .json, "
+                             "collapsed stacks for flame graph tools otherwise")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="with --profile, also record the allocation peak of every phase (slower)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stats = commands.add_parser("stats", help="compute statistics without the interactive menu")
+    stats.add_argument("--all", action="store_true", help="compute all 16 analyses")
+    stats.add_argument("--stats", default="", help=f"comma separated analyses from: {', '.join(ANALYSES)}")
+    stats.add_argument("--columns", default=DEFAULT_COLUMNS,
+                       help="comma separated numerical columns (default: %(default)s)")
+    stats.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    histograms = commands.add_parser("histogram", help="count histogram bins of numerical columns")
+    histograms.add_argument("--columns", default=DEFAULT_COLUMNS,
+                            help="comma separated numerical columns (default: %(default)s)")
+    histograms.add_argument("--rule", choices=RULES, default="fd",
+                            help="binning rule: Freedman-Diaconis, Sturges or log-scale (default: %(default)s)")
+    histograms.add_argument("--width", type=float, help="fixed bin width instead of the rule's choice")
+    histograms.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    query = commands.add_parser("query", help="top/bottom movies, ranks and value ranges of a numerical column")
+    query.add_argument("--column", default="gross", help="numerical column (default: %(default)s)")
+    query.add_argument("--top", type=int, metavar="K", help="list the K movies with the highest values")
+    query.add_argument("--bottom", type=int, metavar="K", help="list the K movies with the lowest values")
+    query.add_argument("--rank", action="append", default=[], metavar="TITLE",
+                       help="rank of the movie with this title (1 is the highest); can be repeated")
+    query.add_argument("--between", type=_range, metavar="LOW,HIGH",
+                       help="list the movies with a value from LOW to HIGH")
+    query.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    lookup = commands.add_parser("search", help="look movies up by title (exact, prefix or typo-tolerant)")
+    lookup.add_argument("title", help="a title, the first letters of titles or a misspelt title")
+    lookup.add_argument("--mode", choices=MODES, default="auto",
+                        help="'auto' tries exact, then prefix, then fuzzy matching (default: %(default)s)")
+    lookup.add_argument("--limit", type=int, default=10, help="largest number of movies (default: %(default)s)")
+    lookup.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    correlations = commands.add_parser("correlation", help="correlation matrix of numerical columns")
+    correlations.add_argument("--columns", default="all",
+                              help="comma separated numerical columns, or 'all' (default)")
+    correlations.add_argument("--method", choices=CORRELATION_METHODS, default="pearson",
+                              help="Pearson, or Spearman rank correlation (default: %(default)s)")
+    correlations.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    yearly = commands.add_parser("trends", help="yearly, cumulative and rolling-window trends of numerical columns")
+    yearly.add_argument("--columns", default=DEFAULT_COLUMNS,
+                        help="comma separated numerical columns (default: %(default)s)")
+    yearly.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help="years per rolling window (default: %(default)s)")
+    yearly.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    intervals = commands.add_parser("bootstrap", help="bootstrap confidence intervals of statistics")
+    intervals.add_argument("--stats", default="mean,median,iqr",
+                           help=f"comma separated statistics from: {', '.join(BOOTSTRAP_STATISTICS)} "
+                                "(default: %(default)s)")
+    intervals.add_argument("--columns", default=DEFAULT_COLUMNS,
+                           help="comma separated numerical columns; correlation uses the first two "
+                                "(default: %(default)s)")
+    intervals.add_argument("--resamples", type=int, default=DEFAULT_RESAMPLES)
+    intervals.add_argument("--confidence", type=float, default=0.95)
+    intervals.add_argument("--method", choices=INTERVAL_METHODS, default="bca")
+    intervals.add_argument("--seed", type=int, default=0, help="the same seed gives the same intervals")
+    intervals.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    intervals.add_argument("--format", choices=("text", "json", "csv"), default="text")
+
+    charts = commands.add_parser("render", help="write the visualisations to image files without a display")
+    charts.add_argument("--charts", default="all", help="comma separated chart names, or 'all' (default)")
+    charts.add_argument("--format", default="png", help=f"comma separated formats from: {', '.join(render.FORMATS)}")
+    charts.add_argument("--output", default="charts", help="output directory (default: %(default)s)")
+    charts.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    charts.add_argument("--dpi", type=int, default=100)
+
+    commands.add_parser("menu", help="the interactive menu of main.py, on the dataset chosen with these options")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the command line and return the process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.backend:
+        set_backend(args.backend)
+    if not args.profile:
+        return run(parser, args)
+    enable(args.profile_memory)
+    try:
+        return run(parser, args)
+    finally:
+        write_report(disable(), args.profile_output)
+
+
+def _check_arguments(parser, args):
+    """
+    Check the options of the command before the dataset is loaded, so that a mistake is reported at once
+    (parser.error() exits), and return the numerical columns the command uses, translated to table names.
+    """
+    columns = []
+    try:
+        if args.command == "stats":
+            analyses = list(ANALYSES) if args.all else _split(args.stats)
+            unknown = [analysis for analysis in analyses if analysis not in ANALYSES]
+            if unknown or not analyses:
+                parser.error(f"choose --all or --stats from: {', '.join(ANALYSES)}")
+            columns = resolve_columns(_split(args.columns))
+        elif args.command in ("histogram", "trends"):
+            columns = resolve_columns(_split(args.columns))
+            if args.command == "histogram" and args.width is not None and args.width <= 0:
+                parser.error("--width must be a positive number")
+            if args.command == "trends" and args.window < 1:
+                parser.error("--window must be at least 1")
+        elif args.command == "query":
+            columns = resolve_columns([args.column])
+            if args.top is None and args.bottom is None and not args.rank and args.between is None:
+                parser.error("choose at least one of --top, --bottom, --rank or --between")
+        elif args.command == "correlation":
+            columns = NUMERIC_COLUMNS if args.columns == "all" else resolve_columns(_split(args.columns))
+            if len(columns) < 2:
+                parser.error("--columns needs at least two columns")
+        elif args.command == "bootstrap":
+            statistics = _split(args.stats)
+            unknown = [statistic for statistic in statistics if statistic not in BOOTSTRAP_STATISTICS]
+            if unknown or not statistics:
+                parser.error(f"choose --stats from: {', '.join(BOOTSTRAP_STATISTICS)}")
+            columns = resolve_columns(_split(args.columns))
+            if "correlation" in statistics and len(columns) < 2:
+                parser.error("correlation needs two --columns")
+        elif args.command == "render":
+            render.check_charts(None if args.charts == "all" else _split(args.charts), _split(args.format))
+    except ValueError as error:
+        parser.error(str(error))
+    return columns
+
+
+def run(parser, args):
+    """
+    Run the command given by the parsed arguments and return the process exit code. The options are checked
+    before the dataset is loaded.
+    """
+    columns = _check_arguments(parser, args)
+    try:
+        with phase("load"):
+            if args.command == "stats" and is_sharded(args.dataset) and not args.where and not _derived(args):
+                table = summarise_shards(args.dataset, exact_columns=[column for column in columns
+                                                                      if column in NUMERIC_COLUMNS])
+            else:
+                table = load_source(args.dataset)
+    except FileNotFoundError:
+        print(f"Dataset file '{args.dataset}' not found.", file=sys.stderr)
+        return 1
+    if args.where:
+        table = filter_table(table, args.where)
+        if not len(table):
+            print("error: no movie satisfies the --where conditions", file=sys.stderr)
+            return 1
+    if args.command == "stats":
+        analyses = list(ANALYSES) if args.all else _split(args.stats)
+        write_results(run_stats(table, analyses, columns), args.format, sys.stdout)
+    elif args.command == "histogram":
+        write_histograms(run_histograms(table, columns, args.rule, args.width), args.format, sys.stdout)
+    elif args.command == "query":
+        try:
+            results = run_query(table, columns[0], args.top, args.bottom, args.rank, args.between)
+        except ValueError as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+        write_query(results, args.format, sys.stdout)
+    elif args.command == "correlation":
+        write_correlation(run_correlation(table, columns, args.method), args.format, sys.stdout)
+    elif args.command == "search":
+        movies = search(table, args.title, args.mode, args.limit)
+        if not movies:
+            print(f"No movie found for '{args.title}'", file=sys.stderr)
+            return 1
+        write_movies(movies, args.format, sys.stdout)
+    elif args.command == "trends":
+        try:
+            results = run_trends(table, columns, args.window)
+        except ValueError as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+        write_trends(results, args.format, sys.stdout)
+    elif args.command == "bootstrap":
+        try:
+            results = run_bootstrap(table, _split(args.stats), columns, args.resamples, args.confidence,
+                                    args.method, args.seed, args.workers)
+        except ValueError as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 1
+        write_bootstrap(results, args.format, sys.stdout)
+    elif args.command == "render":
+        names = None if args.charts == "all" else _split(args.charts)
+        manifest = render.render_all(args.dataset, args.output, names, _split(args.format), args.workers,
+                                     args.dpi, args.where, table)
+        for entry in manifest["charts"]:
+            print(f"{entry['file']}: {entry['total_seconds']:.3f}s")
+        print(f"{len(manifest['charts'])} files in {manifest['wall_seconds']:.3f}s, "
+              f"manifest: {os.path.join(args.output, render.MANIFEST)}")
+    elif args.command == "menu":
+        from main import display_menu
+
+        try:
+            display_menu(table)
+        except SystemExit:
+            pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
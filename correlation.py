@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:47:26 2026
+
+@author: A00315995
+
+# Program Name: correlation.py
+# purpose: This program computes the correlations between every pair of numerical columns at once. The
+# co-moment matrix of all the columns is accumulated in one pass over the rows, a chunk of rows at a time
+# (one matrix product per chunk under the NumPy backend), and gives the Pearson matrix; the Spearman matrix
+# is the Pearson matrix of the ranks read from the sorted indexes of rank_index.py.
+"""
+from math import sqrt
+from operator import mul
+
+import backend
+from backend import numpy_module
+from profiling import profiled
+from rank_index import rank_index
+from table import NUMERIC_COLUMNS
+from views import defined
+
+METHODS = ("pearson", "spearman")
+# Rows are accumulated this many at a time, so the copies made for the matrix product stay small
+CHUNK_ROWS = 1 << 16
+
+
+class CovarianceMatrix:
+    """
+    The count, means and co-moments (sums of products of deviations from the means) of several numerical
+    columns, co_moments[i][j] for columns names[i] and names[j]. It is updated a chunk of rows at a time and
+    can be merged with the matrix of other rows, the same way online.Moments merges variances.
+    """
+
+    __slots__ = ("names", "count", "means", "co_moments")
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.count = 0
+        self.means = [0.0] * len(self.names)
+        self.co_moments = [[0.0] * len(self.names) for _ in self.names]
+
+    def update(self, columns):
+        """
+        Add the rows of 'columns', read CHUNK_ROWS rows at a time.
+
+        Parameters
+        ----------
+        columns : mapping
+            A MovieTable or a dictionary holding an aligned sequence for each of 'names'.
+
+        Returns
+        -------
+        CovarianceMatrix
+            This matrix, to allow chaining.
+
+        """
+        data = [columns[name] for name in self.names]
+        count = len(data[0]) if data else 0
+        np = numpy_module()
+        if np is not None:
+            data = [backend.as_array(values) for values in data]
+        for start in range(0, count, CHUNK_ROWS):
+            chunk = CovarianceMatrix(self.names)
+            chunk.count = min(count - start, CHUNK_ROWS)
+            if np is not None:
+                rows = np.vstack([values[start:start + CHUNK_ROWS] for values in data])
+                means = rows.mean(axis=1)
+                deviations = rows - means[:, None]
+                chunk.means = means.tolist()
+                chunk.co_moments = (deviations @ deviations.T).tolist()
+            else:
+                deviations = []
+                for position, values in enumerate(data):
+                    values = values[start:start + CHUNK_ROWS]
+                    chunk.means[position] = mean = sum(values) / chunk.count
+                    deviations.append([value - mean for value in values])
+                for i, x_deviations in enumerate(deviations):
+                    for j in range(i, len(deviations)):
+                        chunk.co_moments[i][j] = chunk.co_moments[j][i] = sum(map(mul, x_deviations,
+                                                                                  deviations[j]))
+            self.merge(chunk)
+        return self
+
+    def merge(self, other):
+        """
+        Merge the matrix of other rows of the same columns into this one.
+
+        Returns
+        -------
+        CovarianceMatrix
+            This matrix, to allow chaining.
+
+        """
+        if other.names != self.names:
+            raise ValueError("Only matrices of the same columns can be merged")
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.means = other.count, list(other.means)
+            self.co_moments = [list(row) for row in other.co_moments]
+            return self
+        count = self.count + other.count
+        deltas = [theirs - mine for mine, theirs in zip(self.means, other.means)]
+        weight = self.count * other.count / count
+        for i, row in enumerate(self.co_moments):
+            for j in range(len(row)):
+                row[j] += other.co_moments[i][j] + deltas[i] * deltas[j] * weight
+        self.means = [mean + delta * other.count / count for mean, delta in zip(self.means, deltas)]
+        self.count = count
+        return self
+
+    def covariance(self):
+        """
+        Return the sample covariance matrix (divided by count - 1).
+        """
+        return [[co_moment / (self.count - 1) for co_moment in row] for row in self.co_moments]
+
+    def pearson(self, x_name, y_name):
+        """
+        Return the Pearson correlation of two of the columns, or None if either is constant.
+        """
+        i, j = self.names.index(x_name), self.names.index(y_name)
+        x_m2, y_m2 = self.co_moments[i][i], self.co_moments[j][j]
+        if not x_m2 or not y_m2:
+            return None
+        return self.co_moments[i][j] / (sqrt(x_m2) * sqrt(y_m2))
+
+    def correlations(self):
+        """
+        Return the Pearson correlation matrix, with None for the pairs involving a constant column.
+        """
+        return [[self.pearson(x_name, y_name) for y_name in self.names] for x_name in self.names]
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, state):
+        matrix = cls(state["names"])
+        matrix.count, matrix.means, matrix.co_moments = state["count"], state["means"], state["co_moments"]
+        return matrix
+
+
+@profiled()
+def correlation_matrix(table, columns=NUMERIC_COLUMNS, method="pearson"):
+    """
+    This function computes the correlation of every pair of the numerical 'columns' in one pass over the rows.
+
+    Parameters
+    ----------
+    table : MovieTable or TableView
+        The loaded dataset. Movies with a NaN derived value in one of the columns are left out (see
+        views.defined).
+    columns : sequence
+        Numerical column names.
+    method : str
+        'pearson', or 'spearman' for the Pearson correlation of the ranks of the values (equal values sharing
+        their mean rank), which are read from the cached sorted index of each column.
+
+    Returns
+    -------
+    list
+        The matrix as a list of rows in the order of 'columns', with None for pairs involving a constant column.
+
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown correlation method '{method}', expected one of: {', '.join(METHODS)}")
+    table = defined(table, columns)
+    if method == "spearman":
+        table = {name: rank_index(table, name).fractional_ranks() for name in columns}
+    return CovarianceMatrix(columns).update(table).correlations()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 24 11:26:48 2026
+
+@author: A00315995
+
+# Program Name: derived.py
+# purpose: This program declares the columns derived from the dataset columns, such as the return on investment
+# (worldwide gross / budget), the profit and the domestic and international shares of the worldwide gross.
+# A derived column is computed the first time it is read, in one vectorised pass (a NumPy expression, or the
+# expression mapped over the columns in C under the pure-Python backend), and kept in the table's 'indexes'
+# cache, which is emptied when rows are appended; a reloaded dataset is a new table. Columns that are never
+# read cost neither time nor memory.
+"""
+from array import array
+from collections import namedtuple
+import operator
+
+from backend import numpy_module
+
+# arguments : the names of the columns the expression is computed from
+# function : function(*arguments) giving the derived values, applied to whole NumPy arrays, or to the values of
+#            one movie at a time under the pure-Python backend; it uses operators that work on both
+# label : the name of the column in the output
+# unit : the unit of its values
+DerivedColumn = namedtuple("DerivedColumn", ("arguments", "function", "label", "unit"))
+
+
+def _percent_of(part, whole):
+    return part * 100 / whole
+
+
+DERIVED_COLUMNS = {
+    "roi": DerivedColumn(("worldwide_gross", "budget"), operator.truediv, "return on investment", "x budget"),
+    "profit": DerivedColumn(("worldwide_gross", "budget"), operator.sub, "profit", "million USD"),
+    "domestic_share": DerivedColumn(("domestic_gross", "worldwide_gross"), _percent_of, "domestic share", "%"),
+    "international_share": DerivedColumn(("international_gross", "worldwide_gross"), _percent_of,
+                                         "international share", "%"),
+}
+
+
+def _compute_python(function, columns):
+    """
+    Map the expression over the columns; a value dividing by zero (e.g. a budget of 0) becomes NaN.
+    """
+    try:
+        return array("d", map(function, *columns))
+    except ZeroDivisionError:
+        values = array("d")
+        for arguments in zip(*columns):
+            try:
+                values.append(function(*arguments))
+            except ZeroDivisionError:
+                values.append(float("nan"))
+        return values
+
+
+def derived_column(table, name):
+    """
+    This function returns the derived column 'name' of a table, computing it on first use and keeping it in
+    table.indexes for every later use until rows are appended.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The dataset.
+    name : str
+        A name of DERIVED_COLUMNS.
+
+    Returns
+    -------
+    array
+        The values of the derived column, one per movie, as an array('d') like the stored numerical columns.
+        Values that cannot be computed (a division by zero) are NaN; rank indexes, histograms and yearly
+        trends leave those movies out, and views.defined() leaves them out of the statistics, correlations and
+        bootstrap intervals.
+
+    """
+    key = ("derived", name)
+    column = table.indexes.get(key)
+    if column is not None:
+        return column
+    derived = DERIVED_COLUMNS[name]
+    columns = [table.column(argument) for argument in derived.arguments]
+    np = numpy_module()
+    if np is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = derived.function(*(np.asarray(column, dtype=np.float64) for column in columns))
+        values[~np.isfinite(values)] = np.nan
+        # stored as an array('d') sharing nothing with NumPy, so that it pickles and hashes like a stored column
+        column = array("d", values.tobytes())
+    else:
+        column = _compute_python(derived.function, columns)
+    table.indexes[key] = column
+    return column
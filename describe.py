@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:47 2026
+
+@author: A00315995
+
+# Program Name: describe.py
+# purpose: This program computes every numerical statistic offered by the statistical menu with one sort and
+# one accumulation pass per column, and returns them together as a single Description object.
+"""
+from math import fsum, sqrt
+
+import backend
+from backend import numpy_module
+from frequency import FrequencyTable
+from profiling import profiled
+
+
+class ColumnSummary:
+    """
+    The statistics of one numerical column. Rounding follows the calculate_* functions in main.py:
+    range, standard deviation and both skewness measures are rounded to two decimal places.
+    The skewness measures are None when the standard deviation is zero.
+    """
+
+    __slots__ = ("count", "total", "mean", "median", "mode", "minimum", "maximum", "argmin", "argmax",
+                 "min_title", "max_title", "range", "lower_quartile", "upper_quartile", "interquartile",
+                 "std_deviation", "mode_skewness", "median_skewness")
+
+    def as_dict(self):
+        """
+        Return the statistics as a dictionary, e.g. for JSON output.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Description:
+    """
+    The result of describe(): a ColumnSummary per column, read with description["budget"],
+    and the correlation between the requested pair of columns (None if no pair was requested).
+    """
+
+    def __init__(self, columns, correlation=None):
+        self.columns = columns
+        self.correlation = correlation
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def as_dict(self):
+        """
+        Return the description as a dictionary, e.g. for JSON output.
+        """
+        result = {name: summary.as_dict() for name, summary in self.columns.items()}
+        result["correlation"] = self.correlation
+        return result
+
+
+def _median_of_ranks(value_at, start, stop):
+    """
+    Return the median of the values of ranks start to stop - 1, where value_at(rank) returns the value of a
+    rank in sorted order (e.g. the __getitem__ of a sorted list, so no slice is copied).
+    """
+    length = stop - start
+    mid_index = start + length // 2
+    if length % 2:
+        return value_at(mid_index)
+    return (value_at(mid_index - 1) + value_at(mid_index)) / 2
+
+
+def _scan_python(data_list):
+    """
+    Return (total, sum of squared deviations, minimum, maximum, argmin, argmax, mode, sorted values)
+    using one pass over the data and one sort. The total is math.fsum of the values, as merged shard
+    summaries give it.
+    """
+    mean = 0.0
+    sq_deviation = 0.0
+    minimum = maximum = data_list[0]
+    argmin = argmax = 0
+    frequencies = FrequencyTable()
+    counts = frequencies.counts
+    for index, value in enumerate(data_list):
+        delta = value - mean
+        mean += delta / (index + 1)
+        sq_deviation += delta * (value - mean)
+        if value > maximum:
+            maximum, argmax = value, index
+        elif value < minimum:
+            minimum, argmin = value, index
+        counts[value] = counts.get(value, 0) + 1
+    return fsum(data_list), sq_deviation, minimum, maximum, argmin, argmax, frequencies.mode(), sorted(data_list)
+
+
+def _scan_numpy(data_list):
+    """
+    The NumPy backend version of _scan_python(), with vectorized reductions and one numpy.sort.
+    """
+    values = backend.as_array(data_list)
+    argmin = int(values.argmin())
+    argmax = int(values.argmax())
+    sorted_list = numpy_module().sort(values).tolist()
+    return (fsum(sorted_list), backend.sum_sq_deviation(values), data_list[argmin], data_list[argmax],
+            argmin, argmax, backend.mode(data_list), sorted_list)
+
+
+def summarise_column(data_list, titles=None):
+    """
+    This function computes the statistics of one numerical column using one sort and one pass over the data.
+
+    Parameters
+    ----------
+    data_list : sequence
+        A non-empty sequence of numeric values.
+    titles : sequence, optional
+        Movie titles aligned with 'data_list', used to name the minimum and maximum.
+
+    Returns
+    -------
+    ColumnSummary
+        The statistics of the column.
+
+    """
+    scan = _scan_numpy if numpy_module() is not None else _scan_python
+    total, sq_deviation, minimum, maximum, argmin, argmax, mode, sorted_list = scan(data_list)
+    return summary_from_parts(len(data_list), total, sq_deviation, mode, sorted_list.__getitem__,
+                              (minimum, argmin, titles[argmin] if titles is not None else None),
+                              (maximum, argmax, titles[argmax] if titles is not None else None))
+
+
+def summary_from_parts(count, total, sq_deviation, mode, value_at, smallest, largest):
+    """
+    This function derives the statistics of a column from its sufficient statistics, so that they can come
+    from one scan of the values (summarise_column) or from partial results merged across files (shards.py).
+
+    Parameters
+    ----------
+    count : int
+        The number of values.
+    total : float
+        Their sum.
+    sq_deviation : float
+        The sum of their squared deviations from the mean.
+    mode : float
+        The most frequent value.
+    value_at : function
+        value_at(rank) returns the value of rank 'rank' (from 0) in sorted order.
+    smallest, largest : tuple
+        The minimum and the maximum as (value, row, title), with the first row holding them.
+
+    Returns
+    -------
+    ColumnSummary
+        The statistics of the column.
+
+    """
+    mid_index = count // 2
+    upper_start = mid_index + 1 if count % 2 else mid_index
+
+    summary = ColumnSummary()
+    summary.count = count
+    summary.total = total
+    summary.mean = total / count
+    summary.median = _median_of_ranks(value_at, 0, count)
+    summary.mode = mode
+    summary.minimum, summary.argmin, summary.min_title = smallest
+    summary.maximum, summary.argmax, summary.max_title = largest
+    summary.range = round(summary.maximum - summary.minimum, 2)
+    if count > 1:
+        summary.lower_quartile = _median_of_ranks(value_at, 0, mid_index)
+        summary.upper_quartile = _median_of_ranks(value_at, upper_start, count)
+        summary.interquartile = summary.upper_quartile - summary.lower_quartile
+        summary.std_deviation = round(sqrt(sq_deviation / (count - 1)), 2)
+    else:
+        summary.lower_quartile = summary.upper_quartile = summary.interquartile = summary.std_deviation = None
+    if summary.std_deviation:
+        summary.mode_skewness = round((summary.mean - mode) / summary.std_deviation, 2)
+        summary.median_skewness = round(3 * (summary.mean - summary.median) / summary.std_deviation, 2)
+    else:
+        summary.mode_skewness = summary.median_skewness = None
+    return summary
+
+
+def pair_correlation(x_list, y_list, x_mean, y_mean):
+    """
+    This function computes the Pearson correlation of two columns in one pass given their means,
+    without building any intermediate lists.
+
+    Returns
+    -------
+    float
+        The correlation rounded to two decimal places, or None if either column is constant.
+
+    """
+    if numpy_module() is not None:
+        try:
+            return round(backend.correlation(x_list, y_list), 2)
+        except ZeroDivisionError:
+            return None
+    co_deviation = x_sq_deviation = y_sq_deviation = 0.0
+    for x, y in zip(x_list, y_list):
+        dx = x - x_mean
+        dy = y - y_mean
+        co_deviation += dx * dy
+        x_sq_deviation += dx * dx
+        y_sq_deviation += dy * dy
+    if not x_sq_deviation or not y_sq_deviation:
+        return None
+    return round(co_deviation / (sqrt(x_sq_deviation) * sqrt(y_sq_deviation)), 2)
+
+
+@profiled()
+def describe(columns, titles=None, correlate=None):
+    """
+    This function computes count, mean, median, mode, minimum/maximum with their titles, range, quartiles,
+    inter-quartile range, standard deviation and both Pearson skewness measures for every column,
+    plus the correlation of one pair of columns.
+
+    Parameters
+    ----------
+    columns : dict
+        A dictionary with column names as keys and sequences of numeric values as values.
+    titles : sequence, optional
+        Movie titles aligned with the columns.
+    correlate : tuple, optional
+        A pair of column names whose correlation should be computed.
+
+    Returns
+    -------
+    Description
+        The statistics of every column and the requested correlation.
+
+    """
+    summaries = {name: summarise_column(data_list, titles) for name, data_list in columns.items()}
+    correlation = None
+    if correlate is not None:
+        x_name, y_name = correlate
+        correlation = pair_correlation(columns[x_name], columns[y_name],
+                                       summaries[x_name].mean, summaries[y_name].mean)
+    return Description(summaries, correlation)
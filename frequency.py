@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:20:05 2026
+
+@author: A00315995
+
+# Program Name: frequency.py
+# purpose: This program provides a hash-based frequency table that finds the mode of a column in linear time,
+# reports every tied mode with its count and can group continuous money values into bins of a given width.
+"""
+from array import array
+from math import floor
+
+import backend
+from backend import numpy_module
+
+
+class FrequencyTable:
+    """
+    Counts how often each value (or bin of values) occurs. Values are counted in the order they first
+    appear, so ties between modes are broken by first occurrence, exactly like the original
+    list.count() based calculate_mode.
+
+    With 'bin_width' set, every value is counted under the lower edge of its bin,
+    floor(value / bin_width) * bin_width, so 101.2 and 104.9 fall together with a bin width of 5.
+    """
+
+    def __init__(self, data_list=(), bin_width=None):
+        if bin_width is not None and bin_width <= 0:
+            raise ValueError("bin_width must be a positive number")
+        self.bin_width = bin_width
+        self.counts = dict()
+        self.update(data_list)
+
+    def update(self, data_list):
+        """
+        Count every value of 'data_list' in one pass.
+
+        Parameters
+        ----------
+        data_list : iterable
+            Numeric or categorical values.
+
+        Returns
+        -------
+        None.
+
+        """
+        counts = self.counts
+        bin_width = self.bin_width
+        np = numpy_module()
+        if bin_width is None and np is not None and isinstance(data_list, array) and len(data_list):
+            # count with numpy.unique, then add the values in order of first occurrence
+            values, first_index, value_counts = np.unique(backend.as_array(data_list), return_index=True,
+                                                          return_counts=True)
+            order = np.argsort(first_index, kind="stable")
+            cast = int if data_list.typecode in "bBhHiIlLqQ" else float
+            for value, count in zip(values[order].tolist(), value_counts[order].tolist()):
+                value = cast(value)
+                counts[value] = counts.get(value, 0) + count
+        elif bin_width is None:
+            for value in data_list:
+                counts[value] = counts.get(value, 0) + 1
+        else:
+            for value in data_list:
+                key = floor(value / bin_width) * bin_width
+                counts[key] = counts.get(key, 0) + 1
+
+    def merge(self, other):
+        """
+        Add the counts of another FrequencyTable with the same bin width into this one. Values first seen in
+        'other' are ordered after the values of this table, as if its data had been appended.
+
+        Returns
+        -------
+        FrequencyTable
+            This table, to allow chaining.
+
+        """
+        if other.bin_width != self.bin_width:
+            raise ValueError("Cannot merge frequency tables with different bin widths")
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        return self
+
+    def mode(self):
+        """
+        Return the most frequent value, breaking ties by first occurrence.
+        """
+        if not self.counts:
+            raise ValueError("mode of an empty frequency table")
+        return max(self.counts, key=self.counts.get)
+
+    def modes(self):
+        """
+        Return every value sharing the highest count.
+
+        Returns
+        -------
+        list
+            (value, count) tuples in order of first occurrence.
+
+        """
+        if not self.counts:
+            return []
+        highest = max(self.counts.values())
+        return [(value, count) for value, count in self.counts.items() if count == highest]
+
+    def most_common(self, n=None):
+        """
+        Return the 'n' most frequent values (all values if 'n' is None) as (value, count) tuples,
+        ordered by count and then by first occurrence.
+        """
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])
+        return ranked if n is None else ranked[:n]
+
+    def total(self):
+        """
+        Return the number of values counted.
+        """
+        return sum(self.counts.values())
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, value):
+        return self.counts.get(value, 0)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:31:44 2026
+
+@author: A00315995
+
+# Program Name: groupby.py
+# purpose: This program provides a hash-aggregation engine over the dataset columns, e.g.
+#   group_by(table, key="decade", measures={"budget": ["sum", "mean", "min", "max", "count"]})
+# Aggregates are computed in one streaming pass without keeping the values of each group, unless a
+# measure that needs them (median, quartiles, values for a box plot) is requested.
+"""
+from array import array
+from math import fsum, sqrt
+
+import backend
+from backend import numpy_module
+from online import Moments
+from profiling import profiled
+from quantiles import quantiles
+from table import CategoryColumn
+from views import CategoryView
+
+STREAMING_MEASURES = ("count", "sum", "mean", "min", "max", "std")
+# Measures that need every value of the group to be kept
+VALUE_MEASURES = ("median", "q1", "q3", "values")
+MEASURES = STREAMING_MEASURES + VALUE_MEASURES
+
+
+class GroupResult:
+    """
+    The result of group_by(). Groups are ordered by first occurrence in the data.
+
+    'counts' maps each group to its number of rows and measure(column, name) maps each group to one
+    aggregate, e.g. result.measure("worldwide_gross", "sum") gives the total gross per group.
+    """
+
+    def __init__(self, key, counts, aggregates):
+        self.key = key
+        self.counts = counts
+        self.aggregates = aggregates
+
+    def measure(self, column, name):
+        """
+        Return a dictionary with the groups as keys and the aggregate 'name' of 'column' as values.
+        """
+        try:
+            return self.aggregates[column][name]
+        except KeyError:
+            raise KeyError(f"'{name}' of '{column}' was not requested from group_by()") from None
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __iter__(self):
+        return iter(self.counts)
+
+
+def _check_measures(measures):
+    for column, names in measures.items():
+        unknown = [name for name in names if name not in MEASURES]
+        if unknown:
+            raise ValueError(f"Unknown measure(s) {', '.join(unknown)} for '{column}', "
+                             f"expected: {', '.join(MEASURES)}")
+
+
+def _key_column(table, key):
+    """
+    Return (row keys, decode) for the grouping key. Category columns are grouped by their integer codes and
+    decoded once at the end; a (column, function) pair groups by function(value), e.g. budget buckets.
+    """
+    if isinstance(key, tuple):
+        column, function = key
+        return [function(value) for value in table[column]], None
+    column = table[key]
+    if isinstance(column, (CategoryColumn, CategoryView)):
+        return column.codes, column.categories
+    return column, None
+
+
+def _finish(moments, values, names):
+    """
+    Return the requested aggregates of one group from its running moments and (optionally) kept values.
+    """
+    results = dict()
+    for name in names:
+        if name == "count":
+            results[name] = moments.count
+        elif name == "sum":
+            results[name] = moments.total
+        elif name == "mean":
+            results[name] = moments.total / moments.count
+        elif name == "min":
+            results[name] = moments.minimum
+        elif name == "max":
+            results[name] = moments.maximum
+        elif name == "std":
+            results[name] = round(sqrt(moments.m2 / (moments.count - 1)), 2) if moments.count > 1 else None
+        elif name == "values":
+            results[name] = values
+    quartile_names = [name for name in ("q1", "median", "q3") if name in names]
+    if quartile_names:
+        probabilities = {"q1": 0.25, "median": 0.5, "q3": 0.75}
+        method = "halves" if len(values) > 1 else "linear"
+        for name, value in zip(quartile_names,
+                               quantiles(values, [probabilities[name] for name in quartile_names], method)):
+            results[name] = value
+    return results
+
+
+def _group_by_python(keys, columns, keep_values):
+    """
+    One streaming pass: a Moments object per group and column, plus a value array where needed.
+    """
+    counts = dict()
+    states = dict()
+    for row, group in enumerate(keys):
+        state = states.get(group)
+        if state is None:
+            counts[group] = 0
+            state = states[group] = [(Moments(), array("d") if keep else None) for keep in keep_values]
+        counts[group] += 1
+        for (moments, values), column in zip(state, columns):
+            value = column[row]
+            moments.update(value)
+            if values is not None:
+                values.append(value)
+    return counts, states
+
+
+def _group_by_numpy(keys, columns, keep_values):
+    """
+    The NumPy backend version of _group_by_python(): groups are numbered with numpy.unique and every
+    streaming aggregate is a bincount or ufunc.at reduction. The values are gathered by group once per column,
+    for the math.fsum sums of the groups and the value measures.
+    """
+    np = numpy_module()
+    key_array = np.asarray(keys)
+    uniques, first_index, inverse = np.unique(key_array, return_index=True, return_inverse=True)
+    order = np.argsort(first_index, kind="stable")
+    group_count = len(uniques)
+    row_counts = np.bincount(inverse, minlength=group_count)
+    counts = {uniques[position].item(): int(row_counts[position]) for position in order}
+    states = {group: [] for group in counts}
+    sorted_rows = np.argsort(inverse, kind="stable")
+    boundaries = np.cumsum(row_counts)[:-1]
+    for column, keep in zip(columns, keep_values):
+        values = backend.as_array(column)
+        totals = np.bincount(inverse, weights=values, minlength=group_count)
+        means = totals / row_counts
+        deviation = values - means[inverse]
+        m2 = np.bincount(inverse, weights=deviation * deviation, minlength=group_count)
+        minimums = np.full(group_count, np.inf)
+        maximums = np.full(group_count, -np.inf)
+        np.minimum.at(minimums, inverse, values)
+        np.maximum.at(maximums, inverse, values)
+        grouped = np.split(values[sorted_rows], boundaries)
+        for position in order:
+            moments = Moments()
+            moments.count = int(row_counts[position])
+            # the correctly rounded sum of the group, the same as math.fsum of its values on the Python path
+            moments.partials = [fsum(grouped[position].tolist())]
+            moments.mean = float(means[position])
+            moments.m2 = float(m2[position])
+            moments.minimum = float(minimums[position])
+            moments.maximum = float(maximums[position])
+            group_values = array("d", grouped[position].tobytes()) if keep else None
+            states[uniques[position].item()].append((moments, group_values))
+    return counts, states
+
+
+@profiled()
+def group_by(table, key="decade", measures=None):
+    """
+    This function groups the rows of the table by 'key' and computes the requested measures of each group.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The dataset, or any mapping of column names to aligned sequences.
+    key : str or tuple
+        The column to group by (e.g. 'decade' or 'year'), or a (column, function) pair for custom buckets,
+        e.g. ("budget", lambda budget: int(budget // 50) * 50).
+    measures : dict, optional
+        Column names as keys and lists of measures from MEASURES as values. Without measures only the
+        number of rows per group is computed.
+
+    Returns
+    -------
+    GroupResult
+        The number of rows and the requested aggregates of every group.
+
+    """
+    measures = measures or dict()
+    _check_measures(measures)
+    keys, categories = _key_column(table, key)
+    columns = [table[column] for column in measures]
+    keep_values = [any(name in VALUE_MEASURES for name in names) for names in measures.values()]
+    if numpy_module() is not None and len(keys):
+        counts, states = _group_by_numpy(keys, columns, keep_values)
+    else:
+        counts, states = _group_by_python(keys, columns, keep_values)
+    aggregates = {column: dict() for column in measures}
+    for group, state in states.items():
+        for (column, names), (moments, values) in zip(measures.items(), state):
+            for name, value in _finish(moments, values, names).items():
+                aggregates[column].setdefault(name, dict())[group] = value
+    if categories is not None:
+        counts = {categories[code]: count for code, count in counts.items()}
+        aggregates = {column: {name: {categories[code]: value for code, value in by_group.items()}
+                               for name, by_group in by_name.items()}
+                      for column, by_name in aggregates.items()}
+    for column, names in measures.items():
+        for name in names:
+            aggregates[column].setdefault(name, dict())
+    return GroupResult(key if isinstance(key, str) else key[0], counts, aggregates)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 15:26:13 2026
+
+@author: A00315995
+
+# Program Name: histogram.py
+# purpose: This program counts values into histogram bins without handing the raw values to matplotlib,
+# so that charts are drawn from a few hundred counts whatever the number of movies. Bin widths are chosen
+# from the data (Freedman-Diaconis, Sturges, or log-scale bins for heavy-tailed money columns) and a
+# Histogram can be built chunk by chunk and merged with histograms of other chunks.
+"""
+from bisect import bisect_right
+from math import ceil, floor, log2, log10
+
+import backend
+from backend import numpy_module
+from quantiles import quantiles
+
+# fd : Freedman-Diaconis, bin width 2 * IQR / n^(1/3)
+# sturges : log2(n) + 1 bins over the range of the data
+# log : Freedman-Diaconis on log10 of the (positive) values, so each bin covers the same ratio of values
+RULES = ("fd", "sturges", "log")
+# Upper bound of the number of bins chosen by a rule, so that a few extreme values cannot produce
+# thousands of empty bins
+MAX_BINS = 200
+NICE_STEPS = (1, 2, 2.5, 5, 10)
+
+
+def count_bins(data_list, edges):
+    """
+    This function counts how many values fall into each bin. Bins are half-open, [edge, next edge), except the
+    last which also includes its right edge, the same as numpy.histogram and matplotlib's hist.
+    Values outside the edges are not counted.
+
+    Parameters
+    ----------
+    data_list : sequence
+        Numeric values.
+    edges : sequence
+        Increasing bin edges; there is one bin fewer than edges.
+
+    Returns
+    -------
+    list
+        The number of values in each bin.
+
+    """
+    edges = list(edges)
+    np = numpy_module()
+    if np is not None:
+        return np.histogram(backend.as_array(data_list), bins=np.asarray(edges, dtype=float))[0].tolist()
+    counts = [0] * (len(edges) - 1)
+    last_bin = len(counts) - 1
+    low, high = edges[0], edges[-1]
+    for value in data_list:
+        if low <= value < high:
+            counts[bisect_right(edges, value) - 1] += 1
+        elif value == high:
+            counts[last_bin] += 1
+    return counts
+
+
+def uniform_edges(low, high, bins):
+    """
+    Return bins + 1 evenly spaced edges from 'low' to 'high'.
+    """
+    if high <= low:
+        high = low + 1
+    width = (high - low) / bins
+    return [low + width * index for index in range(bins)] + [high]
+
+
+def count_bins_2d(x_list, y_list, bins):
+    """
+    This function counts (x, y) points into a grid of bins x bins evenly spaced cells spanning the data.
+
+    Parameters
+    ----------
+    x_list, y_list : sequence
+        Aligned numeric values.
+    bins : int
+        The number of cells along each axis.
+
+    Returns
+    -------
+    tuple
+        The x edges, the y edges and the counts as a list of rows, counts[y_cell][x_cell].
+
+    """
+    x_edges = uniform_edges(min(x_list), max(x_list), bins)
+    y_edges = uniform_edges(min(y_list), max(y_list), bins)
+    np = numpy_module()
+    if np is not None:
+        counts = np.histogram2d(backend.as_array(x_list), backend.as_array(y_list), bins=[x_edges, y_edges])[0]
+        return x_edges, y_edges, counts.T.tolist()
+    counts = [[0] * bins for _ in range(bins)]
+    x_low, x_width = x_edges[0], (x_edges[-1] - x_edges[0]) / bins
+    y_low, y_width = y_edges[0], (y_edges[-1] - y_edges[0]) / bins
+    last_cell = bins - 1
+    for x, y in zip(x_list, y_list):
+        counts[min(int((y - y_low) / y_width), last_cell)][min(int((x - x_low) / x_width), last_cell)] += 1
+    return x_edges, y_edges, counts
+
+
+def nice_width(width):
+    """
+    Round a positive bin width up to 1, 2, 2.5 or 5 times a power of ten, so that bin edges are round numbers.
+    """
+    exponent = floor(log10(width))
+    fraction = width / 10 ** exponent
+    step = next(step for step in NICE_STEPS if step >= fraction * (1 - 1e-9))
+    return round(step * 10.0 ** exponent, max(0, 1 - exponent))
+
+
+def choose_width(data_list, rule="fd"):
+    """
+    This function chooses the bin width of a histogram of 'data_list' with one of the RULES.
+
+    Parameters
+    ----------
+    data_list : sequence
+        Numeric values; NaN values are left out.
+    rule : str
+        One of RULES.
+
+    Returns
+    -------
+    float
+        A round bin width, in log10 units for the 'log' rule (e.g. 0.1 gives ten bins per power of ten).
+
+    """
+    if rule not in RULES:
+        raise ValueError(f"Unknown binning rule '{rule}', expected one of: {', '.join(RULES)}")
+    np = numpy_module()
+    if np is not None:
+        values = backend.as_array(data_list)
+        data_list = values[~np.isnan(values)]
+        if rule == "log":
+            data_list = np.log10(data_list[data_list > 0])
+    elif rule == "log":
+        data_list = [log10(value) for value in data_list if value > 0]
+    else:
+        data_list = [value for value in data_list if value == value]
+    count = len(data_list)
+    if count == 0:
+        return 1.0
+    if np is not None:
+        low, high = float(data_list.min()), float(data_list.max())
+    else:
+        low, high = float(min(data_list)), float(max(data_list))
+    span = high - low
+    if span == 0:
+        return nice_width(abs(low) or 1.0)
+    width = span / (ceil(log2(count)) + 1)
+    if rule != "sturges":
+        lower_quartile, upper_quartile = quantiles(data_list, [0.25, 0.75])
+        if upper_quartile > lower_quartile:
+            width = 2 * (upper_quartile - lower_quartile) / count ** (1 / 3)
+    return nice_width(max(width, span / MAX_BINS))
+
+
+class Histogram:
+    """
+    A streaming histogram with fixed-width bins anchored at zero: a value falls into bin floor(value / width),
+    which covers [bin * width, (bin + 1) * width). With 'log' set the bins are 'width' wide in log10(value),
+    and zero or negative values are counted in 'nonpositive' instead. NaN values (derived values that cannot
+    be computed, see derived.py) are counted in 'missing' only.
+
+    Counts are kept per bin number, so the histogram can be updated one chunk of data at a time and
+    histograms with the same width and scale built over different chunks can be merged.
+    """
+
+    __slots__ = ("width", "log", "counts", "nonpositive", "missing")
+
+    def __init__(self, width, log=False):
+        if width <= 0:
+            raise ValueError("width must be a positive number")
+        self.width = width
+        self.log = log
+        self.counts = dict()
+        self.nonpositive = 0
+        self.missing = 0
+
+    @classmethod
+    def from_values(cls, data_list, rule="fd"):
+        """
+        Return the histogram of 'data_list' with the bin width chosen by 'rule' (one of RULES).
+        """
+        histogram = cls(choose_width(data_list, rule), log=rule == "log")
+        histogram.update(data_list)
+        return histogram
+
+    def update(self, data_list):
+        """
+        Count every value of 'data_list' in one pass.
+        """
+        np = numpy_module()
+        if np is not None:
+            values = backend.as_array(data_list)
+            defined = ~np.isnan(values)
+            if not defined.all():
+                self.missing += int(len(values) - np.count_nonzero(defined))
+                values = values[defined]
+            if self.log:
+                positive = values > 0
+                self.nonpositive += int(len(values) - np.count_nonzero(positive))
+                values = np.log10(values[positive])
+            bins, bin_counts = np.unique(np.floor(values / self.width).astype(np.int64), return_counts=True)
+            for number, count in zip(bins.tolist(), bin_counts.tolist()):
+                self.counts[number] = self.counts.get(number, 0) + count
+            return
+        counts = self.counts
+        width = self.width
+        for value in data_list:
+            if value != value:
+                self.missing += 1
+                continue
+            if self.log:
+                if value <= 0:
+                    self.nonpositive += 1
+                    continue
+                value = log10(value)
+            number = floor(value / width)
+            counts[number] = counts.get(number, 0) + 1
+
+    def merge(self, other):
+        """
+        Add the counts of another Histogram with the same bins.
+        """
+        if (other.width, other.log) != (self.width, self.log):
+            raise ValueError("Only histograms with the same bin width and scale can be merged")
+        for number, count in other.counts.items():
+            self.counts[number] = self.counts.get(number, 0) + count
+        self.nonpositive += other.nonpositive
+        self.missing += other.missing
+
+    def total(self):
+        """
+        Return the number of values counted in bins.
+        """
+        return sum(self.counts.values())
+
+    def _bin_range(self):
+        return range(min(self.counts), max(self.counts) + 1) if self.counts else range(0)
+
+    def edges(self):
+        """
+        Return the bin edges from the lowest to the highest non-empty bin.
+        """
+        numbers = self._bin_range()
+        if not numbers:
+            return []
+        edges = [round(number * self.width, 12) for number in range(numbers.start, numbers.stop + 1)]
+        if self.log:
+            edges = [10 ** edge for edge in edges]
+        return edges
+
+    def bin_counts(self):
+        """
+        Return the count of every bin between the edges, including empty bins.
+        """
+        return [self.counts.get(number, 0) for number in self._bin_range()]
+
+    def to_dict(self):
+        """
+        Return the histogram as a JSON-serialisable dictionary, with its edges for readers that only
+        want to plot it.
+        """
+        numbers = self._bin_range()
+        return {"width": self.width, "log": self.log, "first_bin": numbers.start if numbers else 0,
+                "edges": self.edges(), "counts": self.bin_counts(), "nonpositive": self.nonpositive,
+                "missing": self.missing}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a Histogram from to_dict() output.
+        """
+        histogram = cls(state["width"], state["log"])
+        histogram.counts = {state["first_bin"] + offset: count
+                            for offset, count in enumerate(state["counts"]) if count}
+        histogram.nonpositive = state["nonpositive"]
+        histogram.missing = state["missing"]
+        return histogram
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:02:45 2026
+
+@author: A00315995
+
+# Program Name: ingest.py
+# purpose: This program loads large dataset files at multi-core speed. The file is split into byte ranges
+# that end on a line boundary, each range is parsed by a worker process with the quote-aware csv module,
+# and the columnar results are appended in file order. Rows that cannot be converted are written with
+# the reason to a quarantine file next to the dataset, and reported as one summary count.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
+from itertools import repeat
+import os
+
+from profiling import phase
+from table import COLUMNS, DATASET, MovieTable, Reject, parse_records
+
+# Files are cut into ranges of about this many bytes; a file smaller than one range is parsed in this process
+CHUNK_SIZE = 16 * 1024 * 1024
+QUARANTINE_SUFFIX = ".rejects.csv"
+# The first row of the quarantine files written by write_rejects()
+QUARANTINE_HEADER = ["line", "reason"] + [name for name, _ in COLUMNS]
+
+# table : the MovieTable
+# rejects : the table.Reject rows, with their line numbers in the file
+# chunks : the number of byte ranges the file was parsed in
+# quarantine : the path the rejects were written to, or None if there were none
+IngestResult = namedtuple("IngestResult", ("table", "rejects", "chunks", "quarantine"))
+
+
+def quarantine_path_for(path):
+    """
+    Return the path of the quarantine file of the dataset at 'path'.
+    """
+    return path + QUARANTINE_SUFFIX
+
+
+def chunk_ranges(path, chunk_size=CHUNK_SIZE):
+    """
+    This function splits the records of a CSV file (everything after the header) into byte ranges of about
+    'chunk_size' bytes, each ending just after a newline so that no line is split between two ranges.
+
+    Quoted fields may hold commas and quotes, but a newline inside a quoted field would be cut at a range
+    boundary; dataset exports never contain one, and a file parsed as a single range handles it.
+
+    Parameters
+    ----------
+    path : str
+        The path of the CSV file.
+    chunk_size : int
+        The approximate size of a range in bytes.
+
+    Returns
+    -------
+    list
+        (start, end) byte offsets, in file order.
+
+    """
+    ranges = []
+    with open(path, "rb") as datafile:
+        size = os.fstat(datafile.fileno()).st_size
+        datafile.readline()
+        start = datafile.tell()
+        while start < size:
+            datafile.seek(min(start + max(chunk_size, 1), size) - 1)
+            datafile.readline()
+            end = datafile.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(path, start, end):
+    """
+    This function parses the records between the byte offsets 'start' and 'end' of a CSV file.
+    It is the job of one worker process.
+
+    Returns
+    -------
+    tuple
+        The MovieTable, the rejected rows (with line numbers counted from 1 at 'start') and the number
+        of lines in the range. A line that is not UTF-8 text is rejected like a row that cannot be converted.
+
+    """
+    with phase("read"):
+        with open(path, "rb") as datafile:
+            datafile.seek(start)
+            data = datafile.read(end - start)
+    undecoded = []
+    with phase("decode"):
+        try:
+            text = io.StringIO(data.decode("utf-8"), newline="")
+        except UnicodeDecodeError:
+            text = list(_decoded_lines(data, undecoded))
+    with phase("parse"):
+        table, rejects = parse_records(text, first_line=1)
+    if undecoded:
+        rejects = sorted(rejects + undecoded)
+    return table, rejects, data.count(b"\n")
+
+
+def _decoded_lines(data, rejects):
+    """
+    Decode the lines of a range one at a time, appending a Reject to 'rejects' for each line that is not
+    UTF-8 text and yielding an empty line in its place, so that the other lines keep their numbers.
+    """
+    for line, raw in enumerate(data.splitlines(keepends=True), 1):
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError as error:
+            fields = next(csv.reader([raw.decode("utf-8", "replace")]), [])
+            rejects.append(Reject(line, f"not UTF-8 text ({error.reason} at byte {error.start})", fields))
+            yield "\n"
+
+
+def write_rejects(rejects, path):
+    """
+    This function writes rejected rows to a CSV file: the line number, the reason and the original fields.
+
+    Returns
+    -------
+    None.
+
+    """
+    with open(path, "w", encoding="utf-8", newline="") as quarantinefile:
+        writer = csv.writer(quarantinefile)
+        writer.writerow(QUARANTINE_HEADER)
+        for reject in rejects:
+            writer.writerow([reject.line, reject.reason] + reject.fields)
+
+
+def ingest(path=DATASET, workers=None, chunk_size=CHUNK_SIZE, quarantine=None):
+    """
+    This function loads a dataset CSV file into a MovieTable, parsing byte ranges of the file in parallel.
+
+    Parameters
+    ----------
+    path : str
+        The path of the dataset CSV file.
+    workers : int, optional
+        The number of worker processes, os.cpu_count() by default. With 1, or when the file fits in one
+        range, every range is parsed in this process.
+    chunk_size : int
+        The approximate size in bytes of the range a worker parses at a time.
+    quarantine : str, optional
+        The file the rejected rows are written to, quarantine_path_for(path) by default. It is only
+        written when some rows are rejected, and skipped if it cannot be written (e.g. a read-only directory);
+        when no row is rejected, the default file left by an earlier load is removed, but never a file given
+        here.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the dataset file does not exist.
+
+    Returns
+    -------
+    IngestResult
+        The table, the rejected rows, the number of ranges and the quarantine file.
+
+    """
+    ranges = chunk_ranges(path, chunk_size)
+    if workers == 1 or len(ranges) <= 1:
+        parts = (parse_range(path, start, end) for start, end in ranges)
+        return _merge(path, parts, len(ranges), quarantine)
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _merge(path, pool.map(parse_range, repeat(path), starts, ends), len(ranges), quarantine)
+
+
+def _remove_quarantine(path):
+    """
+    Remove the quarantine file at 'path' left by an earlier load, only if it starts with the header
+    write_rejects() writes, so that no other file is ever removed.
+    """
+    try:
+        with open(path, encoding="utf-8", newline="") as quarantinefile:
+            header = next(csv.reader(quarantinefile), None)
+        if header == QUARANTINE_HEADER:
+            os.remove(path)
+    except (OSError, UnicodeDecodeError, csv.Error):
+        pass
+
+
+def _merge(path, parts, chunks, quarantine):
+    """
+    Append the parsed ranges in file order, renumbering their rejected rows from the start of the file, and
+    write the rejected rows to the quarantine file, or remove the default quarantine file of an earlier load.
+    """
+    table = MovieTable()
+    rejects = []
+    line = 2
+    for part, part_rejects, lines in parts:
+        with phase("append"):
+            table.extend(part)
+        rejects.extend(reject._replace(line=reject.line + line - 1) for reject in part_rejects)
+        line += lines
+    table.compact()
+    if not rejects:
+        if quarantine is None:
+            _remove_quarantine(quarantine_path_for(path))
+        return IngestResult(table, rejects, chunks, None)
+    quarantine = quarantine or quarantine_path_for(path)
+    try:
+        write_rejects(rejects, quarantine)
+    except OSError:
+        quarantine = None
+    return IngestResult(table, rejects, chunks, quarantine)
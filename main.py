@@ -8,18 +8,51 @@ Created on Tue Dec 10 14:55:52 2023
 # Program Name: main.py
 # purpose: This program reads a dataset containing 500 of the most profitable hollywood movies from 1970's till the 2020's and performs statistical and visual analysis on it.
 """
+from io import BytesIO
 from math import sqrt
-import matplotlib.pyplot as plt
 import sys
 
+import backend
+from backend import numpy_module
+from cache import load_cached
+from charts import CHARTS
+from derived import DERIVED_COLUMNS
+from describe import describe
+from frequency import FrequencyTable
+from groupby import group_by
+from memo import Memo, memo_path_for
+from profiling import phase, profiled
+from quantiles import quantiles
+from rank_index import rank_index, row_of_title
+from title_index import search
+from views import defined
+
+# matplotlib is imported inside show_chart() and show_image() (and render.render_bytes() for the menu charts),
+# so runs that only compute statistics never pay for it.
+
 DATASET = "dataset.csv"
+NUMERICAL_CHOICES = {str(choice) for choice in range(2, 12)}
+DECADE_CHOICES = {str(choice) for choice in range(12, 17)}
+# The per-decade aggregates of the decade choices
+DECADE_MEASURES = {"worldwide_gross": ["sum"]}
+# Columns of the ranking choices (17-21) with the name used in the output
+RANKED_COLUMNS = (("budget", "budget"), ("worldwide_gross", "worldwide gross"))
+RANKING_SIZE = 10
+RANGE_DISPLAY_LIMIT = 20
+# Choices of the visualisation menu, in the order of charts.CHARTS
+CHART_CHOICES = {str(choice): name for choice, name in enumerate(CHARTS, 1)}
+SEARCH_LIMIT = 10
 
 
-def display_menu():
+def display_menu(table=None):
     """
-    The function loads data including budget, worldwide gross, title, decade frequency
-    dictionary, and decade numerical dictionary. It presents a menu to perform various
-    analyses and visualizations based on user selections.
+    The function loads the dataset into a columnar table. It presents a menu to perform various
+    analyses and visualizations, or to look movies up by title, based on user selections.
+
+    Parameters
+    ----------
+    table : MovieTable, optional
+        The dataset to analyse, e.g. loaded from another file by cli.py; 'dataset.csv' by default.
 
     Returns
     -------
@@ -30,23 +63,33 @@ def display_menu():
     print(
         "\nThis program reads a dataset containing 500 of the most profitable hollywood movies from 1970's till the 2020's. \nIt further provides statistical and visual analysis on the dataset.\n")
     print("#" * 114)
-    budget, worldwide_gross, title, decade_freq_dict, decade_numerical_dict = load_dataset()
+    if table is None:
+        table = load_dataset()
+        memo = Memo(path=memo_path_for(DATASET))
+    else:
+        memo = Memo()
     while True:
         print("\n----------/// MENU ///----------\n")
         main_menu_choice1 = input(
-            "1. Display statistical analysis\n2. Display visualisations\n3. Exit program\n\nPlease select your choice: ")
+            "1. Display statistical analysis\n2. Display visualisations\n3. Search movies by title\n4. Exit program\n\n"
+            "Please select your choice: ")
         if main_menu_choice1 == '1':
-            statistical(budget, worldwide_gross, title, decade_freq_dict, decade_numerical_dict)
+            statistical(table, memo)
         elif main_menu_choice1 == '2':
-            visualisation(budget, worldwide_gross, decade_freq_dict, decade_numerical_dict)
+            visualisation(table, memo)
         elif main_menu_choice1 == '3':
+            search_titles(table)
+        elif main_menu_choice1 == '4':
+            memo.save()
+            if memo.hits or memo.misses:
+                print(f"Results cache: {memo.hits} hits, {memo.misses} misses", file=sys.stderr)
             print("\nProgram is exiting... Good Bye!")
             sys.exit()
         else:
             print("\nInvalid Choice, Please try again...\n\n")
 
 
-def statistical(budget, worldwide_gross, title, decade_freq_dict, decade_numerical_dict):
+def statistical(table, memo=None):
     """
     This function provides statistical analysis based on numerical columns (Budgets, Worldwide Gross)
     and categorical data (Decade). It prompts the user to select various analysis options and displays
@@ -54,22 +97,23 @@ def statistical(budget, worldwide_gross, title, decade_freq_dict, decade_numeric
 
     Parameters
     ----------
-    budget : list
-        A list of movie budgets.
-    worldwide_gross : list
-        A list of worldwide gross earnings for movies.
-    title : list
-        A list of movie titles.
-    decade_freq_dict : dict
-        A dictionary with decades as keys and frequency of movies per decade.
-    decade_numerical_dict : dict
-        A dictionary with decades as keys and associated worldwide gross data.
+    table : MovieTable
+        The loaded dataset.
+    memo : Memo, optional
+        The store of computed results (see memo.py), a new one by default.
+
+    The numerical statistics (choices 2-11) are computed together by describe() the first time one
+    of them is selected, and the decade statistics (choices 12-16) by one group_by() pass; both are
+    kept in 'memo' and reused for every later choice, also after going back to the main menu. The rankings
+    (choices 17-21) use the sorted indexes of rank_index.py, which are built on first use and kept with the table.
 
     Returns
     -------
     None.
 
     """
+    budget, worldwide_gross, title = table["budget"], table["worldwide_gross"], table["title"]
+    memo = memo if memo is not None else Memo()
     while True:
         choice = input("\nAnalysis based on numerical columns (Budgets, Worldwide Gross)\n"
                        "--------------------------------------------------------------\n"
@@ -91,58 +135,77 @@ def statistical(budget, worldwide_gross, title, decade_freq_dict, decade_numeric
                        "14. Decade with the lowest number of profitable movies\n"
                        "15. Decade with the highest total gross\n"
                        "16. Decade with the lowest total gross\n"
-                       "\nPlease select your choice (1-16), Press Q or q to go back to main menu: \n\n")
+                       "\nRankings (Budgets, Worldwide Gross)\n"
+                       "-----------------------------------\n"
+                       "17. Top 10 movies by budget and by worldwide gross\n"
+                       "18. Bottom 10 movies by budget and by worldwide gross\n"
+                       "19. Rank of a movie by budget and by worldwide gross\n"
+                       "20. Movies with a budget in a range\n"
+                       "21. Movies with a worldwide gross in a range\n"
+                       "\nDerived columns (ROI, profit, domestic and international share)\n"
+                       "----------------------------------------------------------------\n"
+                       "22. Statistics of a derived column\n"
+                       "23. Top 10 and bottom 10 movies by a derived column\n"
+                       "\nPlease select your choice (1-23), Press Q or q to go back to main menu: \n\n")
         print("\n\n")
+        if choice in NUMERICAL_CHOICES:
+            summary = memo.get(table, ("budget", "worldwide_gross"), "describe",
+                               lambda: describe({"budget": budget, "worldwide_gross": worldwide_gross}, title,
+                                                correlate=("budget", "worldwide_gross")))
+        if choice in DECADE_CHOICES:
+            decades = memo.get(table, "decade", "group_by", lambda: group_by(table, "decade", DECADE_MEASURES),
+                               ("worldwide_gross", "sum"))
+            decade_freq_dict = decades.counts
         if choice == '1':
             print(f"Number of values in budget: {len(budget)}")
             print(f"Number of values in Worldwide Gross: {len(worldwide_gross)}")
         elif choice == '2':
-            print(f"Mean of the budgets of the most profitable movies: {calculate_mean(budget):.2f} million USD")
+            print(f"Mean of the budgets of the most profitable movies: {summary['budget'].mean:.2f} million USD")
             print(
-                f"Mean of the worldwide grosses of the most profitable movies: {calculate_mean(worldwide_gross):.2f} million USD")
+                f"Mean of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].mean:.2f} million USD")
         elif choice == '3':
-            print(f"Median of the budgets of the most profitable movies: {calculate_median(budget):.2f} million USD")
+            print(f"Median of the budgets of the most profitable movies: {summary['budget'].median:.2f} million USD")
             print(
-                f"Median of the worldwide grosses of the most profitable movies: {calculate_median(worldwide_gross):.2f} million USD")
+                f"Median of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].median:.2f} million USD")
         elif choice == '4':
-            print(f"Mode of the budgets of the most profitable movies: {calculate_mode(budget):.2f} million USD")
+            print(f"Mode of the budgets of the most profitable movies: {summary['budget'].mode:.2f} million USD")
             print(
-                f"Mode of the worldwide grosses of the most profitable movies: {calculate_mode(worldwide_gross):.2f} million USD")
+                f"Mode of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].mode:.2f} million USD")
         elif choice == '5':
             print(
-                f"Maximum budget of the most profitable movie: {max(budget):.2f} million USD ({title[budget.index(max(budget))]})")
+                f"Maximum budget of the most profitable movie: {summary['budget'].maximum:.2f} million USD ({summary['budget'].max_title})")
             print(
-                f"Maximum worldwide gross of the most profitable movie: {max(worldwide_gross):.2f} million USD ({title[worldwide_gross.index(max(worldwide_gross))]})")
+                f"Maximum worldwide gross of the most profitable movie: {summary['worldwide_gross'].maximum:.2f} million USD ({summary['worldwide_gross'].max_title})")
         elif choice == '6':
             print(
-                f"Minimum budget of the most profitable movie: {min(budget):.2f} million USD ({title[budget.index(min(budget))]})")
+                f"Minimum budget of the most profitable movie: {summary['budget'].minimum:.2f} million USD ({summary['budget'].min_title})")
             print(
-                f"Minimum worldwide gross of the most profitable movie: {min(worldwide_gross):.2f} million USD ({title[worldwide_gross.index(min(worldwide_gross))]})")
+                f"Minimum worldwide gross of the most profitable movie: {summary['worldwide_gross'].minimum:.2f} million USD ({summary['worldwide_gross'].min_title})")
         elif choice == '7':
-            print(f"Range of the budgets of the most profitable movies: {calculate_range(budget)} million USD")
+            print(f"Range of the budgets of the most profitable movies: {summary['budget'].range} million USD")
             print(
-                f"Range of the worldwide grosses of the most profitable movies: {calculate_range(worldwide_gross)} million USD")
+                f"Range of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].range} million USD")
         elif choice == '8':
             print(
-                f"Inter-quartile range of budgets of the most profitable movies: {calculate_interquartile(budget):.2f} million USD")
+                f"Inter-quartile range of budgets of the most profitable movies: {summary['budget'].interquartile:.2f} million USD")
             print(
-                f"Inter-quartile range of worldwide grosses of the most profitable movies: {calculate_interquartile(worldwide_gross)} million USD")
+                f"Inter-quartile range of worldwide grosses of the most profitable movies: {summary['worldwide_gross'].interquartile} million USD")
         elif choice == '9':
             print(
-                f"Standard Deviation of the budgets of the most profitable movies: {calculate_std_deviation(budget)} million USD")
+                f"Standard Deviation of the budgets of the most profitable movies: {summary['budget'].std_deviation} million USD")
             print(
-                f"Standard Deviation of the worldwide grosses of the most profitable movies: {calculate_std_deviation(worldwide_gross)} million USD")
+                f"Standard Deviation of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].std_deviation} million USD")
         elif choice == '10':
             print(
-                f"Pearson Mode Skewness of the budgets of the most profitable movies: {calculate_skewness(budget, True)}")
+                f"Pearson Mode Skewness of the budgets of the most profitable movies: {summary['budget'].mode_skewness}")
             print(
-                f"Alternative Pearson Mode Skewness of the budgets of the most profitable movies: {calculate_skewness(budget, False)}")
+                f"Alternative Pearson Mode Skewness of the budgets of the most profitable movies: {summary['budget'].median_skewness}")
             print(
-                f"Pearson Mode Skewness of the worldwide grosses of the most profitable movies: {calculate_skewness(worldwide_gross, True)}")
+                f"Pearson Mode Skewness of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].mode_skewness}")
             print(
-                f"Alternative Pearson Mode Skewness of the worldwide grosses of the most profitable movies: {calculate_skewness(worldwide_gross, False)}")
+                f"Alternative Pearson Mode Skewness of the worldwide grosses of the most profitable movies: {summary['worldwide_gross'].median_skewness}")
         elif choice == '11':
-            print(f"Correlation value of budget with worldwide gross: {calculate_correlation(budget, worldwide_gross)}")
+            print(f"Correlation value of budget with worldwide gross: {summary.correlation}")
         elif choice == '12':
             print(
                 f"Number of distinct sub-categories: {len(decade_freq_dict)} ({', '.join(str(key) for key in decade_freq_dict.keys())})")
@@ -153,9 +216,30 @@ def statistical(budget, worldwide_gross, title, decade_freq_dict, decade_numeric
             print(
                 f"The decade with the lowest number of profitable movies is the {min(decade_freq_dict, key=decade_freq_dict.get)} with {min(decade_freq_dict.values())} movies")
         elif choice == '15':
-            category_highest_gross(decade_numerical_dict)
+            category_highest_gross(decades.measure("worldwide_gross", "sum"))
         elif choice == '16':
-            category_lowest_gross(decade_numerical_dict)
+            category_lowest_gross(decades.measure("worldwide_gross", "sum"))
+        elif choice in ('17', '18'):
+            show_rankings(table, top=choice == '17')
+        elif choice == '19':
+            show_rank_of_title(table, input("Enter the title of the movie: "))
+        elif choice in ('20', '21'):
+            column, label = RANKED_COLUMNS[int(choice) - 20]
+            try:
+                low = float(input(f"Enter the lowest {label} (in million USD): "))
+                high = float(input(f"Enter the highest {label} (in million USD): "))
+            except ValueError:
+                print("\nInvalid value!")
+            else:
+                show_range(table, column, label, low, high)
+        elif choice in ('22', '23'):
+            column = input(f"Enter the derived column ({', '.join(DERIVED_COLUMNS)}): ").strip().lower()
+            if column not in DERIVED_COLUMNS:
+                print("\nInvalid column!")
+            elif choice == '22':
+                show_derived_statistics(table, column, memo)
+            else:
+                show_derived_rankings(table, column)
         elif choice.lower() == 'q':
             break
         else:
@@ -163,27 +247,124 @@ def statistical(budget, worldwide_gross, title, decade_freq_dict, decade_numeric
         input("\nPress any key to display sub-menu again...\n\n")
 
 
-def visualisation(budget, worldwide_gross, decade_freq_dict, decade_numerical_dict):
+def show_derived_statistics(table, column, memo):
+    """
+    This function prints the statistics of a derived column (see derived.py), which is computed the first
+    time it is used and kept with the table; the statistics are kept in 'memo'.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    column : str
+        A name of derived.DERIVED_COLUMNS.
+    memo : Memo
+        The store of computed results.
+
+    Returns
+    -------
+    None.
+
+    """
+    derived = DERIVED_COLUMNS[column]
+    # the movies whose value cannot be computed (a budget of 0) are left out
+    movies = defined(table, [column])
+    summary = memo.get(table, column, "describe",
+                       lambda: describe({column: movies[column]}, movies["title"]))[column]
+    print(f"Statistics of the {derived.label} ({derived.unit}) of the most profitable movies:")
+    print(f"Mean: {summary.mean:.2f}")
+    print(f"Median: {summary.median:.2f}")
+    print(f"Standard Deviation: {summary.std_deviation}")
+    print(f"Inter-quartile range: {summary.interquartile:.2f}")
+    print(f"Maximum: {summary.maximum:.2f} ({summary.max_title})")
+    print(f"Minimum: {summary.minimum:.2f} ({summary.min_title})")
+
+
+def show_derived_rankings(table, column):
+    """
+    This function prints the RANKING_SIZE movies with the highest and the lowest values of a derived column.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    column : str
+        A name of derived.DERIVED_COLUMNS.
+
+    Returns
+    -------
+    None.
+
+    """
+    derived = DERIVED_COLUMNS[column]
+    index = rank_index(table, column)
+    print_ranking(f"Top {RANKING_SIZE} movies by {derived.label}:", index.entries(index.top_k(RANKING_SIZE)),
+                  derived.unit)
+    print()
+    print_ranking(f"Bottom {RANKING_SIZE} movies by {derived.label}:", index.entries(index.bottom_k(RANKING_SIZE)),
+                  derived.unit)
+
+
+def search_titles(table):
+    """
+    This function repeatedly asks for a movie title and prints every column of the matching movies. The
+    title can be typed in any case, can be the first letters of titles, or can be misspelt, in which case
+    the closest titles are suggested (see title_index.py).
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+
+    Returns
+    -------
+    None.
+
+    """
+    while True:
+        query = input("\nEnter a movie title or its first letters, press Enter to go back to main menu: ")
+        if not query.strip():
+            break
+        movies = search(table, query, limit=SEARCH_LIMIT)
+        if not movies:
+            print("\nNo movie found")
+        elif movies[0]["match"] == "fuzzy":
+            print("\nNo movie with that title, did you mean:")
+        for movie in movies:
+            print_movie(movie)
+
+
+def print_movie(movie):
+    """
+    Print the title, release year and money figures of a movie record (see MovieTable.record) or Movie view.
+    """
+    print(f"\n{movie['title'].strip()} ({movie['year']}, {movie['decade']})")
+    print(f"  Budget: {movie['budget']:.2f} million USD")
+    print(f"  Worldwide gross: {movie['worldwide_gross']:.2f} million USD "
+          f"({movie['budget_recovered']:.0f}% of the budget)")
+    print(f"  Domestic gross: {movie['domestic_gross']:.2f} million USD ({movie['domestic_pct']}%)")
+    print(f"  International gross: {movie['international_gross']:.2f} million USD ({movie['international_pct']}%)")
+
+
+def visualisation(table, memo=None):
     """
     The function continuously displays a menu to the user, prompting them to select from different
     visualization options for both numerical (Budgets, Worldwide Gross) and categorical data (Decade).
 
     Parameters
     ----------
-    budget : list
-        A list of movie budgets.
-    worldwide_gross : list
-        A list of worldwide gross earnings for movies.
-    decade_freq_dict : dict
-        A dictionary with decades as keys and frequency of movies per decade.
-    decade_numerical_dict : dict
-        A dictionary with decades as keys and associated worldwide gross data.
+    table : MovieTable
+        The loaded dataset.
+    memo : Memo, optional
+        The store of computed results (see memo.py), a new one by default. Each chart is drawn once into
+        a PNG image kept in it, and selecting the chart again displays the image without drawing it again.
 
     Returns
     -------
     None.
 
     """
+    memo = memo if memo is not None else Memo()
     while True:
         choice = input("\nVisualisations based on numerical columns (Budgets, Worldwide Gross)\n"
                        "--------------------------------------------------------------------\n"
@@ -197,23 +378,19 @@ def visualisation(budget, worldwide_gross, decade_freq_dict, decade_numerical_di
                        "6. Pie chart showing the percentage number of profitable movies in each decade\n"
                        "7. Bar chart showing the total of the profitable movies in each decade\n"
                        "8. Box plots of the worldwide grosses for each decade\n"
-                       "\nPlease select your choice (1-8), Press Q or q to go back to main menu: \n\n")
-        if choice == '1':
-            show_budget_histogram(budget)
-        elif choice == '2':
-            show_gross_histogram(worldwide_gross)
-        elif choice == '3':
-            show_budget_boxplot(budget)
-        elif choice == '4':
-            show_gross_boxplot(worldwide_gross)
-        elif choice == '5':
-            show_scatterplot(budget, worldwide_gross)
-        elif choice == '6':
-            show_piechart(decade_freq_dict)
-        elif choice == '7':
-            show_barchart(decade_freq_dict)
-        elif choice == '8':
-            show_category_boxplot(decade_numerical_dict)
+                       "\nVisualisations based on all numerical columns\n"
+                       "---------------------------------------------\n"
+                       "9. Heat map of the correlations between every pair of numerical columns\n"
+                       "\nVisualisations based on the release year\n"
+                       "----------------------------------------\n"
+                       "10. Line chart of the 5-year rolling mean and median Budget and Worldwide Gross\n"
+                       "\nVisualisations based on derived columns\n"
+                       "---------------------------------------\n"
+                       "11. Histogram of the return on investment (Worldwide Gross / Budget)\n"
+                       "\nPlease select your choice (1-11), Press Q or q to go back to main menu: \n\n")
+        if choice in CHART_CHOICES:
+            name = CHART_CHOICES[choice]
+            show_image(memo.figure(table, name), CHARTS[name].figsize)
         elif choice.lower() == 'q':
             break
         else:
@@ -223,58 +400,26 @@ def visualisation(budget, worldwide_gross, decade_freq_dict, decade_numerical_di
 
 def load_dataset():
     """
-    This function reads the dataset file 'dataset.csv', extracts movie information,
-    including budget, worldwide gross, and title. It organizes this information into lists
-    and dictionaries categorized by decade, storing frequencies and worldwide gross for each decade.
+    This function reads the dataset file 'dataset.csv' into a columnar MovieTable (see table.py), using the
+    binary cache next to it when the CSV has not changed since the last run (see cache.py). Per-decade
+    figures are computed from the table with group_by() (see groupby.py) when they are needed.
 
     Returns
     -------
-    budget : list
-        A list of movie budgets.
-    worldwide_gross : list
-        A list of worldwide gross earnings for movies.
-    title : list
-        A list of movie titles.
-    decade_freq_dict : dict
-        A dictionary with decades as keys and frequency of movies per decade.
-    decade_numerical_dict : dict
-        A dictionary with decades as keys and associated worldwide gross data.
+    table : MovieTable
+        The loaded dataset.
 
     """
-    budget = list()
-    worldwide_gross = list()
-    title = list()
-    decade_freq_dict = dict()
-    decade_numerical_dict = dict()
     try:
-        with open(DATASET) as datafile:
-            _ = datafile.readline()
-            for line in datafile:
-                temp_list = line.strip().split(",")
-                try:
-                    temp_budget_holder = float(temp_list[2])
-                    temp_gross_holder = float(temp_list[3])
-                    budget.append(temp_budget_holder)
-                    worldwide_gross.append(temp_gross_holder)
-                    title.append(temp_list[1])
-                    if temp_list[0] not in decade_numerical_dict:
-                        decade_numerical_dict[temp_list[0]] = [float(temp_list[3])]
-                    else:
-                        decade_numerical_dict[temp_list[0]].append(float(temp_list[3]))
-                    if temp_list[0] not in decade_freq_dict:
-                        decade_freq_dict[temp_list[0]] = 1
-                    else:
-                        decade_freq_dict[temp_list[0]] += 1
-                except ValueError:
-                    print(f"\n\nUnable to convert value to float at line: {line}")
-
+        with phase("load"):
+            return load_cached(DATASET)
     except FileNotFoundError:
         print(
             "\n\nDataset file 'dataset.csv' not found in project location.\n\nPlease check if the file is present in the project folder or it hasn't been renamed.\n\nProgram is exiting...")
         sys.exit()
-    return budget, worldwide_gross, title, decade_freq_dict, decade_numerical_dict
 
 
+@profiled()
 def calculate_mean(data_list):
     """
     This function computes the mean (average) for a given list of numerical data.
@@ -290,9 +435,12 @@ def calculate_mean(data_list):
         The mean (average) of the provided data.
 
     """
+    if numpy_module() is not None:
+        return backend.mean(data_list)
     return sum(data_list) / len(data_list)
 
 
+@profiled()
 def calculate_median(data_list):
     """
     This function computes the median (middle value) for a given list of numerical data.
@@ -305,17 +453,13 @@ def calculate_median(data_list):
     Returns
     -------
     float
-        The median of the provided data.
+        The median of the provided data, found by selection rather than a full sort.
 
     """
-    sorted_list = sorted(data_list)
-    mid_index = int(len(sorted_list) / 2)
-    if len(sorted_list) % 2:
-        return sorted_list[mid_index]
-    else:
-        return (sorted_list[mid_index - 1] + sorted_list[mid_index]) / 2
+    return quantiles(data_list, [0.5], method="halves")[0]
 
 
+@profiled()
 def calculate_mode(data_list):
     """
     This function computes the mode (most frequently occurring value) for a given list of data.
@@ -328,15 +472,15 @@ def calculate_mode(data_list):
     Returns
     -------
     float
-        The mode of the provided data.
+        The mode of the provided data. Ties are broken by the value occurring first.
 
     """
-    frequencies = []
-    for value in data_list:
-        frequencies.append(data_list.count(value))
-    return data_list[frequencies.index(max(frequencies))]
+    if numpy_module() is not None:
+        return backend.mode(data_list)
+    return FrequencyTable(data_list).mode()
 
 
+@profiled()
 def calculate_range(data_list):
     """
     Calculate the range of a given list of numerical data.
@@ -352,9 +496,13 @@ def calculate_range(data_list):
         The range of the data, rounded to two decimal places.
 
     """
+    if numpy_module() is not None:
+        values = backend.as_array(data_list)
+        return round(float(values.max() - values.min()), 2)
     return round(max(data_list) - min(data_list), 2)
 
 
+@profiled()
 def calculate_interquartile(data_list):
     """
     This function computes the interquartile range (IQR) for a given list of numerical data.
@@ -367,20 +515,15 @@ def calculate_interquartile(data_list):
     Returns
     -------
     float
-        The interquartile range (IQR) of the provided data.
+        The interquartile range (IQR) of the provided data, the difference between the medians of the
+        upper and lower halves.
 
     """
-    sorted_list = sorted(data_list)
-    mid_index = int(len(sorted_list) / 2)
-    if len(sorted_list) % 2:
-        lower_half = sorted_list[:mid_index]
-        upper_half = sorted_list[mid_index + 1:]
-    else:
-        lower_half = sorted_list[:mid_index]
-        upper_half = sorted_list[mid_index:]
-    return calculate_median(upper_half) - calculate_median(lower_half)
+    lower_quartile, upper_quartile = quantiles(data_list, [0.25, 0.75], method="halves")
+    return upper_quartile - lower_quartile
 
 
+@profiled()
 def calculate_std_deviation(data_list):
     """
     This function computes the standard deviation for a given list of numerical data.
@@ -396,11 +539,14 @@ def calculate_std_deviation(data_list):
         The standard deviation of the provided data.
 
     """
+    if numpy_module() is not None:
+        return round(backend.std_deviation(data_list), 2)
     mean = calculate_mean(data_list)
     sqrd_deviation = [(values - mean) ** 2 for values in data_list]
     return round(sqrt(sum(sqrd_deviation) / (len(data_list) - 1)), 2)
 
 
+@profiled()
 def calculate_skewness(data_list, flag):
     """
     This function computes the Pearson Mode Skewness or Alternative Pearson Mode Skewness measure for a given list of numerical data.
@@ -428,6 +574,7 @@ def calculate_skewness(data_list, flag):
         display_menu()
 
 
+@profiled()
 def calculate_correlation(budget_list, gross_list):
     """
     This function computes the correlation coefficient between two sets of numerical data, 'budget_list' and 'gross_list', using the Pearson correlation formula. 
@@ -446,19 +593,170 @@ def calculate_correlation(budget_list, gross_list):
 
     """
     try:
+        if numpy_module() is not None:
+            return round(backend.correlation(budget_list, gross_list), 2)
         budget_mean = calculate_mean(budget_list)
         gross_mean = calculate_mean(gross_list)
-        budget_deviation = [value - budget_mean for value in budget_list]
-        gross_deviation = [value - gross_mean for value in gross_list]
-        budget_gross_deviations = [x * y for (x, y) in zip(budget_deviation, gross_deviation)]
-        budget_sq_deviation = [(value - budget_mean) ** 2 for value in budget_list]
-        gross_sq_deviation = [(value - gross_mean) ** 2 for value in gross_list]
-        return round(sum(budget_gross_deviations) / (sqrt(sum(budget_sq_deviation)) * sqrt(sum(gross_sq_deviation))), 2)
+        # one pass without intermediate lists; see correlation.py for every pair of columns at once
+        budget_gross_deviation = budget_sq_deviation = gross_sq_deviation = 0.0
+        for budget, gross in zip(budget_list, gross_list):
+            budget_deviation = budget - budget_mean
+            gross_deviation = gross - gross_mean
+            budget_gross_deviation += budget_deviation * gross_deviation
+            budget_sq_deviation += budget_deviation * budget_deviation
+            gross_sq_deviation += gross_deviation * gross_deviation
+        return round(budget_gross_deviation / (sqrt(budget_sq_deviation) * sqrt(gross_sq_deviation)), 2)
     except ZeroDivisionError:
         print("\n\nDivision by zero encountered.\nRedirecting to main menu...\n\n")
         display_menu()
 
 
+def print_ranking(heading, entries, unit="million USD"):
+    """
+    Print a heading followed by one line per movie: its rank, title and value in 'unit'.
+    """
+    print(heading)
+    for entry in entries:
+        print(f"{entry['rank']:>6}. {entry['title']} ({entry['value']:.2f} {unit})")
+
+
+def show_rankings(table, top=True):
+    """
+    This function prints the RANKING_SIZE movies with the highest (or lowest) budgets and worldwide grosses.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    top : bool
+        True for the highest values, False for the lowest.
+
+    Returns
+    -------
+    None.
+
+    """
+    for column, label in RANKED_COLUMNS:
+        index = rank_index(table, column)
+        rows = index.top_k(RANKING_SIZE) if top else index.bottom_k(RANKING_SIZE)
+        print_ranking(f"{'Top' if top else 'Bottom'} {RANKING_SIZE} movies by {label}:", index.entries(rows))
+        print()
+
+
+def show_rank_of_title(table, title):
+    """
+    This function prints the rank of the movie called 'title' by budget and by worldwide gross,
+    where rank 1 is the highest value.
+
+    Parameters
+    ----------
+    table : MovieTable or TableView
+        The loaded dataset.
+    title : str
+        The title of the movie.
+
+    Returns
+    -------
+    None.
+
+    """
+    try:
+        # a row of the table, or a position in a filtered view (see views.py), as the indexes of the view use
+        position = row_of_title(table, title)
+    except ValueError:
+        print(f"\nNo movie called '{title.strip()}' in the dataset")
+        return
+    name = table["title"][position].strip()
+    for column, label in RANKED_COLUMNS:
+        index = rank_index(table, column)
+        print(f"Rank of {name} by {label}: {index.rank_of_row(position)} of {len(index)} "
+              f"({table[column][position]:.2f} million USD)")
+
+
+def show_range(table, column, label, low, high):
+    """
+    This function prints how many movies have a value of 'column' between 'low' and 'high' (both included)
+    and lists the first RANGE_DISPLAY_LIMIT of them, lowest value first.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    column : str
+        The numerical column, e.g. 'budget'.
+    label : str
+        The name of the column in the output.
+    low, high : float
+        The range, in million USD.
+
+    Returns
+    -------
+    None.
+
+    """
+    index = rank_index(table, column)
+    count = index.count_between(low, high)
+    print_ranking(f"\n{count} movies with a {label} between {low:.2f} and {high:.2f} million USD:",
+                  index.entries(index.between(low, high, RANGE_DISPLAY_LIMIT)))
+    if count > RANGE_DISPLAY_LIMIT:
+        print(f"... and {count - RANGE_DISPLAY_LIMIT} more")
+
+
+def show_chart(name, *data):
+    """
+    This function draws one of the charts defined in charts.py in a new window and displays it.
+
+    Parameters
+    ----------
+    name : str
+        The name of the chart in charts.CHARTS.
+    *data
+        The data the chart is drawn from.
+
+    Returns
+    -------
+    None.
+
+    """
+    import matplotlib.pyplot as plt
+
+    chart = CHARTS[name]
+    with phase(f"chart.{name}"):
+        with phase("draw"):
+            fig, ax = plt.subplots(figsize=chart.figsize)
+            chart.draw(ax, *data)
+        with phase("show"):
+            plt.show()
+
+
+def show_image(png, figsize=None):
+    """
+    This function displays a chart already rendered to a PNG image (see memo.Memo.figure) in a new window.
+
+    Parameters
+    ----------
+    png : bytes
+        The PNG image.
+    figsize : tuple, optional
+        The size of the window in inches, the size the chart was drawn at.
+
+    Returns
+    -------
+    None.
+
+    """
+    import matplotlib.pyplot as plt
+
+    with phase("image"):
+        fig = plt.figure(figsize=figsize)
+        ax = fig.add_axes((0, 0, 1, 1))
+        with phase("decode"):
+            ax.imshow(plt.imread(BytesIO(png), format="png"))
+        ax.set_axis_off()
+        with phase("show"):
+            plt.show()
+
+
 def show_budget_histogram(budget_list):
     """
     This function creates a histogram displaying the distribution of budgets for movies.
@@ -475,14 +773,7 @@ def show_budget_histogram(budget_list):
     None.
 
     """
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.set_title("Budgets of Most Profitable Movies")
-    ax.set_xlabel("Budget (in million USD)")
-    ax.set_ylabel("Number of movies")
-    bins = range(0, int(max(budget_list)) + 50, 50)
-    ax.set_xticks(bins)
-    ax.hist(budget_list, bins, ec="black")
-    plt.show()
+    show_chart("budget_histogram", budget_list)
 
 
 def show_gross_histogram(gross_list):
@@ -501,14 +792,7 @@ def show_gross_histogram(gross_list):
     None.
 
     """
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.set_title("Worldwide Gross of Most Profitable Movies")
-    ax.set_xlabel("Worldwide gross (in million USD)")
-    ax.set_ylabel("Number of movies")
-    bins = range(0, int(max(gross_list)) + 200, 200)
-    ax.set_xticks(bins)
-    ax.hist(gross_list, bins, ec="black")
-    plt.show()
+    show_chart("gross_histogram", gross_list)
 
 
 def show_budget_boxplot(budget_list):
@@ -527,11 +811,7 @@ def show_budget_boxplot(budget_list):
     None.
 
     """
-    fig, ax = plt.subplots()
-    ax.set_title("Budgets of Most Profitable Movies")
-    ax.set_ylabel("Budget (in million USD)")
-    ax.boxplot(budget_list, showfliers=False, showmeans=True, meanline=True)
-    plt.show()
+    show_chart("budget_boxplot", budget_list)
 
 
 def show_gross_boxplot(gross_list):
@@ -550,11 +830,7 @@ def show_gross_boxplot(gross_list):
     None.
 
     """
-    fig, ax = plt.subplots()
-    ax.set_title("Worldwide Gross of Most Profitable Movies")
-    ax.set_ylabel("Worldwide gross (in million USD)")
-    ax.boxplot(gross_list, showfliers=False, showmeans=True, meanline=True)
-    plt.show()
+    show_chart("gross_boxplot", gross_list)
 
 
 def show_scatterplot(budget_list, gross_list):
@@ -574,23 +850,18 @@ def show_scatterplot(budget_list, gross_list):
     None.
 
     """
-    fig, ax = plt.subplots(figsize=(10, 7))
-    ax.set_title("Scatter Plot of Budget vs Worldwide gross")
-    ax.set_xlabel("Budget (in million USD)")
-    ax.set_ylabel("Worldwide gross (in million USD)")
-    ax.scatter(budget_list, gross_list, marker='.')
-    plt.show()
+    show_chart("scatterplot", budget_list, gross_list)
 
 
-def category_highest_gross(decade_numerical_dict):
+def category_highest_gross(decade_totals):
     """
-    This function iterates through the input dictionary, computes the total gross earnings for each decade, and identifies the decade with the highest total gross earnings.
+    This function iterates through the input dictionary of total gross earnings for each decade, and identifies the decade with the highest total gross earnings.
     It then prints the decade and its total gross in billion USD.
 
     Parameters
     ----------
-    decade_numerical_dict : dict
-        A dictionary where keys represent decades and values are lists of worldwide gross values.
+    decade_totals : dict
+        A dictionary where keys represent decades and values are the total worldwide gross of the decade.
 
     Returns
     -------
@@ -599,23 +870,22 @@ def category_highest_gross(decade_numerical_dict):
     """
     max_total = 0.0
     key_for_max_total = ""
-    for key, value in decade_numerical_dict.items():
-        temp = sum(value)
+    for key, temp in decade_totals.items():
         if temp >= max_total:
             max_total = temp
             key_for_max_total = key
     print(f"The highest grossing decade is the {key_for_max_total} with a total of {max_total / 1000:.2f} Billion USD")
 
 
-def category_lowest_gross(decade_numerical_dict):
+def category_lowest_gross(decade_totals):
     """
-    This function iterates through the input dictionary, computes the total gross earnings for each decade, and identifies the decade with the lowest total gross earnings.
+    This function iterates through the input dictionary of total gross earnings for each decade, and identifies the decade with the lowest total gross earnings.
     It then prints the decade and its total gross in billion USD.
 
     Parameters
     ----------
-    decade_numerical_dict : dict
-        A dictionary where keys represent decades and values are lists of worldwide gross values.
+    decade_totals : dict
+        A dictionary where keys represent decades and values are the total worldwide gross of the decade.
 
     Returns
     -------
@@ -624,8 +894,7 @@ def category_lowest_gross(decade_numerical_dict):
     """
     min_total = float("inf")  # Set initial smallest value to positive infinity
     key_for_min_total = ""
-    for key, value in decade_numerical_dict.items():
-        temp = sum(value)
+    for key, temp in decade_totals.items():
         if temp <= min_total:
             min_total = temp
             key_for_min_total = key
@@ -647,13 +916,7 @@ def show_piechart(decade_freq_dict):
     None.
 
     """
-    decade_freq_dict = {k: decade_freq_dict[k] for k in sorted(decade_freq_dict)}
-    fig, ax = plt.subplots(figsize=(10, 7))
-    colors_list = ['tomato', 'cornflowerblue', 'gold', 'orchid', 'greenyellow', 'cyan']
-    ax.set_title("Distribution of Most Profitable Movies by Decade")
-    ax.pie(decade_freq_dict.values(), labels=decade_freq_dict.keys(), autopct="%.0f%%", pctdistance=0.8,
-           colors=colors_list)
-    plt.show()
+    show_chart("piechart", decade_freq_dict)
 
 
 def show_barchart(decade_freq_dict):
@@ -671,15 +934,7 @@ def show_barchart(decade_freq_dict):
     None.
 
     """
-    decade_freq_dict = {k: decade_freq_dict[k] for k in sorted(decade_freq_dict)}
-    fig, ax = plt.subplots(figsize=(10, 7))
-    ax.set_title("Most Profitable Movies in each Decade")
-    ax.set_xlabel("Number of Movies")
-    ax.set_ylabel("Decade")
-    for index, value in enumerate(decade_freq_dict.values()):
-        ax.text(value, index - 0.1, str(value))
-    ax.barh(list(decade_freq_dict.keys()), decade_freq_dict.values())
-    plt.show()
+    show_chart("barchart", decade_freq_dict)
 
 
 def show_category_boxplot(decade_numerical_dict):
@@ -697,15 +952,69 @@ def show_category_boxplot(decade_numerical_dict):
     None.
 
     """
-    decade_numerical_dict = {k: decade_numerical_dict[k] for k in sorted(decade_numerical_dict)}
-    fig, ax = plt.subplots(figsize=(10, 7))
-    ax.set_title("Worldwide Gross for each Decade")
-    ax.set_xlabel("Decade")
-    ax.set_ylabel("Worldwide Gross (in million USD)")
-    ax.boxplot(decade_numerical_dict.values(), showfliers=False, labels=decade_numerical_dict.keys(), showmeans=True,
-               meanline=True)
-    plt.show()
+    show_chart("category_boxplot", decade_numerical_dict)
+
+
+def show_correlation_heatmap(names, matrix):
+    """
+    This function displays the correlation matrix of the numerical columns as a heat map, each cell coloured
+    by the Pearson correlation of a pair of columns and labelled with its value.
+
+    Parameters
+    ----------
+    names : sequence
+        The names of the columns.
+    matrix : list
+        The correlations as a list of rows, in the order of 'names' (see correlation.correlation_matrix).
+
+    Returns
+    -------
+    None.
+
+    """
+    show_chart("correlation_heatmap", names, matrix)
+
+
+def show_trend_lines(years, series):
+    """
+    This function displays the rolling mean and median of the budgets and worldwide grosses over the release
+    years as a line chart.
+
+    Parameters
+    ----------
+    years : list
+        Every year from the first release year to the last.
+    series : dict
+        (label, statistic) -> the statistic of the window ending each year (see trends.YearTrend.rolling).
+
+    Returns
+    -------
+    None.
+
+    """
+    show_chart("trend_lines", years, series)
+
+
+def show_roi_histogram(roi_list):
+    """
+    This function displays the histogram of the return on investment (worldwide gross / budget) of the movies,
+    with logarithmic bins.
+
+    Parameters
+    ----------
+    roi_list : sequence
+        The return on investment of each movie, e.g. table["roi"] (see derived.py).
+
+    Returns
+    -------
+    None.
+
+    """
+    show_chart("roi_histogram", roi_list)
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        from cli import main as run_command_line
+        sys.exit(run_command_line(sys.argv[1:]))
     display_menu()
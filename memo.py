@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 15:12:40 2026
+
+@author: A00315995
+
+# Program Name: memo.py
+# purpose: This program remembers the results the interactive menus compute (statistics and rendered chart
+# images) so that selecting an option again answers at once. Results are keyed by a fingerprint of the table's
+# contents with the column, the statistic or chart and its parameters, so a changed dataset never gets an old
+# answer. The least recently used results are dropped beyond a size bound, the store can be saved next to the
+# dataset between sessions, and hit and miss counts show how well it is working.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+
+from render import render_bytes
+from table import CategoryColumn
+from views import TableView
+
+# Results are dropped, least recently used first, once their total size exceeds this many bytes
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MEMO_SUFFIX = ".memo"
+
+
+def memo_path_for(path):
+    """
+    Return the path of the saved results of the dataset at 'path'.
+    """
+    return path + MEMO_SUFFIX
+
+
+def table_fingerprint(table):
+    """
+    This function returns a hash of every value of the table, computed the first time it is requested and
+    kept in table.indexes, which is emptied when rows are appended, so the hash always matches the rows.
+
+    Parameters
+    ----------
+    table : MovieTable or TableView
+        The dataset, or a view of it, whose fingerprint is the table's combined with the selected rows.
+
+    Returns
+    -------
+    str
+        The hexadecimal BLAKE2b digest of the columns.
+
+    """
+    if isinstance(table, TableView):
+        digest = hashlib.blake2b(table_fingerprint(table.table).encode("ascii"), digest_size=16)
+        digest.update(table.selection.to_bytes())
+        return digest.hexdigest()
+    if "fingerprint" in table.indexes:
+        return table.indexes["fingerprint"]
+    digest = hashlib.blake2b(digest_size=16)
+    for name, column in table.columns.items():
+        digest.update(name.encode("utf-8"))
+        if isinstance(column, CategoryColumn):
+            digest.update(column.codes)
+            digest.update("\0".join(column.categories).encode("utf-8", "surrogatepass"))
+        else:
+            digest.update(column)
+    table.indexes["fingerprint"] = fingerprint = digest.hexdigest()
+    return fingerprint
+
+
+def result_size(value):
+    """
+    Return the size of a result in bytes: its length for bytes (e.g. an image), its pickled size otherwise.
+    """
+    if isinstance(value, bytes):
+        return len(value)
+    return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _owned_privately(memofile):
+    """
+    Return True if the open file belongs to the user running the program and only they can write it (always
+    True where files have no owner, e.g. on Windows).
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    status = os.fstat(memofile.fileno())
+    return status.st_uid == os.getuid() and not status.st_mode & 0o022
+
+
+class Memo:
+    """
+    A store of computed results keyed by (table fingerprint, column, name, parameters), in least recently used
+    order. 'hits' counts the results found in the store, 'misses' the ones that had to be computed and
+    'evictions' the ones dropped to keep the total size under 'max_bytes'.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        # key -> (result, size in bytes), least recently used first
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, table, column, name, compute, params=()):
+        """
+        This function returns a result from the store, or computes and stores it the first time it is requested.
+
+        Parameters
+        ----------
+        table : MovieTable
+            The dataset the result is computed from.
+        column : str or tuple
+            The column (or columns) the result is computed from, None if it depends on the whole table.
+        name : str
+            What is computed, e.g. 'describe' or 'chart.budget_histogram'.
+        compute : function
+            Called without arguments to compute the result when it is not in the store.
+        params : tuple
+            Any other hashable value the result depends on.
+
+        Returns
+        -------
+        object
+            The result.
+
+        """
+        key = (table_fingerprint(table), column, name, tuple(params))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def put(self, key, result):
+        """
+        Store a result under 'key' as the most recently used one, dropping the least recently used results
+        while the store is too big. A result bigger than the whole store is not kept.
+        """
+        size = result_size(result)
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (result, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            self.size -= self.entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def figure(self, table, name, dpi=100):
+        """
+        Return the PNG image of the chart 'name' of charts.CHARTS drawn from the table (see render.render_bytes).
+        """
+        return self.get(table, None, f"chart.{name}", lambda: render_bytes(table, name, "png", dpi), (dpi,))
+
+    def clear(self):
+        """
+        Drop every result; the counters are kept.
+        """
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Return the counters, the number of results and their total size in bytes as a dictionary.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "bytes": self.size}
+
+    def load(self):
+        """
+        Read the results saved at 'path', least recently used first. A missing, unreadable or truncated file,
+        or one that does not hold a list of (key, result) pairs, leaves the store empty.
+
+        Loading unpickles the file, which can run any code it contains, so only a file owned by the user
+        running the program and writable by no one else is read: 'path' must be a memo file this program
+        saved, never one received from elsewhere.
+
+        Returns
+        -------
+        None.
+
+        """
+        try:
+            with open(self.path, "rb") as memofile:
+                if not _owned_privately(memofile):
+                    return
+                # dict() checks that every entry is a pair with a hashable key
+                saved = dict(pickle.load(memofile))
+        except Exception:
+            return
+        if not all(isinstance(key, tuple) for key in saved):
+            return
+        for key, result in saved.items():
+            self.put(key, result)
+        self.evictions = 0
+
+    def save(self):
+        """
+        This function writes the results to 'path' so that the next session starts with them. The file is
+        written to a temporary name and renamed, and nothing is written if the directory is read-only.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.path is None:
+            return
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "wb") as memofile:
+                pickle.dump([(key, result) for key, (result, _) in self.entries.items()], memofile,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
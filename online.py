@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:48:10 2026
+
+@author: A00315995
+
+# Program Name: online.py
+# purpose: This program keeps running statistics of the dataset (count, sum, Welford mean and moments,
+# the budget/gross co-moment, minimum/maximum and per-decade totals) that are updated with new rows only,
+# so appending to dataset.csv does not require re-reading the whole file. The state can be saved between runs.
+# Sums are kept exactly, as the partial sums math.fsum uses, so that sums merged from several parts are
+# equal to math.fsum of all the values.
+"""
+import hashlib
+from itertools import chain
+import json
+from math import fsum, isfinite, sqrt
+from operator import mul
+import os
+
+import backend
+from backend import numpy_module
+from table import parse_records
+
+
+def exact_partials(values):
+    """
+    This function returns floats whose exact sum is the exact sum of 'values': math.fsum gives the correctly
+    rounded sum, and every further pass the correctly rounded remainder, until nothing remains (usually
+    after two passes). math.fsum of the partials of several parts is then math.fsum of all their values.
+
+    Parameters
+    ----------
+    values : sequence
+        Floats, read several times (a list or an array, not an iterator).
+
+    Returns
+    -------
+    list
+        The partial sums, largest first; empty for a zero sum.
+
+    """
+    partials = []
+    total = fsum(values)
+    if not isfinite(total):
+        return [total]
+    while total:
+        partials.append(total)
+        total = fsum(chain(values, [-partial for partial in partials]))
+    return partials
+
+
+def add_exact(partials, value):
+    """
+    Add 'value' to the exact partial sums 'partials' in place, with the algorithm of math.fsum (Shewchuk).
+    """
+    position = 0
+    for partial in partials:
+        if abs(value) < abs(partial):
+            value, partial = partial, value
+        high = value + partial
+        low = partial - (high - value)
+        if low:
+            partials[position] = low
+            position += 1
+        value = high
+    partials[position:] = [value]
+
+
+class Moments:
+    """
+    Running count, exact sum, minimum, maximum, mean and second/third central moments (M2, M3) of one column,
+    updated one value at a time with Welford's method. Two Moments objects can be merged.
+    """
+
+    __slots__ = ("count", "partials", "mean", "m2", "m3", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        # exact partial sums of the values, see exact_partials()
+        self.partials = []
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def update(self, value):
+        """
+        Add one value.
+        """
+        previous_count = self.count
+        self.count += 1
+        add_exact(self.partials, value)
+        delta = value - self.mean
+        delta_n = delta / self.count
+        term = delta * delta_n * previous_count
+        self.mean += delta_n
+        self.m3 += term * delta_n * (self.count - 2) - 3 * delta_n * self.m2
+        self.m2 += term
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def total(self):
+        """
+        The sum of the values, math.fsum of the values added.
+        """
+        return fsum(self.partials)
+
+    @classmethod
+    def from_values(cls, data_list):
+        """
+        Return the moments of a whole column at once: exact partial sums and two passes of vectorized sums
+        under the NumPy backend, or of built-in sum() and map() otherwise, instead of one Welford update per
+        value.
+        """
+        moments = cls()
+        count = len(data_list)
+        if not count:
+            return moments
+        np = numpy_module()
+        if np is not None:
+            values = backend.as_array(data_list)
+            partials = exact_partials(values.tolist())
+            deviations = values - fsum(partials) / count
+            squares = deviations * deviations
+            m2, m3 = float(squares.sum()), float(np.dot(squares, deviations))
+            minimum, maximum = data_list[int(values.argmin())], data_list[int(values.argmax())]
+        else:
+            partials = exact_partials(data_list)
+            mean = fsum(partials) / count
+            deviations = [value - mean for value in data_list]
+            squares = list(map(mul, deviations, deviations))
+            m2, m3 = sum(squares), sum(map(mul, squares, deviations))
+            minimum, maximum = min(data_list), max(data_list)
+        moments.count, moments.partials, moments.mean = count, partials, fsum(partials) / count
+        moments.m2, moments.m3, moments.minimum, moments.maximum = m2, m3, minimum, maximum
+        return moments
+
+    def merge(self, other):
+        """
+        Merge the moments of another set of values into this one.
+
+        Returns
+        -------
+        Moments
+            This object, to allow chaining.
+
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            self.partials = list(other.partials)
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / count
+        self.m3 = (self.m3 + other.m3
+                   + delta ** 3 * self.count * other.count * (self.count - other.count) / count ** 2
+                   + 3 * delta * (self.count * other.m2 - other.count * self.m2) / count)
+        self.m2 = m2
+        self.mean += delta * other.count / count
+        self.count = count
+        for partial in other.partials:
+            add_exact(self.partials, partial)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def std_deviation(self):
+        """
+        Return the sample standard deviation rounded to two decimal places, as calculate_std_deviation does.
+        """
+        return round(sqrt(self.m2 / (self.count - 1)), 2)
+
+    def skewness(self):
+        """
+        Return the moment coefficient of skewness, sqrt(n) * M3 / M2 ** 1.5, rounded to two decimal places.
+        """
+        return round(sqrt(self.count) * self.m3 / self.m2 ** 1.5, 2)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, state):
+        moments = cls()
+        for name in cls.__slots__:
+            setattr(moments, name, state[name])
+        return moments
+
+
+class Accumulator:
+    """
+    Running statistics of the budget and worldwide gross columns, their co-moment and the number of movies
+    and total gross per decade. New rows are added with update_table() or read from the end of the dataset
+    file with update_from_file(), which remembers the byte offset it has read up to and a digest of the header
+    and of the last line read, the bytes from 'tail' to 'offset', to recognise a rewritten file.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        """
+        Forget every movie and the position read up to in the dataset file.
+        """
+        self.budget = Moments()
+        self.worldwide_gross = Moments()
+        self.co_moment = 0.0
+        self.decade_counts = dict()
+        self.decade_totals = dict()
+        self.offset = 0
+        self.header_end = 0
+        self.tail = 0
+        self.digest = None
+        self.rejected = 0
+
+    def update(self, decade, budget, gross):
+        """
+        Add one movie.
+        """
+        previous_budget_mean = self.budget.mean
+        self.budget.update(budget)
+        self.worldwide_gross.update(gross)
+        self.co_moment += (budget - previous_budget_mean) * (gross - self.worldwide_gross.mean)
+        self.decade_counts[decade] = self.decade_counts.get(decade, 0) + 1
+        self.decade_totals[decade] = self.decade_totals.get(decade, 0.0) + gross
+
+    def update_table(self, table):
+        """
+        Add every movie of a MovieTable (or of any mapping with decade, budget and worldwide_gross columns).
+        """
+        for decade, budget, gross in zip(table["decade"], table["budget"], table["worldwide_gross"]):
+            self.update(decade, budget, gross)
+
+    def merge(self, other):
+        """
+        Merge the statistics of another Accumulator, e.g. one built over a different file.
+
+        Returns
+        -------
+        Accumulator
+            This accumulator, to allow chaining.
+
+        """
+        if other.budget.count and self.budget.count:
+            count = self.budget.count + other.budget.count
+            delta_budget = other.budget.mean - self.budget.mean
+            delta_gross = other.worldwide_gross.mean - self.worldwide_gross.mean
+            self.co_moment += (other.co_moment
+                               + delta_budget * delta_gross * self.budget.count * other.budget.count / count)
+        elif other.budget.count:
+            self.co_moment = other.co_moment
+        self.budget.merge(other.budget)
+        self.worldwide_gross.merge(other.worldwide_gross)
+        for decade, count in other.decade_counts.items():
+            self.decade_counts[decade] = self.decade_counts.get(decade, 0) + count
+            self.decade_totals[decade] = self.decade_totals.get(decade, 0.0) + other.decade_totals[decade]
+        self.rejected += other.rejected
+        return self
+
+    def _checkpoint(self, datafile):
+        """
+        Return the digest of the header and of the last line read from the open file, None if it is too short.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for start, end in ((0, self.header_end), (self.tail, self.offset)):
+            datafile.seek(start)
+            block = datafile.read(end - start)
+            if len(block) < end - start:
+                return None
+            digest.update(block)
+        return digest.hexdigest()
+
+    def _decoded(self, lines):
+        """
+        Decode the lines of the file, counting a line that is not UTF-8 as rejected and skipping it.
+        """
+        for line in lines:
+            try:
+                yield line.decode("utf-8")
+            except UnicodeDecodeError:
+                self.rejected += 1
+                yield "\n"
+
+    def update_from_file(self, path):
+        """
+        This function reads the rows appended to the dataset file since the last call and adds them, parsed
+        with the quote-aware csv module like the loader. Only lines ending with a line break are consumed: a
+        final line without one may be a row still being written (a cut-off year still parses), so it is left
+        for the next call, and a file must end with a line break for its last row to be read. If the header or
+        the last line read differ from the previous call the file was rewritten, and the statistics are
+        rebuilt from the start.
+
+        Parameters
+        ----------
+        path : str
+            The path of the dataset CSV file.
+
+        Returns
+        -------
+        int
+            The number of rows added.
+
+        """
+        with open(path, "rb") as datafile:
+            if self.offset and self._checkpoint(datafile) != self.digest:
+                self._reset()
+            datafile.seek(self.offset)
+            data = datafile.read()
+            if self.offset == 0:
+                header_end = data.find(b"\n")
+                if header_end < 0:
+                    return 0
+                self.offset = self.tail = self.header_end = header_end + 1
+                data = data[header_end + 1:]
+            end = data.rfind(b"\n") + 1
+            delta, rejects = parse_records(self._decoded(data[:end].splitlines(keepends=True)))
+            self.rejected += len(rejects)
+            if end:
+                self.tail = self.offset + data.rfind(b"\n", 0, end - 1) + 1
+                self.offset += end
+            self.digest = self._checkpoint(datafile)
+        self.update_table(delta)
+        return len(delta)
+
+    def count(self):
+        return self.budget.count
+
+    def mean(self, column):
+        """
+        Return the mean of 'budget' or 'worldwide_gross', computed as sum / count like calculate_mean.
+        """
+        moments = getattr(self, column)
+        return moments.total / moments.count
+
+    def std_deviation(self, column):
+        """
+        Return the standard deviation of 'budget' or 'worldwide_gross', rounded like calculate_std_deviation.
+        """
+        return getattr(self, column).std_deviation()
+
+    def correlation(self):
+        """
+        Return the correlation of budget with worldwide gross, rounded like calculate_correlation.
+        """
+        return round(self.co_moment / sqrt(self.budget.m2 * self.worldwide_gross.m2), 2)
+
+    def to_dict(self):
+        return {"budget": self.budget.to_dict(), "worldwide_gross": self.worldwide_gross.to_dict(),
+                "co_moment": self.co_moment, "decade_counts": self.decade_counts,
+                "decade_totals": self.decade_totals, "offset": self.offset, "header_end": self.header_end,
+                "tail": self.tail, "digest": self.digest, "rejected": self.rejected}
+
+    @classmethod
+    def from_dict(cls, state):
+        accumulator = cls()
+        accumulator.budget = Moments.from_dict(state["budget"])
+        accumulator.worldwide_gross = Moments.from_dict(state["worldwide_gross"])
+        for name in ("co_moment", "decade_counts", "decade_totals", "offset", "header_end", "tail", "digest",
+                     "rejected"):
+            setattr(accumulator, name, state[name])
+        return accumulator
+
+    def save(self, path):
+        """
+        Save the accumulator state as JSON so that a later run can continue from it.
+        """
+        with open(path, "w") as statefile:
+            json.dump(self.to_dict(), statefile)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an accumulator saved with save(), or return a new empty one if 'path' does not exist or holds the
+        state of an earlier version, without the checkpoint of the file.
+        """
+        try:
+            with open(path) as statefile:
+                return cls.from_dict(json.load(statefile))
+        except (FileNotFoundError, KeyError):
+            return cls()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 14:31:17 2026
+
+@author: A00315995
+
+# Program Name: profiling.py
+# purpose: This program records where the time of a session goes. The load phases, statistics and charts are
+# wrapped in named phases; while profiling is enabled each phase records its number of calls, wall and CPU
+# time and (optionally) its peak of allocated memory with tracemalloc, nested under the phase that called it.
+# The report is written as JSON or as collapsed stacks for flame graph tools (flamegraph.pl, speedscope).
+# While profiling is disabled, which is the default, a phase costs one global lookup.
+"""
+from contextlib import nullcontext
+from functools import wraps
+import json
+import sys
+from time import perf_counter, process_time
+import tracemalloc
+
+# The profiler in use, None while profiling is disabled
+_profiler = None
+# The context manager phase() returns while profiling is disabled
+_DISABLED = nullcontext()
+
+
+class PhaseStats:
+    """
+    The totals of one phase at one place in the call tree: calls, wall and CPU seconds, the wall seconds spent
+    in its sub-phases and the largest memory allocated during one call, above what was allocated at its start.
+    'order' numbers the phases in the order they were first entered.
+    """
+
+    __slots__ = ("order", "calls", "wall", "cpu", "children_wall", "peak_bytes")
+
+    def __init__(self, order):
+        self.order = order
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.children_wall = 0.0
+        self.peak_bytes = 0
+
+
+class Profiler:
+    """
+    Phase statistics keyed by the path of the phase in the call tree, e.g. ('load', 'parse'), with the stack
+    of the phases running now. With 'memory' True, tracemalloc is started and peaks are recorded.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.stats = dict()
+        # [path, wall start, cpu start, memory at start, highest memory seen] of each running phase
+        self.stack = []
+        self.started = perf_counter()
+
+    def enter(self, name):
+        path = (self.stack[-1][0] if self.stack else ()) + (name,)
+        if path not in self.stats:
+            self.stats[path] = PhaseStats(len(self.stats))
+        current = peak = 0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                self.stack[-1][4] = max(self.stack[-1][4], peak)
+            tracemalloc.reset_peak()
+        self.stack.append([path, perf_counter(), process_time(), current, current])
+
+    def exit(self):
+        wall, cpu = perf_counter(), process_time()
+        path, wall_start, cpu_start, start_bytes, highest = self.stack.pop()
+        stats = self.stats[path]
+        stats.calls += 1
+        stats.wall += wall - wall_start
+        stats.cpu += cpu - cpu_start
+        if self.memory:
+            highest = max(highest, tracemalloc.get_traced_memory()[1])
+            stats.peak_bytes = max(stats.peak_bytes, highest - start_bytes)
+            if self.stack:
+                self.stack[-1][4] = max(self.stack[-1][4], highest)
+        if self.stack:
+            self.stats[self.stack[-1][0]].children_wall += wall - wall_start
+
+    def merge(self, other):
+        """
+        Add the phases recorded by another profiler, e.g. in a worker process, under the phase running now.
+        Their wall times are not counted in that phase's sub-phases, as the workers run alongside it.
+        """
+        prefix = self.stack[-1][0] if self.stack else ()
+        for path, theirs in sorted(other.stats.items(), key=lambda item: item[1].order):
+            stats = self.stats.get(prefix + path)
+            if stats is None:
+                stats = self.stats[prefix + path] = PhaseStats(len(self.stats))
+            stats.calls += theirs.calls
+            stats.wall += theirs.wall
+            stats.cpu += theirs.cpu
+            stats.children_wall += theirs.children_wall
+            stats.peak_bytes = max(stats.peak_bytes, theirs.peak_bytes)
+        return self
+
+    def report(self):
+        """
+        Return the statistics of every phase as a JSON-serialisable dictionary, phases in call tree order:
+        each phase followed by its sub-phases, in the order they were first entered.
+        """
+        def tree_order(item):
+            path = item[0]
+            return [self.stats[path[:depth]].order for depth in range(1, len(path) + 1)]
+
+        phases = [{"phase": ";".join(path), "calls": stats.calls, "wall_seconds": stats.wall,
+                   "cpu_seconds": stats.cpu, "self_seconds": max(stats.wall - stats.children_wall, 0.0),
+                   "peak_bytes": stats.peak_bytes if self.memory else None}
+                  for path, stats in sorted(self.stats.items(), key=tree_order) if stats.calls]
+        return {"wall_seconds": perf_counter() - self.started, "memory": self.memory, "phases": phases}
+
+    def collapsed(self):
+        """
+        Return the report as collapsed stacks: one line per phase, its path joined by ';' and its self time in
+        microseconds, the input format of flamegraph.pl and speedscope.
+        """
+        return "".join(f"{entry['phase']} {round(entry['self_seconds'] * 1e6)}\n"
+                       for entry in self.report()["phases"])
+
+
+def enable(memory=False):
+    """
+    This function starts recording phases, replacing any earlier recording.
+
+    Parameters
+    ----------
+    memory : bool
+        Also record the allocation peak of every phase with tracemalloc, which slows Python code down
+        several times while it runs.
+
+    Returns
+    -------
+    Profiler
+        The profiler that records the phases.
+
+    """
+    global _profiler
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _profiler = Profiler(memory)
+    return _profiler
+
+
+def current_profiler():
+    """
+    Return the profiler recording phases now, None while profiling is disabled.
+    """
+    return _profiler
+
+
+def disable():
+    """
+    Stop recording phases and return the profiler that recorded them (None if profiling was not enabled).
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None and profiler.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return profiler
+
+
+class _Phase:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.exit()
+        return False
+
+
+def phase(name):
+    """
+    Return a context manager recording the code it wraps as the phase 'name', nested under the phase running
+    now, e.g. 'with phase("parse"):'. It does nothing while profiling is disabled.
+    """
+    if _profiler is None:
+        return _DISABLED
+    return _Phase(_profiler, name)
+
+
+def profiled(name=None):
+    """
+    Return a decorator recording every call of the decorated function as the phase 'name' (the function's
+    name by default). While profiling is disabled the function is called directly.
+    """
+    def decorator(function):
+        label = name or function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return function(*args, **kwargs)
+            _profiler.enter(label)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                _profiler.exit()
+        return wrapper
+    return decorator
+
+
+def write_report(profiler, path=None):
+    """
+    This function writes the report of a profiler: as JSON to a path ending in '.json', as collapsed stacks
+    to any other path, or as a table on stderr without a path.
+
+    Returns
+    -------
+    None.
+
+    """
+    if path is None:
+        report = profiler.report()
+        print(f"{'phase':<50} {'calls':>7} {'wall s':>9} {'self s':>9} {'cpu s':>9} {'peak KiB':>9}",
+              file=sys.stderr)
+        for entry in report["phases"]:
+            peak = f"{entry['peak_bytes'] / 1024:9.1f}" if entry["peak_bytes"] is not None else f"{'-':>9}"
+            depth = entry["phase"].count(";")
+            label = "  " * depth + entry["phase"].rsplit(";", 1)[-1]
+            print(f"{label:<50} {entry['calls']:>7} {entry['wall_seconds']:9.4f} {entry['self_seconds']:9.4f} "
+                  f"{entry['cpu_seconds']:9.4f} {peak}", file=sys.stderr)
+        print(f"total wall time {report['wall_seconds']:.4f}s", file=sys.stderr)
+        return
+    with open(path, "w") as reportfile:
+        if path.endswith(".json"):
+            json.dump(profiler.report(), reportfile, indent=2)
+        else:
+            reportfile.write(profiler.collapsed())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:35:52 2026
+
+@author: A00315995
+
+# Program Name: quantiles.py
+# purpose: This program computes exact quantiles by selection instead of a full sort, supports the
+# median-of-halves quartile definition used by calculate_interquartile, and provides a bounded-memory
+# KLL sketch for approximate quantiles of feeds too large to hold in memory.
+"""
+from math import ceil, floor
+import random
+
+from backend import numpy_module
+from profiling import profiled
+
+# Quantile definitions accepted by quantiles():
+#   'linear' - interpolate between the two closest ranks, (n - 1) * p (the NumPy/Excel default)
+#   'halves' - quartiles are medians of the lower and upper halves, the median excluded for odd counts
+#              (the definition calculate_interquartile has always used). Only 0.25, 0.5 and 0.75.
+METHODS = ("linear", "halves")
+
+
+def _select_python(values, ranks):
+    """
+    Return the values at the given 0-based ranks of sorted(values) using multi-way quickselect.
+    Each partition step is done with list comprehensions, so the expected cost is O(n log m) for m ranks.
+    """
+    found = dict()
+    pending = [(list(values), 0, sorted(set(ranks)))]
+    rng = random.Random(len(values))
+    while pending:
+        items, offset, wanted = pending.pop()
+        if len(items) <= 32:
+            items.sort()
+            for rank in wanted:
+                found[rank] = items[rank - offset]
+            continue
+        sample = sorted(items[rng.randrange(len(items))] for _ in range(3))
+        pivot = sample[1]
+        lower = [value for value in items if value < pivot]
+        upper = [value for value in items if value > pivot]
+        equal_stop = offset + len(items) - len(upper)
+        lower_stop = offset + len(lower)
+        below = [rank for rank in wanted if rank < lower_stop]
+        above = [rank for rank in wanted if rank >= equal_stop]
+        for rank in wanted:
+            if lower_stop <= rank < equal_stop:
+                found[rank] = pivot
+        if below:
+            pending.append((lower, offset, below))
+        if above:
+            pending.append((upper, equal_stop, above))
+    return [found[rank] for rank in ranks]
+
+
+@profiled()
+def select(values, ranks):
+    """
+    This function returns the values that would sit at the given 0-based positions if 'values' were sorted,
+    without sorting it. NumPy's introselect (numpy.partition) is used with the NumPy backend.
+
+    Parameters
+    ----------
+    values : sequence
+        A non-empty sequence of numeric values. It is not modified.
+    ranks : list
+        0-based positions in sorted order.
+
+    Returns
+    -------
+    list
+        The value at each requested rank.
+
+    """
+    if not len(values):
+        raise ValueError("cannot select from an empty sequence")
+    np = numpy_module()
+    if np is not None:
+        partitioned = np.partition(np.asarray(values), sorted(set(ranks)))
+        return [partitioned[rank].item() for rank in ranks]
+    return _select_python(values, ranks)
+
+
+def _median_ranks(start, stop):
+    """
+    Return the rank(s) whose mean is the median of the sorted positions start..stop-1.
+    """
+    length = stop - start
+    mid_index = start + length // 2
+    return [mid_index] if length % 2 else [mid_index - 1, mid_index]
+
+
+def _halves_ranks(count, probability):
+    """
+    Return the ranks averaged for a quartile under the 'halves' definition.
+    """
+    mid_index = count // 2
+    if probability == 0.5:
+        return _median_ranks(0, count)
+    if count < 2:
+        raise ValueError("the 'halves' quartiles need at least two values")
+    if probability == 0.25:
+        return _median_ranks(0, mid_index)
+    if probability == 0.75:
+        return _median_ranks(mid_index + 1 if count % 2 else mid_index, count)
+    raise ValueError("the 'halves' method only defines the 0.25, 0.5 and 0.75 quantiles")
+
+
+def _plan(count, probabilities, method):
+    """
+    Return, for each probability, the ranks whose values give the quantile and the interpolation fraction
+    between them (None when the values are averaged, under the 'halves' method).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown quantile method '{method}', expected one of: {', '.join(METHODS)}")
+    plan = []
+    for probability in probabilities:
+        if not 0 <= probability <= 1:
+            raise ValueError(f"Quantile probability {probability} is outside [0, 1]")
+        if method == "halves":
+            ranks = _halves_ranks(count, probability)
+            plan.append((ranks, None))
+        else:
+            position = (count - 1) * probability
+            plan.append(([floor(position), ceil(position)], position - floor(position)))
+    return plan
+
+
+def _combine(plan, value_at):
+    """
+    Return the quantiles of a plan from value_at(rank), the value of each rank in sorted order.
+    """
+    results = []
+    for ranks, fraction in plan:
+        if fraction is None:
+            results.append(value_at(ranks[0]) if len(ranks) == 1 else (value_at(ranks[0]) + value_at(ranks[1])) / 2)
+        elif ranks[0] == ranks[1]:
+            results.append(value_at(ranks[0]))
+        else:
+            low, high = value_at(ranks[0]), value_at(ranks[1])
+            results.append(low + (high - low) * fraction)
+    return results
+
+
+def quantiles(data_list, probabilities, method="linear"):
+    """
+    This function computes several exact quantiles of a column with a single selection pass.
+
+    Parameters
+    ----------
+    data_list : sequence
+        A non-empty sequence of numeric values.
+    probabilities : list
+        Quantile probabilities between 0 and 1, e.g. [0.05, 0.25, 0.5, 0.75, 0.95].
+    method : str
+        One of METHODS, 'linear' by default.
+
+    Returns
+    -------
+    list
+        The quantile for each probability, in the order requested.
+
+    """
+    plan = _plan(len(data_list), probabilities, method)
+    wanted = sorted({rank for ranks, _ in plan for rank in ranks})
+    values = dict(zip(wanted, select(data_list, wanted)))
+    return _combine(plan, values.__getitem__)
+
+
+def ranked_quantiles(value_at, count, probabilities, method="linear"):
+    """
+    Return the quantiles quantiles() gives for 'count' values whose value of each rank in sorted order is
+    value_at(rank), e.g. read from merged value counts (shards.py) rather than from the values themselves.
+    """
+    return _combine(_plan(count, probabilities, method), value_at)
+
+
+def interquartile(data_list, method="halves"):
+    """
+    Return the inter-quartile range of 'data_list'. The default 'halves' method matches calculate_interquartile.
+    """
+    lower_quartile, upper_quartile = quantiles(data_list, [0.25, 0.75], method=method)
+    return upper_quartile - lower_quartile
+
+
+class KLLSketch:
+    """
+    A KLL quantile sketch: approximate quantiles of a stream in memory bounded by about 3 * k values,
+    whatever the length of the stream. The rank error is roughly 1.7 / k (about 1% with the default k).
+    Sketches built over separate chunks can be merged. The random choices are seeded, so the same input
+    always gives the same answers.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        self.compactors = [[]]
+        self._rng = random.Random(seed)
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return int(ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _size(self):
+        return sum(map(len, self.compactors))
+
+    def _compress(self):
+        while self._size() >= self._max_size:
+            for height, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(height):
+                    if height + 1 == len(self.compactors):
+                        self.compactors.append([])
+                        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+                    items.sort()
+                    keep_last = items.pop() if len(items) % 2 else None
+                    self.compactors[height + 1].extend(items[self._rng.random() < 0.5::2])
+                    self.compactors[height] = [] if keep_last is None else [keep_last]
+                    break
+
+    def update(self, value):
+        """
+        Add one value to the sketch.
+        """
+        self.count += 1
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.compactors[0].append(value)
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, data_list):
+        """
+        Add every value of 'data_list' to the sketch. Values are appended to the lowest compactor in blocks
+        that end where update() would first compact something (the lowest compactor is full and so is the
+        sketch), so the sketch is the same as after one update() per value.
+        """
+        count = len(data_list)
+        if not count:
+            return
+        low, high = min(data_list), max(data_list)
+        if self.minimum is None or low < self.minimum:
+            self.minimum = low
+        if self.maximum is None or high > self.maximum:
+            self.maximum = high
+        self.count += count
+        start = 0
+        while start < count:
+            level = self.compactors[0]
+            stop = min(start + max(self._capacity(0) - len(level), self._max_size - self._size(), 1), count)
+            level.extend(data_list[start:stop])
+            start = stop
+            if len(self.compactors[0]) >= self._capacity(0):
+                self._compress()
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one, as if its values had been added here.
+
+        Returns
+        -------
+        KLLSketch
+            This sketch, to allow chaining.
+
+        """
+        if other.count == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for height, items in enumerate(other.compactors):
+            self.compactors[height].extend(items)
+        self._max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+        self.count += other.count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self._compress()
+        return self
+
+    def quantiles(self, probabilities):
+        """
+        Return the approximate quantile for each probability, in the order requested.
+        """
+        if not self.count:
+            raise ValueError("quantiles of an empty sketch")
+        weighted = sorted((value, 2 ** height) for height, items in enumerate(self.compactors) for value in items)
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for probability in probabilities:
+            if probability <= 0:
+                results.append(self.minimum)
+                continue
+            if probability >= 1:
+                results.append(self.maximum)
+                continue
+            target = probability * total
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    results.append(value)
+                    break
+        return results
+
+    def quantile(self, probability):
+        """
+        Return the approximate quantile for one probability.
+        """
+        return self.quantiles([probability])[0]
+
+    def to_dict(self):
+        """
+        Return the state of the sketch as a JSON-serialisable dictionary.
+        """
+        return {"k": self.k, "count": self.count, "minimum": self.minimum, "maximum": self.maximum,
+                "compactors": self.compactors}
+
+    @classmethod
+    def from_dict(cls, state, seed=0):
+        """
+        Rebuild a sketch saved with to_dict().
+        """
+        sketch = cls(state["k"], seed)
+        sketch.count = state["count"]
+        sketch.minimum = state["minimum"]
+        sketch.maximum = state["maximum"]
+        sketch.compactors = [list(items) for items in state["compactors"]]
+        sketch._max_size = sum(sketch._capacity(level) for level in range(len(sketch.compactors)))
+        return sketch
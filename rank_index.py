@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:14:37 2026
+
+@author: A00315995
+
+# Program Name: rank_index.py
+# purpose: This program provides sorted rank indexes over the numerical columns of the dataset. An index is
+# built once per column (on first use, then cached on the table) and answers top-k and bottom-k lists,
+# the rank of a movie and range queries such as "every budget between 100 and 200" with binary searches
+# instead of a scan of every row.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+from backend import numpy_module
+from profiling import profiled
+from title_index import title_index
+
+
+class RankIndex:
+    """
+    A sorted permutation of one numerical column: 'order' holds the rows from the smallest to the largest
+    value (rows with equal values keep their dataset order) and 'sorted_values' the values in that order.
+
+    Ranks count from the largest value: rank 1 is the highest, and movies with equal values share a rank.
+    Rows whose value is NaN (a derived value that cannot be computed, e.g. a return on a budget of 0, see
+    derived.py) are left out of the index and have no rank.
+    """
+
+    __slots__ = ("values", "titles", "order", "sorted_values")
+
+    def __init__(self, values, titles=None):
+        self.values = values
+        self.titles = titles
+        np = numpy_module()
+        if np is not None and len(values):
+            numbers = np.asarray(values, dtype=float)
+            order = np.argsort(numbers, kind="stable")
+            # NaN values are sorted last
+            order = order[:len(order) - int(np.count_nonzero(np.isnan(numbers)))]
+            self.order = array("i", order.astype(np.int32).tobytes())
+            self.sorted_values = array("d", numbers[order].tobytes())
+        else:
+            rows = (row for row, value in enumerate(values) if value == value)
+            self.order = array("i", sorted(rows, key=values.__getitem__))
+            self.sorted_values = array("d", (values[row] for row in self.order))
+
+    def __len__(self):
+        return len(self.order)
+
+    def bottom_k(self, k):
+        """
+        Return the rows of the 'k' smallest values, smallest first.
+        """
+        return list(self.order[:max(k, 0)])
+
+    def top_k(self, k):
+        """
+        Return the rows of the 'k' largest values, largest first. Rows with equal values are listed in
+        dataset order, the same as max() would find them.
+        """
+        rows = []
+        end = len(self.order)
+        while end and len(rows) < k:
+            start = bisect_left(self.sorted_values, self.sorted_values[end - 1], 0, end)
+            rows.extend(self.order[start:end])
+            end = start
+        return rows[:max(k, 0)]
+
+    def between(self, low, high, limit=None):
+        """
+        Return the rows whose value is between 'low' and 'high' (both included), smallest first, or only
+        the first 'limit' of them.
+        """
+        start, stop = bisect_left(self.sorted_values, low), bisect_right(self.sorted_values, high)
+        if limit is not None:
+            stop = min(stop, start + max(limit, 0))
+        return list(self.order[start:stop])
+
+    def count_between(self, low, high):
+        """
+        Return the number of values between 'low' and 'high' (both included).
+        """
+        return max(bisect_right(self.sorted_values, high) - bisect_left(self.sorted_values, low), 0)
+
+    def rank_of_value(self, value):
+        """
+        Return the rank 'value' would have: one more than the number of larger values.
+        """
+        return len(self.sorted_values) - bisect_right(self.sorted_values, value) + 1
+
+    def rank_of_row(self, row):
+        """
+        Return the rank of the movie in row 'row', None if its value is NaN.
+        """
+        value = self.values[row]
+        return self.rank_of_value(value) if value == value else None
+
+    def fractional_ranks(self):
+        """
+        Return the rank of every row counted from the smallest value (1 is the lowest), with equal values
+        sharing the mean of their ranks, as Spearman's rank correlation uses them.
+
+        Returns
+        -------
+        array
+            array('d') of ranks aligned with the rows, NaN for the rows left out of the index.
+
+        """
+        count = len(self.order)
+        np = numpy_module()
+        if np is not None and count:
+            sorted_values = np.frombuffer(self.sorted_values, dtype=np.float64)
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_values)) + 1))
+            ends = np.append(starts[1:], count)
+            ranks = np.full(len(self.values), np.nan)
+            ranks[np.frombuffer(self.order, dtype=np.int32)] = np.repeat((starts + ends + 1) / 2, ends - starts)
+            return array("d", ranks.tobytes())
+        ranks = array("d", [float("nan")]) * len(self.values)
+        start = 0
+        while start < count:
+            end = bisect_right(self.sorted_values, self.sorted_values[start], start)
+            for row in self.order[start:end]:
+                ranks[row] = (start + end + 1) / 2
+            start = end
+        return ranks
+
+    def entries(self, rows):
+        """
+        Return the rank, title and value of each row as dictionaries, ready to be printed or written as JSON.
+        """
+        return [{"rank": self.rank_of_row(row), "title": self.titles[row] if self.titles is not None else None,
+                 "value": self.values[row]} for row in rows]
+
+
+@profiled()
+def rank_index(table, column):
+    """
+    This function returns the RankIndex of a numerical column of the table. The index is built the first
+    time it is requested and kept in table.indexes, so every later query only costs binary searches.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The dataset, or any mapping of column names to aligned sequences (which is then not cached, and
+        lists no titles if it has no 'title' column).
+    column : str
+        The name of a numerical column.
+
+    Returns
+    -------
+    RankIndex
+        The index of the column.
+
+    """
+    indexes = getattr(table, "indexes", None)
+    key = ("rank", column)
+    if indexes is not None and key in indexes:
+        return indexes[key]
+    try:
+        titles = table["title"]
+    except KeyError:
+        titles = None
+    index = RankIndex(table[column], titles)
+    if indexes is not None:
+        indexes[key] = index
+    return index
+
+
+def row_of_title(table, title):
+    """
+    This function returns the first row of the movie called 'title', ignoring case and spaces (several
+    titles in dataset.csv end with a space), from the title index of title_index.py.
+
+    Raises
+    ------
+    ValueError
+        If no movie has that title.
+
+    """
+    rows = title_index(table).exact(title)
+    if not rows:
+        raise ValueError(f"No movie called '{title.strip()}' in the dataset")
+    return rows[0]
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:02:55 2026
+
+@author: A00315995
+
+# Program Name: render.py
+# purpose: This program renders the visualisations to PNG, SVG or PDF files without a display. Figures are
+# drawn on matplotlib Figure objects (no pyplot, no interactive backend) and independent figures are rendered
+# in parallel in a process pool, whose workers receive the loaded table once and save each figure in every
+# requested format. A manifest with the files and per-figure timings is written alongside them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import json
+import os
+from time import perf_counter
+
+from backend import get_backend, set_backend
+from charts import CHARTS
+from profiling import current_profiler, disable, enable, phase
+from shards import load_source
+from table import DATASET
+from views import filter_table
+
+FORMATS = ("png", "svg", "pdf")
+MANIFEST = "manifest.json"
+
+# The table drawn from in a worker process and whether its phases are recorded (the tracemalloc flag of the
+# parent's profiler, None while not profiling), set once per worker by _start_worker()
+_worker_table = None
+_worker_profile = None
+
+
+def render_bytes(table, name, output_format="png", dpi=100):
+    """
+    This function draws one chart from a loaded table and returns the saved file as bytes, without writing it.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    name : str
+        The name of the chart in charts.CHARTS.
+    output_format : str
+        One of FORMATS.
+    dpi : int
+        The resolution of PNG files.
+
+    Returns
+    -------
+    bytes
+        The contents of the file.
+
+    """
+    with phase(f"chart.{name}"):
+        figure, _, _ = _draw(CHARTS[name], table)
+        with phase("rasterise"):
+            buffer = BytesIO()
+            figure.savefig(buffer, format=output_format, dpi=dpi)
+    return buffer.getvalue()
+
+
+def _draw(chart, table):
+    """
+    Compute the data of a chart of charts.CHARTS from the table and draw it on a new figure, in the 'data' and
+    'draw' phases. Return the figure and the seconds spent on each step.
+    """
+    from matplotlib.figure import Figure
+
+    start = perf_counter()
+    with phase("data"):
+        data = chart.data(table)
+    computed = perf_counter()
+    with phase("draw"):
+        figure = Figure(figsize=chart.figsize)
+        chart.draw(figure.subplots(), *data)
+    return figure, computed - start, perf_counter() - computed
+
+
+def _start_worker(table, profile_memory, backend):
+    """
+    Keep the table in the worker process, so that it is sent to each worker once, not with every chart, and
+    record the phases of the worker when the parent process is profiling ('profile_memory' not None).
+    """
+    global _worker_table, _worker_profile
+    _worker_table = table
+    _worker_profile = profile_memory
+    set_backend(backend)
+    if profile_memory is not None:
+        enable(profile_memory)
+
+
+def _render_in_worker(name, output_dir, formats, dpi):
+    """
+    Render one chart in a worker process and return its manifest entries with the phases recorded since the
+    previous chart of the worker (None when the parent process is not profiling).
+    """
+    entries = render_chart(_worker_table, name, output_dir, formats, dpi)
+    if _worker_profile is None:
+        return entries, None
+    profiler = disable()
+    enable(_worker_profile)
+    return entries, profiler
+
+
+def render_chart(table, name, output_dir, formats=("png",), dpi=100):
+    """
+    This function renders one chart to a file in each of 'formats': its data are computed and the figure is
+    drawn once, then saved once per format.
+
+    Parameters
+    ----------
+    table : MovieTable or TableView
+        The dataset, or the movies selected from it.
+    name : str
+        The name of the chart in charts.CHARTS.
+    output_dir : str
+        The directory to write the files to.
+    formats : tuple
+        Formats from FORMATS.
+    dpi : int
+        The resolution of PNG files.
+
+    Returns
+    -------
+    list
+        The manifest entry of each file: file, format, size in bytes and the time spent computing the data and
+        drawing the figure (shared by the formats of the chart) and saving the file.
+
+    """
+    entries = []
+    with phase(f"chart.{name}"):
+        figure, data_seconds, draw_seconds = _draw(CHARTS[name], table)
+        for output_format in formats:
+            path = os.path.join(output_dir, f"{name}.{output_format}")
+            start = perf_counter()
+            with phase("rasterise"):
+                figure.savefig(path, format=output_format, dpi=dpi)
+            save_seconds = perf_counter() - start
+            entries.append({"chart": name, "file": path, "format": output_format, "bytes": os.path.getsize(path),
+                            "data_seconds": data_seconds, "draw_seconds": draw_seconds, "save_seconds": save_seconds,
+                            "total_seconds": data_seconds + draw_seconds + save_seconds})
+    return entries
+
+
+def check_charts(names, formats):
+    """
+    Check chart names and formats before anything is loaded or drawn, and return the names (all of
+    charts.CHARTS if 'names' is empty).
+
+    Raises
+    ------
+    ValueError
+        If a chart or a format is unknown.
+
+    """
+    names = list(CHARTS) if not names else list(names)
+    unknown = [name for name in names if name not in CHARTS]
+    if unknown:
+        raise ValueError(f"Unknown chart(s) {', '.join(unknown)}, expected: {', '.join(CHARTS)}")
+    unknown = [output_format for output_format in formats if output_format not in FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown format(s) {', '.join(unknown)}, expected: {', '.join(FORMATS)}")
+    return names
+
+
+def render_all(dataset=DATASET, output_dir="charts", names=None, formats=("png",), workers=None, dpi=100,
+               where=(), table=None):
+    """
+    This function renders the requested charts in every requested format and writes a manifest.
+
+    Parameters
+    ----------
+    dataset : str
+        The path of the dataset CSV file, or a directory or glob of shard files (see shards.py).
+    output_dir : str
+        The directory to write the files to; it is created if needed.
+    names : list, optional
+        Names from charts.CHARTS, all charts by default.
+    formats : tuple
+        Formats from FORMATS.
+    workers : int, optional
+        The number of worker processes, os.cpu_count() by default. With 1 every chart is rendered in
+        this process; otherwise the table is sent once to each worker, which renders every format of a chart.
+    dpi : int
+        The resolution of PNG files.
+    where : tuple
+        (column, operator, value) conditions selecting the movies the charts are drawn from.
+    table : MovieTable or TableView, optional
+        The dataset already loaded from 'dataset' and filtered by 'where' (e.g. by the command line), which is
+        then not loaded again.
+
+    Returns
+    -------
+    dict
+        The manifest: the rendered files with their timings and the total wall time. While profiling, the
+        phases of the workers are added to the profile under the phase running now; they overlap in time.
+
+    """
+    names = check_charts(names, formats)
+    os.makedirs(output_dir, exist_ok=True)
+    start = perf_counter()
+    if table is None:
+        with phase("load"):
+            table = load_source(dataset)
+            if where:
+                table = filter_table(table, where)
+    formats = tuple(formats)
+    if workers == 1:
+        entries = [entry for name in names for entry in render_chart(table, name, output_dir, formats, dpi)]
+    else:
+        profiler = current_profiler()
+        entries = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                 initargs=(table, profiler.memory if profiler else None, get_backend())) as pool:
+            jobs = [pool.submit(_render_in_worker, name, output_dir, formats, dpi) for name in names]
+            for job in jobs:
+                chart_entries, worker_profiler = job.result()
+                entries.extend(chart_entries)
+                if profiler is not None and worker_profiler is not None:
+                    profiler.merge(worker_profiler)
+    manifest = {"dataset": dataset, "where": [list(condition) for condition in where], "charts": entries,
+                "wall_seconds": perf_counter() - start, "workers": workers or os.cpu_count()}
+    with open(os.path.join(output_dir, MANIFEST), "w") as manifestfile:
+        json.dump(manifest, manifestfile, indent=2)
+    return manifest
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 16:21:08 2026
+
+@author: A00315995
+
+# Program Name: shards.py
+# purpose: This program analyses a dataset split over many CSV files ("shards", e.g. one per year or region)
+# given as a directory or a glob pattern. Each shard is summarised in parallel into mergeable partial
+# results, and the partials are merged in shard order into the statistics describe() and group_by() give
+# for the whole data. The summary of each shard is cached next to it with the shard's fingerprint, so
+# only the shards that changed are read again.
+"""
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from glob import glob
+from itertools import accumulate
+import json
+from math import fsum
+import os
+
+from cache import fingerprint, is_fresh, load_cached
+from correlation import CovarianceMatrix
+from describe import Description, summary_from_parts
+from frequency import FrequencyTable
+from groupby import group_by
+from ingest import QUARANTINE_SUFFIX
+from online import Moments, add_exact, exact_partials
+from quantiles import KLLSketch, ranked_quantiles
+from table import NUMERIC_COLUMNS, PARSER_VERSION, MovieTable
+
+SUMMARY_SUFFIX = ".summary.json"
+# Columns that also get a bounded-memory KLL sketch for approximate quantiles
+SKETCH_COLUMNS = ("budget", "worldwide_gross")
+# Columns whose exact value counts are kept by default, for their mode, median and quartiles
+EXACT_COLUMNS = ("budget", "worldwide_gross")
+
+
+def is_sharded(source):
+    """
+    Return True if 'source' names several dataset files: a directory or a glob pattern.
+    """
+    return os.path.isdir(source) or any(character in source for character in "*?[")
+
+
+def shard_paths(source):
+    """
+    This function lists the shards of a sharded dataset, in the order they are merged (by file name).
+
+    Parameters
+    ----------
+    source : str
+        A directory, whose *.csv files are the shards, or a glob pattern such as 'data/2019-*.csv'.
+        Quarantine files written by ingest.py are skipped.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no file matches.
+
+    Returns
+    -------
+    list
+        The paths of the shards.
+
+    """
+    pattern = os.path.join(source, "*.csv") if os.path.isdir(source) else source
+    paths = sorted(path for path in glob(pattern) if not path.endswith(QUARANTINE_SUFFIX))
+    if not paths:
+        raise FileNotFoundError(f"No dataset files match '{source}'")
+    return paths
+
+
+def load_source(source):
+    """
+    This function loads a single dataset file, or every shard of a sharded dataset appended in shard order,
+    into one MovieTable. Each shard is read through its own binary cache (see cache.py).
+    """
+    if not is_sharded(source):
+        return load_cached(source)
+    table = MovieTable()
+    for path in shard_paths(source):
+        table.extend(load_cached(path))
+    table.compact()
+    return table
+
+
+class ShardSummary:
+    """
+    Mergeable partial results of the rows of one or more shards:
+
+    - for each numerical column its moments (online.Moments, with the exact partial sums of the values) and the
+      first rows holding its minimum and maximum, with their titles
+    - for each of 'exact_columns' only, the exact count of each value (a FrequencyTable, which gives the exact
+      mode, median and quartiles); it grows with the number of distinct values, unlike the rest of the summary
+    - a KLLSketch of each of SKETCH_COLUMNS, for approximate quantiles in bounded memory
+    - the co-moments of every pair of numerical columns (a correlation.CovarianceMatrix), for their correlations
+    - the number of movies and the exact partial sums of the worldwide gross of each decade, in order of first
+      occurrence
+
+    Merging the summaries of shards in shard order gives the summary of the shards appended in that order.
+    """
+
+    def __init__(self, exact_columns=EXACT_COLUMNS):
+        self.rows = 0
+        self.moments = {name: Moments() for name in NUMERIC_COLUMNS}
+        self.frequencies = {name: FrequencyTable() for name in exact_columns}
+        self.sketches = {name: KLLSketch() for name in SKETCH_COLUMNS}
+        # name -> [argmin, argmax, min_title, max_title]
+        self.extremes = {name: [None, None, None, None] for name in NUMERIC_COLUMNS}
+        self.covariance = CovarianceMatrix(NUMERIC_COLUMNS)
+        self.decade_counts = dict()
+        self.decade_sums = dict()
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def decade_totals(self):
+        """
+        The total worldwide gross of each decade, math.fsum of its values as group_by() sums them.
+        """
+        return {decade: fsum(partials) for decade, partials in self.decade_sums.items()}
+
+    @classmethod
+    def from_table(cls, table, exact_columns=EXACT_COLUMNS):
+        """
+        Return the summary of every row of a MovieTable.
+        """
+        summary = cls(exact_columns)
+        summary.rows = len(table)
+        if not summary.rows:
+            return summary
+        titles = table["title"]
+        for name in NUMERIC_COLUMNS:
+            values = table[name]
+            moments = summary.moments[name] = Moments.from_values(values)
+            if name in summary.frequencies:
+                summary.frequencies[name].update(values)
+            if name in summary.sketches:
+                summary.sketches[name].extend(values)
+            argmin, argmax = values.index(moments.minimum), values.index(moments.maximum)
+            summary.extremes[name] = [argmin, argmax, titles[argmin], titles[argmax]]
+        summary.covariance.update(table)
+        decades = group_by(table, "decade", {"worldwide_gross": ["values"]})
+        summary.decade_counts = dict(decades.counts)
+        summary.decade_sums = {decade: exact_partials(values)
+                               for decade, values in decades.measure("worldwide_gross", "values").items()}
+        return summary
+
+    def merge(self, other):
+        """
+        Merge the summary of the rows that follow this summary's rows (e.g. the next shard) into this one.
+        Only the value counts of the columns both summaries count are kept.
+
+        Returns
+        -------
+        ShardSummary
+            This summary, to allow chaining.
+
+        """
+        if not other.rows:
+            return self
+        self.frequencies = {name: frequencies for name, frequencies in self.frequencies.items()
+                            if name in other.frequencies}
+        self.covariance.merge(other.covariance)
+        for name in NUMERIC_COLUMNS:
+            mine, theirs = self.moments[name], other.moments[name]
+            argmin, argmax, min_title, max_title = other.extremes[name]
+            extremes = self.extremes[name]
+            # equal values keep the earlier row, the first occurrence in the appended data
+            if not self.rows or theirs.minimum < mine.minimum:
+                extremes[0], extremes[2] = argmin + self.rows, min_title
+            if not self.rows or theirs.maximum > mine.maximum:
+                extremes[1], extremes[3] = argmax + self.rows, max_title
+            mine.merge(theirs)
+            if name in self.frequencies:
+                self.frequencies[name].merge(other.frequencies[name])
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+        for decade, count in other.decade_counts.items():
+            self.decade_counts[decade] = self.decade_counts.get(decade, 0) + count
+            partials = self.decade_sums.setdefault(decade, [])
+            for value in other.decade_sums[decade]:
+                add_exact(partials, value)
+        self.rows += other.rows
+        return self
+
+    def _value_at(self, name):
+        """
+        Return a function giving the value of a rank (from 0) in the sorted values of column 'name'.
+
+        Raises
+        ------
+        ValueError
+            If the summary does not count the values of the column (it is not one of its exact columns).
+
+        """
+        if name not in self.frequencies:
+            raise ValueError(f"The shard summaries keep the value counts of {', '.join(self.frequencies)} only, "
+                             f"not of '{name}'")
+        counts = self.frequencies[name].counts
+        values = sorted(counts)
+        cumulative = list(accumulate(counts[value] for value in values))
+        return lambda rank: values[bisect_right(cumulative, rank)]
+
+    def describe(self, columns=NUMERIC_COLUMNS, correlate=None):
+        """
+        Return the statistics describe() computes for the same rows, for the numerical 'columns' (exact
+        columns of the summary) and the correlation of the 'correlate' pair of columns.
+        """
+        summaries = dict()
+        for name in columns:
+            moments = self.moments[name]
+            argmin, argmax, min_title, max_title = self.extremes[name]
+            value_at = self._value_at(name)
+            summaries[name] = summary_from_parts(moments.count, moments.total, moments.m2,
+                                                 self.frequencies[name].mode(), value_at,
+                                                 (moments.minimum, argmin, min_title),
+                                                 (moments.maximum, argmax, max_title))
+        return Description(summaries, self.correlation(*correlate) if correlate is not None else None)
+
+    def correlation(self, x_name, y_name):
+        """
+        Return the correlation of two numerical columns rounded to two decimal places, or None if either
+        column is constant.
+        """
+        correlation = self.covariance.pearson(x_name, y_name)
+        return round(correlation, 2) if correlation is not None else None
+
+    def quantiles(self, name, probabilities, method="linear", exact=True):
+        """
+        Return quantiles of column 'name': exact ones from the value counts, the values quantiles() gives
+        with the same 'method' for the rows of every shard, or approximate ones from the KLL sketch of the
+        column (one of SKETCH_COLUMNS) with 'exact' False.
+        """
+        if not exact:
+            return self.sketches[name].quantiles(probabilities)
+        return ranked_quantiles(self._value_at(name), self.rows, probabilities, method)
+
+    def to_dict(self):
+        """
+        Return the summary as a JSON-serialisable dictionary.
+        """
+        return {"rows": self.rows,
+                "moments": {name: moments.to_dict() for name, moments in self.moments.items()},
+                "frequencies": {name: list(table.counts.items()) for name, table in self.frequencies.items()},
+                "sketches": {name: sketch.to_dict() for name, sketch in self.sketches.items()},
+                "extremes": self.extremes,
+                "covariance": self.covariance.to_dict(),
+                "decade_counts": self.decade_counts, "decade_sums": self.decade_sums}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Rebuild a summary from to_dict() output.
+        """
+        summary = cls(state["frequencies"])
+        summary.rows = state["rows"]
+        summary.moments = {name: Moments.from_dict(moments) for name, moments in state["moments"].items()}
+        for name, counts in state["frequencies"].items():
+            summary.frequencies[name].counts = dict((value, count) for value, count in counts)
+        summary.sketches = {name: KLLSketch.from_dict(sketch) for name, sketch in state["sketches"].items()}
+        summary.extremes = state["extremes"]
+        summary.covariance = CovarianceMatrix.from_dict(state["covariance"])
+        summary.decade_counts = state["decade_counts"]
+        summary.decade_sums = state["decade_sums"]
+        return summary
+
+
+def summary_path_for(path):
+    """
+    Return the path of the cached summary of the shard at 'path'.
+    """
+    return path + SUMMARY_SUFFIX
+
+
+def read_summary(path, exact_columns=EXACT_COLUMNS):
+    """
+    Return the cached summary of the shard at 'path', or None if there is none, the shard has changed, the
+    summary was made from a table of another parser version or it does not count the values of every one of
+    'exact_columns'.
+    """
+    try:
+        with open(summary_path_for(path)) as summaryfile:
+            state = json.load(summaryfile)
+        if (state.get("parser") == PARSER_VERSION and is_fresh(state["fingerprint"], path)
+                and set(exact_columns) <= set(state["summary"]["frequencies"])):
+            return ShardSummary.from_dict(state["summary"])
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def summarise_shard(path, exact_columns=EXACT_COLUMNS):
+    """
+    This function summarises one shard, from its cached summary when the shard has not changed, and
+    otherwise from the shard's rows, caching the new summary. It is the job of one worker process.
+
+    Returns
+    -------
+    ShardSummary
+        The summary of the shard.
+
+    """
+    summary = read_summary(path, exact_columns)
+    if summary is not None:
+        return summary
+    shard_fingerprint = fingerprint(path)
+    summary = ShardSummary.from_table(load_cached(path), exact_columns)
+    try:
+        with open(summary_path_for(path), "w") as summaryfile:
+            json.dump({"fingerprint": shard_fingerprint, "parser": PARSER_VERSION, "summary": summary.to_dict()},
+                      summaryfile)
+    except OSError:
+        pass
+    return summary
+
+
+def summarise_shards(source, workers=None, exact_columns=EXACT_COLUMNS):
+    """
+    This function summarises every shard of a sharded dataset in parallel and merges the summaries.
+
+    The merged statistics are those of one file holding every shard in order: counts, minima and maxima with
+    their titles, modes, medians and quartiles come from exact value counts, and sums and means are math.fsum
+    of the exact partial sums of the shards, as describe() and group_by() sum the values of one file.
+
+    Parameters
+    ----------
+    source : str
+        A directory or a glob pattern, see shard_paths().
+    workers : int, optional
+        The number of worker processes, os.cpu_count() by default. With 1, or when at most one shard has
+        changed since its summary was cached, every shard is summarised in this process.
+    exact_columns : sequence
+        The numerical columns whose values are counted, for their mode, median and quartiles. Cached summaries
+        without the counts of one of them are summarised again.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no file matches 'source'.
+
+    Returns
+    -------
+    ShardSummary
+        The summary of the whole dataset.
+
+    """
+    paths = shard_paths(source)
+    exact_columns = tuple(exact_columns)
+    summaries = [read_summary(path, exact_columns) for path in paths]
+    stale = [path for path, summary in zip(paths, summaries) if summary is None]
+    if workers == 1 or len(stale) <= 1:
+        fresh = [summarise_shard(path, exact_columns) for path in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = list(pool.map(partial(summarise_shard, exact_columns=exact_columns), stale))
+    fresh = iter(fresh)
+    merged = ShardSummary(exact_columns)
+    for summary in summaries:
+        merged.merge(summary if summary is not None else next(fresh))
+    return merged
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:31 2026
+
+@author: A00315995
+
+# Program Name: table.py
+# purpose: This program provides a columnar, array-backed table that holds every column of the movie dataset
+# in typed contiguous storage, with the decade and title columns dictionary-encoded. Rows are parsed with
+# the csv module, so quoted fields (e.g. a title containing a comma) keep their columns. A movie is read as
+# a Movie, a view of one row that copies none of its values.
+"""
+from array import array
+from collections import namedtuple
+import csv
+from itertools import repeat
+import operator
+import sys
+
+from backend import numpy_module
+from derived import DERIVED_COLUMNS, derived_column
+
+DATASET = "dataset.csv"
+
+# (column name, storage) in the order the columns appear in dataset.csv.
+# 'category' columns are dictionary-encoded, the others are array typecodes.
+COLUMNS = (
+    ("decade", "category"),
+    ("title", "category"),
+    ("budget", "d"),
+    ("worldwide_gross", "d"),
+    ("budget_recovered", "d"),
+    ("domestic_gross", "d"),
+    ("domestic_pct", "d"),
+    ("international_gross", "d"),
+    ("international_pct", "d"),
+    ("year", "i"),
+)
+
+NUMERIC_COLUMNS = tuple(name for name, storage in COLUMNS if storage != "category")
+
+# Incremented whenever parsing changes the table a CSV file gives (2: quote-aware csv parsing, rejected rows
+# quarantined), so that results cached from tables of an earlier parser are computed again
+PARSER_VERSION = 2
+
+# A row that could not be converted: its line number in the file, why, and its fields
+Reject = namedtuple("Reject", ("line", "reason", "fields"))
+
+
+def _conversion_error(fields):
+    """
+    Return the reason a row failed to convert, naming the first column that cannot be converted.
+    """
+    for field, (name, storage) in zip(fields, COLUMNS):
+        try:
+            if storage != "category":
+                (float if storage == "d" else int)(field)
+        except ValueError:
+            return f"{name}: cannot convert {field!r}"
+    return "cannot convert row"
+
+
+class CategoryColumn:
+    """
+    A dictionary-encoded column of strings. Every distinct value is stored once in 'categories'
+    and each row only holds an integer code into it. The value-to-code lookup is built on first use.
+    """
+
+    __slots__ = ("codes", "categories", "_lookup")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.categories = []
+        self._lookup = dict()
+
+    @classmethod
+    def from_codes(cls, codes, categories):
+        """
+        Build a column from an array of codes and the list of categories they index.
+        """
+        column = cls()
+        column.codes = codes
+        column.categories = categories
+        column._lookup = None
+        return column
+
+    def lookup(self):
+        """
+        Return the dictionary mapping each category to its code.
+        """
+        if self._lookup is None:
+            self._lookup = {value: code for code, value in enumerate(self.categories)}
+        return self._lookup
+
+    def append(self, value):
+        """
+        Append a value to the column, adding it to the categories if it has not been seen before.
+
+        Parameters
+        ----------
+        value : str
+            The value to append.
+
+        Returns
+        -------
+        None.
+
+        """
+        code = self.lookup().get(value)
+        if code is None:
+            code = len(self.categories)
+            self._lookup[value] = code
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def extend(self, other):
+        """
+        Append every row of another CategoryColumn, translating its codes into codes of this column.
+
+        Parameters
+        ----------
+        other : CategoryColumn
+            The column to append.
+
+        Returns
+        -------
+        None.
+
+        """
+        lookup = self.lookup()
+        mapping = array("i")
+        for value in other.categories:
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.categories)
+                self.categories.append(value)
+            mapping.append(code)
+        np = numpy_module()
+        if np is not None and len(other.codes):
+            codes = np.frombuffer(mapping, dtype=np.int32)[np.frombuffer(other.codes, dtype=np.int32)]
+            self.codes.frombytes(codes.tobytes())
+        else:
+            self.codes.extend(mapping[code] for code in other.codes)
+
+    def compact(self):
+        """
+        Drop the value-to-code lookup dictionary, which is only needed while values are appended or looked up.
+        It is rebuilt on first use.
+        """
+        self._lookup = None
+
+    def code_of(self, value):
+        """
+        Return the code of a category, or -1 if the value does not occur in the column.
+        """
+        return self.lookup().get(value, -1)
+
+    def index(self, value):
+        """
+        Return the position of the first row holding 'value', the same as list.index().
+        """
+        code = self.lookup().get(value)
+        if code is None:
+            raise ValueError(f"{value!r} is not in column")
+        return self.codes.index(code)
+
+    def count(self, value):
+        """
+        Return the number of rows holding 'value', the same as list.count().
+        """
+        code = self.lookup().get(value)
+        return 0 if code is None else self.codes.count(code)
+
+    def nbytes(self):
+        """
+        Return the approximate number of bytes used by the codes, the distinct strings and the lookup dictionary.
+        """
+        return (self.codes.itemsize * len(self.codes)
+                + sum(sys.getsizeof(value) for value in self.categories)
+                + sys.getsizeof(self.categories) + sys.getsizeof(self._lookup or {}))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.categories[code] for code in self.codes[index]]
+        return self.categories[self.codes[index]]
+
+    def __iter__(self):
+        categories = self.categories
+        return (categories[code] for code in self.codes)
+
+    def __reduce__(self):
+        # the lookup dictionary is rebuilt on demand rather than pickled (e.g. back from an ingest worker)
+        return CategoryColumn.from_codes, (self.codes, self.categories)
+
+
+class Movie:
+    """
+    A view of one movie of a MovieTable. It only holds the table and the row number, in __slots__ so that it
+    has no per-instance dictionary, and reads each column from the table when it is accessed, as movie.budget
+    or movie["budget"]. No value is copied: the decade of every movie is the one string the dictionary-encoded
+    decade column stores for it.
+    """
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, name):
+        return self.table.column(name)[self.row]
+
+    def keys(self):
+        """
+        Return the column names, so that dict(movie) gives the same dictionary as MovieTable.record.
+        """
+        return self.table.columns.keys()
+
+    def __eq__(self, other):
+        return isinstance(other, Movie) and self.table is other.table and self.row == other.row
+
+    def __hash__(self):
+        return hash((id(self.table), self.row))
+
+    def __repr__(self):
+        return f"Movie(row={self.row}, title={self.title!r}, year={self.year})"
+
+
+def _column_property(name):
+    """
+    Return the read-only attribute of Movie that reads the column 'name' of its row.
+    """
+    return property(lambda movie: movie.table.columns[name][movie.row], doc=f"The {name} column of the movie.")
+
+
+for _name, _ in COLUMNS:
+    setattr(Movie, _name, _column_property(_name))
+del _name, _
+
+
+class MovieTable:
+    """
+    A columnar table holding all ten columns of the dataset. Numerical columns are 'array' objects of
+    floats ('d') or integers ('i'), which every calculate_* function in main.py accepts like a list.
+    Columns are read with table["budget"] or table.column("budget"), and movies with table[row] or
+    table.movie(row), or by iterating over the table, as Movie views. The derived columns of derived.py
+    (e.g. table["roi"]) are read the same way.
+
+    'indexes' caches structures built from the columns on first use (e.g. the sorted rank indexes of
+    rank_index.py); it is emptied whenever a row is appended, because they would no longer match the columns.
+    """
+
+    def __init__(self):
+        self.columns = {name: CategoryColumn() if storage == "category" else array(storage)
+                        for name, storage in COLUMNS}
+        self.indexes = dict()
+
+    def append_row(self, fields):
+        """
+        Parse one row of raw CSV fields and append it to the table. Nothing is appended if any
+        field fails to convert.
+
+        Parameters
+        ----------
+        fields : list
+            The ten string fields of a dataset row.
+
+        Raises
+        ------
+        ValueError
+            If a numerical field cannot be converted or the row has too few fields; the message names
+            the column.
+
+        Returns
+        -------
+        None.
+
+        """
+        if len(fields) < len(COLUMNS):
+            raise ValueError(f"expected {len(COLUMNS)} fields, got {len(fields)}")
+        try:
+            values = [field if storage == "category" else (float(field) if storage == "d" else int(field))
+                      for field, (_, storage) in zip(fields, COLUMNS)]
+        except ValueError:
+            raise ValueError(_conversion_error(fields)) from None
+        for (name, _), value in zip(COLUMNS, values):
+            self.columns[name].append(value)
+        if self.indexes:
+            self.indexes.clear()
+
+    def extend(self, other):
+        """
+        Append every row of another MovieTable, e.g. one parsed from another chunk of the same file.
+
+        Parameters
+        ----------
+        other : MovieTable
+            The table to append.
+
+        Returns
+        -------
+        None.
+
+        """
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+        if self.indexes:
+            self.indexes.clear()
+
+    def compact(self):
+        """
+        Drop the lookup dictionaries of the category columns once the table is loaded (see CategoryColumn.compact);
+        the one of the titles holds an entry for nearly every movie.
+        """
+        for column in self.columns.values():
+            if isinstance(column, CategoryColumn):
+                column.compact()
+
+    def column(self, name):
+        """
+        Return the column called 'name': a stored column, or a derived column of derived.DERIVED_COLUMNS
+        (e.g. 'roi'), computed on first use and kept in 'indexes'.
+        """
+        try:
+            return self.columns[name]
+        except KeyError:
+            if name in DERIVED_COLUMNS:
+                return derived_column(self, name)
+            raise KeyError(f"Unknown column '{name}', expected one of: "
+                           f"{', '.join(list(self.columns) + list(DERIVED_COLUMNS))}") from None
+
+    def movie(self, row):
+        """
+        Return the Movie view of row 'row'; negative rows count from the end like list indexes.
+        """
+        count = len(self)
+        row = operator.index(row)
+        if not -count <= row < count:
+            raise IndexError(f"row {row} out of range for a table of {count} movies")
+        return Movie(self, row % count)
+
+    def __getitem__(self, key):
+        return self.column(key) if isinstance(key, str) else self.movie(key)
+
+    def __iter__(self):
+        return map(Movie, repeat(self), range(len(self)))
+
+    def record(self, row):
+        """
+        Return every column of the movie in row 'row' as a dictionary with the column names as keys.
+        """
+        return {name: column[row] for name, column in self.columns.items()}
+
+    def __len__(self):
+        return len(self.columns["year"])
+
+    def memory_report(self):
+        """
+        Compute the number of bytes used by each column.
+
+        Returns
+        -------
+        dict
+            A dictionary with column names as keys and their size in bytes as values.
+
+        """
+        return {name: column.nbytes() if isinstance(column, CategoryColumn) else column.itemsize * len(column)
+                for name, column in self.columns.items()}
+
+    def memory_per_row(self):
+        """
+        Compute the average number of bytes used to store one movie across all columns.
+
+        Returns
+        -------
+        float
+            Bytes per row, or 0.0 for an empty table.
+
+        """
+        if not len(self):
+            return 0.0
+        return sum(self.memory_report().values()) / len(self)
+
+
+def parse_records(lines, first_line=2):
+    """
+    This function parses CSV records (without the header) into a MovieTable with the quote-aware csv module.
+    Blank lines are ignored and rows that cannot be converted are returned rather than appended.
+
+    Parameters
+    ----------
+    lines : iterable
+        Lines of text, e.g. an open file positioned after the header.
+    first_line : int
+        The line number of the first of 'lines' in the file, for the rejected rows.
+
+    Returns
+    -------
+    tuple
+        The MovieTable and the list of Reject rows.
+
+    """
+    table = MovieTable()
+    rejects = []
+    reader = csv.reader(lines)
+    line = first_line
+    for fields in reader:
+        if fields:
+            try:
+                table.append_row(fields)
+            except ValueError as error:
+                rejects.append(Reject(line, str(error), fields))
+        line = first_line + reader.line_num
+    return table, rejects
+
+
+def summarise_rejects(rejects, quarantine=None):
+    """
+    Return a one-line summary of the rejected rows, naming the file they were written to if any.
+    """
+    first = rejects[0]
+    summary = f"Skipped {len(rejects)} row(s) that could not be converted (first at line {first.line}: {first.reason})"
+    return f"{summary}, see {quarantine}" if quarantine else summary
+
+
+def load_table(path=DATASET):
+    """
+    This function reads the dataset file at 'path' into a MovieTable, keeping all ten columns.
+    Rows that cannot be converted are skipped and counted in one summary line.
+    See ingest.py for large files (parsed in parallel) and for keeping the rejected rows.
+
+    Parameters
+    ----------
+    path : str
+        The path of the dataset CSV file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the dataset file does not exist.
+
+    Returns
+    -------
+    MovieTable
+        The loaded table.
+
+    """
+    with open(path, encoding="utf-8-sig", newline="") as datafile:
+        _ = datafile.readline()
+        table, rejects = parse_records(datafile)
+    table.compact()
+    if rejects:
+        print(summarise_rejects(rejects), file=sys.stderr)
+    return table
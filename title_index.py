@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:38:02 2026
+
+@author: A00315995
+
+# Program Name: title_index.py
+# purpose: This program provides a search index over the movie titles. Titles are normalised (case and
+# whitespace, e.g. the trailing space of "Paranormal Activity ") and kept sorted, so exact and prefix lookups
+# are binary searches; typo-tolerant lookups use an inverted index of character trigrams that is built
+# the first time it is needed.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+import heapq
+
+from backend import numpy_module
+from profiling import profiled
+
+MODES = ("auto", "exact", "prefix", "fuzzy")
+# Fuzzy matches must share at least this fraction of their trigrams with the query (Jaccard similarity)
+FUZZY_THRESHOLD = 0.3
+# Fuzzy lookups read the posting lists of the FUZZY_LISTS rarest query trigrams and score the
+# limit * FUZZY_CANDIDATES titles found in most of them
+FUZZY_LISTS = 8
+FUZZY_CANDIDATES = 4
+# Sorts after every character, so bisecting for prefix + PREFIX_END finds the end of the prefix range
+PREFIX_END = "\U0010ffff"
+
+
+def normalise_title(title):
+    """
+    Return 'title' in lower case (casefold) with runs of whitespace collapsed and no surrounding spaces.
+    """
+    return " ".join(title.split()).casefold()
+
+
+def trigrams(name):
+    """
+    Return the set of three-character substrings of a normalised title, padded so that the first and
+    last characters count as much as the others.
+    """
+    padded = f"  {name} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """
+    The normalised titles of a table in sorted order ('names'), with the row of each one ('rows').
+    Movies with the same normalised title are kept in dataset order.
+    """
+
+    __slots__ = ("names", "rows", "_postings")
+
+    def __init__(self, titles):
+        pairs = sorted((normalise_title(title), row) for row, title in enumerate(titles))
+        self.names = [name for name, _ in pairs]
+        self.rows = array("i", (row for _, row in pairs))
+        self._postings = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def exact(self, title):
+        """
+        Return the rows of the movies whose normalised title is the normalised 'title'.
+        """
+        name = normalise_title(title)
+        return list(self.rows[bisect_left(self.names, name):bisect_right(self.names, name)])
+
+    def prefix(self, prefix, limit=None):
+        """
+        Return the rows of the movies whose normalised title starts with the normalised 'prefix', in
+        alphabetical order, or only the first 'limit' of them.
+        """
+        name = normalise_title(prefix)
+        start = bisect_left(self.names, name)
+        stop = bisect_left(self.names, name + PREFIX_END, start)
+        if limit is not None:
+            stop = min(stop, start + max(limit, 0))
+        return list(self.rows[start:stop])
+
+    def postings(self):
+        """
+        Return the inverted index mapping each trigram to the positions (in 'names') of the titles holding it.
+        """
+        if self._postings is None:
+            postings = dict()
+            for position, name in enumerate(self.names):
+                for gram in trigrams(name):
+                    posting = postings.get(gram)
+                    if posting is None:
+                        posting = postings[gram] = array("i")
+                    posting.append(position)
+            self._postings = postings
+        return self._postings
+
+    def fuzzy(self, title, limit=5, threshold=FUZZY_THRESHOLD):
+        """
+        This function finds titles similar to 'title', tolerating typos, by the Jaccard similarity of their
+        trigram sets.
+
+        Only the FUZZY_LISTS shortest posting lists of the query trigrams are read, so very common trigrams
+        such as "the" never are, and the limit * FUZZY_CANDIDATES titles found in most of them are scored
+        exactly. Titles are counted with numpy.unique under the NumPy backend and with a Counter otherwise.
+        The cost is bounded by a few posting lists whatever the size of the catalogue. This is approximate:
+        a title can be missed if it shares few of the rarest query trigrams, which a typo of it rarely does.
+
+        Parameters
+        ----------
+        title : str
+            The (possibly misspelt) title.
+        limit : int
+            The largest number of matches to return.
+        threshold : float
+            The lowest similarity, between 0 and 1, of a match.
+
+        Returns
+        -------
+        list
+            (row, similarity) pairs, most similar first.
+
+        """
+        query = trigrams(normalise_title(title))
+        if not query or limit <= 0:
+            return []
+        postings = self.postings()
+        lists = sorted((postings[gram] for gram in query if gram in postings), key=len)[:FUZZY_LISTS]
+        if not lists:
+            return []
+        candidates = limit * FUZZY_CANDIDATES
+        np = numpy_module()
+        if np is not None:
+            positions, counts = np.unique(np.concatenate([np.frombuffer(posting, dtype=np.int32)
+                                                          for posting in lists]), return_counts=True)
+            if len(positions) > candidates:
+                positions = positions[np.argpartition(-counts, candidates - 1)[:candidates]]
+            positions = positions.tolist()
+        else:
+            counts = Counter()
+            for posting in lists:
+                counts.update(posting)
+            positions = [position for position, _ in counts.most_common(candidates)]
+        scored = []
+        for position in positions:
+            grams = trigrams(self.names[position])
+            shared = len(query & grams)
+            similarity = shared / (len(query) + len(grams) - shared)
+            if similarity >= threshold:
+                scored.append((similarity, -position))
+        return [(self.rows[-negative_position], similarity)
+                for similarity, negative_position in heapq.nlargest(limit, scored)]
+
+
+def title_index(table):
+    """
+    This function returns the TitleIndex of the table, building it the first time it is requested and
+    keeping it in table.indexes.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The dataset, or any mapping with a 'title' column (the index is then not cached).
+
+    Returns
+    -------
+    TitleIndex
+        The index of the titles.
+
+    """
+    indexes = getattr(table, "indexes", None)
+    if indexes is not None and "titles" in indexes:
+        return indexes["titles"]
+    index = TitleIndex(table["title"])
+    if indexes is not None:
+        indexes["titles"] = index
+    return index
+
+
+@profiled()
+def search(table, query, mode="auto", limit=10):
+    """
+    This function looks movies up by title and returns their full records.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The loaded dataset.
+    query : str
+        A title, the start of a title or a misspelt title.
+    mode : str
+        'exact', 'prefix' or 'fuzzy', or 'auto' to try them in that order until one finds a movie.
+    limit : int
+        The largest number of movies to return.
+
+    Returns
+    -------
+    list
+        One dictionary per movie with every column (see MovieTable.record), the kind of 'match' that found
+        it and, for fuzzy matches, the 'similarity' of its title to the query.
+
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown search mode '{mode}', expected one of: {', '.join(MODES)}")
+    index = title_index(table)
+    results = []
+    for kind in ("exact", "prefix", "fuzzy") if mode == "auto" else (mode,):
+        if kind == "fuzzy":
+            matches = index.fuzzy(query, limit)
+        else:
+            matches = [(row, None) for row in (index.exact(query)[:limit] if kind == "exact"
+                                               else index.prefix(query, limit))]
+        for row, similarity in matches:
+            record = table.record(row)
+            record["match"] = kind
+            if similarity is not None:
+                record["similarity"] = round(similarity, 3)
+            results.append(record)
+        if results:
+            break
+    return results
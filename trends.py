@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 15:08:37 2026
+
+@author: A00315995
+
+# Program Name: trends.py
+# purpose: This program follows a numerical column over the release years: its total and mean per year,
+# cumulative totals, year-over-year changes and rolling statistics over windows of several years (e.g. the
+# 5-year rolling mean and median budget). The movies are grouped by year in one pass, then each window is
+# obtained from the previous one by adding the year that enters it and evicting the year that leaves it:
+# counts, totals and sums of squares are updated in constant time per year, and the rolling median is kept
+# by two heaps in which every movie is pushed and removed once, O(n log w) instead of sorting every window.
+"""
+from array import array
+import heapq
+from itertools import accumulate, compress
+from math import sqrt
+
+from backend import numpy_module
+from profiling import profiled
+
+# The statistics of rolling(), in the order they are reported
+WINDOW_STATISTICS = ("count", "total", "mean", "std", "median")
+# The statistics whose change from year to year year_over_year() reports
+YEAR_STATISTICS = ("count", "total", "mean")
+DEFAULT_WINDOW = 5
+
+
+class RollingMoments:
+    """
+    The count, total and sum of squared deviations from a fixed 'shift' of the values in a sliding window.
+    Values enter and leave it as groups (e.g. the movies of one year) given by their count, total and sum of
+    squares about 'shift', which keeps the squares small and the variance accurate.
+    """
+
+    __slots__ = ("shift", "count", "total", "squares")
+
+    def __init__(self, shift=0.0):
+        self.shift = shift
+        self.count = 0
+        self.total = 0.0
+        self.squares = 0.0
+
+    def add(self, count, total, squares):
+        self.count += count
+        self.total += total
+        self.squares += squares
+
+    def remove(self, count, total, squares):
+        self.count -= count
+        self.total -= total
+        self.squares -= squares
+        if not self.count:
+            # an empty window starts again from exact zeros, so rounding errors cannot build up
+            self.total = self.squares = 0.0
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def std_deviation(self):
+        """
+        Return the sample standard deviation of the window, None with fewer than two values.
+        """
+        if self.count < 2:
+            return None
+        offset = self.total - self.count * self.shift
+        return sqrt(max(self.squares - offset * offset / self.count, 0.0) / (self.count - 1))
+
+
+class RollingMedian:
+    """
+    The median of a sliding window of values: the lower half in a max-heap (stored negated) and the upper
+    half in a min-heap. A removed value is only counted in 'delayed' and popped once it reaches the top of
+    its heap, so adding and removing a value cost O(log n).
+    """
+
+    __slots__ = ("low", "high", "low_size", "high_size", "delayed")
+
+    def __init__(self):
+        self.low = []
+        self.high = []
+        # the values of each heap that are still in the window
+        self.low_size = 0
+        self.high_size = 0
+        # value -> number of removed copies still in a heap
+        self.delayed = dict()
+
+    def __len__(self):
+        return self.low_size + self.high_size
+
+    def _prune(self, heap, sign):
+        while heap and self.delayed.get(sign * heap[0]):
+            value = sign * heapq.heappop(heap)
+            self.delayed[value] -= 1
+
+    def _balance(self):
+        if self.low_size > self.high_size + 1:
+            heapq.heappush(self.high, -heapq.heappop(self.low))
+            self.low_size -= 1
+            self.high_size += 1
+            self._prune(self.low, -1)
+        elif self.low_size < self.high_size:
+            heapq.heappush(self.low, -heapq.heappop(self.high))
+            self.high_size -= 1
+            self.low_size += 1
+            self._prune(self.high, 1)
+
+    def add(self, value):
+        if not self.low_size or value <= -self.low[0]:
+            heapq.heappush(self.low, -value)
+            self.low_size += 1
+        else:
+            heapq.heappush(self.high, value)
+            self.high_size += 1
+        self._balance()
+
+    def remove(self, value):
+        """
+        Remove one copy of 'value', which must be in the window.
+        """
+        self.delayed[value] = self.delayed.get(value, 0) + 1
+        if value <= -self.low[0]:
+            self.low_size -= 1
+            self._prune(self.low, -1)
+        else:
+            self.high_size -= 1
+            self._prune(self.high, 1)
+        self._balance()
+
+    def median(self):
+        """
+        Return the median of the window (the mean of the two middle values for an even count), None if empty.
+        """
+        if not self.low_size:
+            return None
+        if self.low_size > self.high_size:
+            return -self.low[0]
+        return (-self.low[0] + self.high[0]) / 2
+
+
+class YearTrend:
+    """
+    A numerical column grouped by release year, for every year from the first to the last (years without a
+    movie have a count of 0). 'years', 'counts' and 'totals' are lists with one entry per year; the values of
+    each year are read through 'order', the rows sorted by year, from position starts[i] to starts[i + 1].
+    """
+
+    def __init__(self, column, years, counts, totals, squares, shift, values, order):
+        self.column = column
+        self.years = years
+        self.counts = counts
+        self.totals = totals
+        self.squares = squares
+        self.shift = shift
+        self.values = values
+        self.order = order
+        self.starts = [0] + list(accumulate(counts))
+
+    def __len__(self):
+        return len(self.years)
+
+    def values_of(self, position):
+        """
+        Return the values of the year at 'position' in 'years', as a list.
+        """
+        rows = self.order[self.starts[position]:self.starts[position + 1]]
+        np = numpy_module()
+        if np is not None:
+            return self.values[rows].tolist()
+        return list(map(self.values.__getitem__, rows))
+
+    def means(self):
+        """
+        Return the mean of each year, None for the years without a movie.
+        """
+        return [total / count if count else None for count, total in zip(self.counts, self.totals)]
+
+    def cumulative(self):
+        """
+        Return the total of the column over the movies released up to and including each year.
+        """
+        return list(accumulate(self.totals))
+
+    def year_over_year(self, statistic="total"):
+        """
+        This function returns the change of a yearly statistic from each year to the next.
+
+        Parameters
+        ----------
+        statistic : str
+            One of YEAR_STATISTICS.
+
+        Raises
+        ------
+        ValueError
+            If the statistic is unknown.
+
+        Returns
+        -------
+        list
+            The change of each year from the year before, in percent; None for the first year and when either
+            year has no movie.
+
+        """
+        if statistic not in YEAR_STATISTICS:
+            raise ValueError(f"Unknown yearly statistic '{statistic}', expected one of: {', '.join(YEAR_STATISTICS)}")
+        series = {"count": self.counts, "total": self.totals, "mean": self.means()}[statistic]
+        changes = [None]
+        for previous, current, count, previous_count in zip(series, series[1:], self.counts[1:], self.counts):
+            changes.append((current - previous) / previous * 100 if count and previous_count and previous else None)
+        return changes
+
+    def rolling(self, window=DEFAULT_WINDOW, statistics=("mean", "median", "total")):
+        """
+        This function computes statistics over a window of 'window' consecutive years ending at each year,
+        sliding the window one year at a time: the year entering it is added and the year leaving it evicted.
+
+        Parameters
+        ----------
+        window : int
+            The number of years of each window.
+        statistics : tuple
+            Names from WINDOW_STATISTICS. The median, the only one needing the values, is kept by a
+            RollingMedian when requested.
+
+        Raises
+        ------
+        ValueError
+            If the window is not positive or a statistic is unknown.
+
+        Returns
+        -------
+        dict
+            For each statistic, a list with one entry per year of 'years': the statistic of the window ending
+            that year, None for the first window - 1 years (incomplete windows), for windows without a movie,
+            and for the standard deviation of windows with a single movie.
+
+        """
+        if window < 1:
+            raise ValueError("The window must hold at least one year")
+        unknown = [statistic for statistic in statistics if statistic not in WINDOW_STATISTICS]
+        if unknown:
+            raise ValueError(f"Unknown window statistic '{unknown[0]}', expected one of: "
+                             f"{', '.join(WINDOW_STATISTICS)}")
+        moments = RollingMoments(self.shift)
+        median = RollingMedian() if "median" in statistics else None
+        results = {statistic: [] for statistic in statistics}
+        for position in range(len(self.years)):
+            moments.add(self.counts[position], self.totals[position], self.squares[position])
+            if median is not None:
+                for value in self.values_of(position):
+                    median.add(value)
+            if position >= window:
+                leaving = position - window
+                moments.remove(self.counts[leaving], self.totals[leaving], self.squares[leaving])
+                if median is not None:
+                    for value in self.values_of(leaving):
+                        median.remove(value)
+            complete = position >= window - 1
+            current = {"count": moments.count, "total": moments.total, "mean": moments.mean(),
+                       "std": moments.std_deviation(), "median": median.median() if median is not None else None}
+            for statistic in statistics:
+                results[statistic].append(current[statistic] if complete else None)
+        return results
+
+
+@profiled()
+def year_trend(table, column):
+    """
+    This function groups a numerical column by release year in one pass: the count, total and sum of
+    squares of each year, and the rows sorted by year (a stable counting sort, or NumPy's stable argsort).
+    Movies whose value is NaN (a derived value that cannot be computed, see derived.py) are left out.
+
+    Parameters
+    ----------
+    table : MovieTable or TableView
+        The dataset.
+    column : str
+        The numerical column, e.g. 'budget'.
+
+    Raises
+    ------
+    ValueError
+        If the table has no movie with a value.
+
+    Returns
+    -------
+    YearTrend
+        The column by year.
+
+    """
+    np = numpy_module()
+    if np is not None:
+        years = np.asarray(table["year"], dtype=np.intp)
+        values = np.asarray(table[column], dtype=np.float64)
+        defined = ~np.isnan(values)
+        if not defined.all():
+            years, values = years[defined], values[defined]
+        if not len(values):
+            raise ValueError(f"Cannot follow '{column}' over the years without a movie")
+        first, last = int(years.min()), int(years.max())
+        offsets = years - first
+        shift = float(values[0])
+        span = last - first + 1
+        counts = np.bincount(offsets, minlength=span).tolist()
+        totals = np.bincount(offsets, weights=values, minlength=span).tolist()
+        squares = np.bincount(offsets, weights=(values - shift) ** 2, minlength=span).tolist()
+        order = np.argsort(offsets, kind="stable")
+        return YearTrend(column, list(range(first, last + 1)), counts, totals, squares, shift, values, order)
+    years, values = table["year"], table[column]
+    if any(value != value for value in values):
+        defined = [value == value for value in values]
+        years, values = list(compress(years, defined)), array("d", compress(values, defined))
+    if not len(values):
+        raise ValueError(f"Cannot follow '{column}' over the years without a movie")
+    first, last = min(years), max(years)
+    shift = values[0]
+    span = last - first + 1
+    counts, totals, squares = [0] * span, [0.0] * span, [0.0] * span
+    for year, value in zip(years, values):
+        offset = year - first
+        counts[offset] += 1
+        totals[offset] += value
+        squares[offset] += (value - shift) * (value - shift)
+    # counting sort of the rows by year: each row goes to the next free position of its year
+    positions = [0] + list(accumulate(counts))
+    order = array("i", bytes(4 * len(years)))
+    for row, year in enumerate(years):
+        offset = year - first
+        order[positions[offset]] = row
+        positions[offset] += 1
+    return YearTrend(column, list(range(first, last + 1)), counts, totals, squares, shift, values, order)
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 10:06:51 2026
+
+@author: A00315995
+
+# Program Name: views.py
+# purpose: This program selects subsets of the movies (e.g. the films of 2010-2019, or the ones with a budget
+# above 100 million USD) without copying their values. A condition on a column gives a Selection, one byte per
+# movie, built in one vectorised pass; conditions are combined with &, | and ~ as whole-bitmap operations. A
+# TableView reads the selected movies through an index array into the loaded columns, and can be given to the
+# calculate_* functions, group_by(), describe() and the charts wherever a MovieTable or a column is accepted.
+"""
+from array import array
+from itertools import compress
+from operator import eq, ge, gt, le, lt, ne
+import re
+
+from backend import numpy_module
+from derived import DERIVED_COLUMNS
+from table import CategoryColumn, Movie
+
+# The comparison operators of where()
+OPERATORS = {"==": eq, "!=": ne, "<": lt, "<=": le, ">": gt, ">=": ge}
+# For the pure-Python backend, the method of the condition's value that compares it with a column value from
+# the other side (x >= value is value.__le__(x)), so that it can be mapped over a column in C
+REFLECTED = {"==": "__eq__", "!=": "__ne__", "<": "__gt__", "<=": "__ge__", ">": "__lt__", ">=": "__le__"}
+# 'in' selects the movies whose value is one of a sequence of values
+MEMBERSHIP = "in"
+# column>=value, column<value, column=value (or value,value,... for one of several values), ...
+CONDITION = re.compile(r"^\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*(.+?)\s*$")
+# Maps every byte 0 to 1 and 1 to 0, to invert a pure-Python selection
+_INVERT = bytes([1, 0]) + bytes(range(2, 256))
+
+
+class Selection:
+    """
+    A set of rows of a table, as one byte per row of the table (1 if the row is selected): a NumPy boolean
+    array under the NumPy backend, a bytes object otherwise. Both hold the same bytes, so selections made
+    under either backend can be combined. &, | and ~ work on the whole bitmap at once: NumPy ufuncs, or
+    operations on the bitmap read as one large integer.
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    @classmethod
+    def all(cls, size):
+        """
+        Return the selection of every row of a table of 'size' rows.
+        """
+        np = numpy_module()
+        return cls(np.ones(size, dtype=bool) if np is not None else b"\x01" * size)
+
+    def __len__(self):
+        return len(self.mask)
+
+    def to_bytes(self):
+        """
+        Return the bitmap as bytes, one byte (0 or 1) per row.
+        """
+        return self.mask if isinstance(self.mask, bytes) else self.mask.tobytes()
+
+    def _combine(self, other, operator):
+        if len(other) != len(self):
+            raise ValueError(f"Cannot combine selections of {len(self)} and {len(other)} rows")
+        np = numpy_module()
+        if np is not None:
+            mine, theirs = (np.frombuffer(selection.mask, dtype=bool) if isinstance(selection.mask, bytes)
+                            else selection.mask for selection in (self, other))
+            return Selection(mine & theirs if operator == "and" else mine | theirs)
+        mine, theirs = (int.from_bytes(selection.to_bytes(), "little") for selection in (self, other))
+        return Selection((mine & theirs if operator == "and" else mine | theirs).to_bytes(len(self), "little"))
+
+    def __and__(self, other):
+        return self._combine(other, "and")
+
+    def __or__(self, other):
+        return self._combine(other, "or")
+
+    def __invert__(self):
+        if isinstance(self.mask, bytes):
+            return Selection(self.mask.translate(_INVERT))
+        return Selection(~self.mask)
+
+    def count(self):
+        """
+        Return the number of selected rows.
+        """
+        return self.mask.count(1) if isinstance(self.mask, bytes) else int(self.mask.sum())
+
+    def rows(self):
+        """
+        Return the selected row numbers in increasing order: a NumPy array under the NumPy backend,
+        an array('i') otherwise.
+        """
+        np = numpy_module()
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.mask, dtype=bool) if isinstance(self.mask, bytes)
+                                  else self.mask)
+        return array("i", compress(range(len(self.mask)), self.to_bytes()))
+
+
+class ColumnView:
+    """
+    The values of a column at a sequence of rows, read from the column when they are accessed. It behaves
+    like a read-only list (len, indexing, slicing, iteration, index and count), and NumPy reads it as an array
+    of the selected values, gathered when a vectorised statistic needs them and dropped afterwards.
+    """
+
+    __slots__ = ("column", "rows")
+
+    def __init__(self, column, rows):
+        self.column = column
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.column, self.rows[index])
+        return self.column[self.rows[index]]
+
+    def __iter__(self):
+        return map(self.column.__getitem__, self.rows)
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+
+        return numpy.asarray(self.column, dtype=dtype)[numpy.asarray(self.rows, dtype=numpy.intp)]
+
+    def index(self, value):
+        """
+        Return the position of the first selected row holding 'value', the same as list.index().
+        """
+        for position, item in enumerate(self):
+            if item == value:
+                return position
+        raise ValueError(f"{value!r} is not in column")
+
+    def count(self, value):
+        """
+        Return the number of selected rows holding 'value', the same as list.count().
+        """
+        return sum(1 for item in self if item == value)
+
+
+class CategoryView(ColumnView):
+    """
+    The view of a dictionary-encoded CategoryColumn: 'codes' views the codes of the selected rows and
+    'categories' are the column's distinct values, so group_by() groups it by code like the column itself.
+    """
+
+    __slots__ = ()
+
+    @property
+    def codes(self):
+        return ColumnView(self.column.codes, self.rows)
+
+    @property
+    def categories(self):
+        return self.column.categories
+
+    def __iter__(self):
+        return map(self.column.categories.__getitem__, map(self.column.codes.__getitem__, self.rows))
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+
+        return numpy.asarray(list(self), dtype=dtype)
+
+
+def where(table, column, operator, value):
+    """
+    This function selects the movies whose value of 'column' satisfies a condition, in one vectorised pass:
+    a NumPy comparison, or under the pure-Python backend the comparison method of 'value' mapped over the
+    column in C. Category columns (decade, title) are compared once per distinct value and then selected by code.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The dataset.
+    column : str
+        The column name.
+    operator : str
+        One of OPERATORS, or MEMBERSHIP ('in') for a sequence of values.
+    value : object
+        The value to compare with, e.g. 2010 or "2010's", or a sequence of values for 'in'.
+
+    Raises
+    ------
+    ValueError
+        If the operator is unknown.
+
+    Returns
+    -------
+    Selection
+        The selected rows.
+
+    """
+    if operator != MEMBERSHIP and operator not in OPERATORS:
+        raise ValueError(f"Unknown operator '{operator}', expected one of: {', '.join(OPERATORS)}, {MEMBERSHIP}")
+    data = table[column]
+    np = numpy_module()
+    if isinstance(data, CategoryColumn):
+        codes = [code for code, category in enumerate(data.categories)
+                 if _compare(category, operator, value if operator == MEMBERSHIP else str(value))]
+        if np is not None:
+            return Selection(np.isin(np.frombuffer(data.codes, dtype=np.int32), codes))
+        return Selection(bytes(map(frozenset(codes).__contains__, data.codes)))
+    if operator == MEMBERSHIP:
+        values = [float(item) for item in value]
+    else:
+        value = float(value)
+    if np is not None:
+        data = np.asarray(data)
+        if operator == MEMBERSHIP:
+            return Selection(np.isin(data, values))
+        return Selection(OPERATORS[operator](data, value))
+    if operator == MEMBERSHIP:
+        return Selection(bytes(map(frozenset(values).__contains__, data)))
+    return Selection(bytes(map(getattr(value, REFLECTED[operator]), data)))
+
+
+def _compare(item, operator, value):
+    """
+    Return True if 'item' satisfies the condition, for the few distinct values of a category column.
+    """
+    return item in value if operator == MEMBERSHIP else OPERATORS[operator](item, value)
+
+
+def between(table, column, low=None, high=None):
+    """
+    Return the selection of the movies whose value of 'column' is between 'low' and 'high' (both included);
+    a missing bound is not checked, e.g. between(table, "budget", 100) selects budgets of at least 100.
+    """
+    selection = Selection.all(len(table))
+    if low is not None:
+        selection &= where(table, column, ">=", low)
+    if high is not None:
+        selection &= where(table, column, "<=", high)
+    return selection
+
+
+def year_range(table, first, last):
+    """
+    Return the selection of the movies released from year 'first' to year 'last', both included.
+    """
+    return between(table, "year", first, last)
+
+
+def decades(table, *names):
+    """
+    Return the selection of the movies of the decades 'names', e.g. decades(table, "2000's", "2010's").
+    """
+    return where(table, "decade", MEMBERSHIP, names)
+
+
+def domestic_share(table, low=None, high=None):
+    """
+    Return the selection of the movies whose domestic share of the worldwide gross, in percent, is between
+    'low' and 'high'.
+    """
+    return between(table, "domestic_pct", low, high)
+
+
+def parse_condition(text):
+    """
+    This function reads a condition written as on the command line: a column name, an operator and a value,
+    e.g. 'year>=2010', 'budget<50' or 'decade=2000's,2010's' (= with several comma separated values selects
+    any of them).
+
+    Raises
+    ------
+    ValueError
+        If the text is not a condition.
+
+    Returns
+    -------
+    tuple
+        (column, operator, value), the arguments of where() after the table.
+
+    """
+    match = CONDITION.match(text)
+    if match is None:
+        raise ValueError(f"Cannot read the condition '{text}', expected e.g. year>=2010 or decade=2010's")
+    column, operator, value = match.groups()
+    if operator == "=":
+        values = [item.strip() for item in value.split(",")]
+        return (column, "==", values[0]) if len(values) == 1 else (column, MEMBERSHIP, values)
+    return column, operator, value
+
+
+class TableView:
+    """
+    The movies of a MovieTable picked by a Selection. Columns are read with view["budget"] as a ColumnView
+    (a CategoryView for decade and title) through the array of selected rows, so no value is copied; movies
+    are read with view.movie(position) or by iterating as Movie views of the table. 'indexes' caches the
+    structures built from the view (e.g. its rank indexes) like MovieTable.indexes.
+
+    A view belongs to the table as it was when the view was made: make a new one after appending rows.
+    """
+
+    def __init__(self, table, selection):
+        if len(selection) != len(table):
+            raise ValueError(f"A selection of {len(selection)} rows cannot view a table of {len(table)} rows")
+        self.table = table
+        self.selection = selection
+        self.rows = selection.rows()
+        self.indexes = dict()
+
+    def where(self, column, operator, value):
+        """
+        Return the view of the movies of this view that also satisfy a condition (see where()).
+        """
+        return TableView(self.table, self.selection & where(self.table, column, operator, value))
+
+    def column(self, name):
+        """
+        Return the view of the column called 'name' at the selected rows.
+        """
+        column = self.table.column(name)
+        return (CategoryView if isinstance(column, CategoryColumn) else ColumnView)(column, self.rows)
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def movie(self, position):
+        """
+        Return the Movie view of the selected movie at 'position' (from 0) in the view.
+        """
+        return Movie(self.table, int(self.rows[position]))
+
+    def record(self, position):
+        """
+        Return every column of the selected movie at 'position' as a dictionary (see MovieTable.record).
+        """
+        return self.table.record(int(self.rows[position]))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return (Movie(self.table, int(row)) for row in self.rows)
+
+
+def defined(table, columns):
+    """
+    This function leaves out the movies whose value of a derived column is NaN because it cannot be computed
+    (e.g. the return on investment of a movie with a budget of 0, see derived.py), before statistics,
+    correlations or bootstrap intervals are computed over 'columns'.
+
+    Parameters
+    ----------
+    table : MovieTable or TableView
+        The dataset, or a view of it.
+    columns : sequence
+        The column names the result is computed from; only the derived ones can hold NaN.
+
+    Returns
+    -------
+    MovieTable or TableView
+        'table' itself if every value is defined, otherwise the view of the movies with a value in every column.
+
+    """
+    base, selection = (table.table, table.selection) if isinstance(table, TableView) else (table, None)
+    np = numpy_module()
+    masks = []
+    for column in columns:
+        if column not in DERIVED_COLUMNS:
+            continue
+        data = base[column]
+        if np is not None:
+            mask = ~np.isnan(np.asarray(data))
+            if not mask.all():
+                masks.append(Selection(mask))
+        elif any(value != value for value in data):
+            # NaN is the only value not equal to itself
+            masks.append(Selection(bytes(map(eq, data, data))))
+    if not masks:
+        return table
+    for mask in masks:
+        selection = mask if selection is None else selection & mask
+    return TableView(base, selection)
+
+
+def filter_table(table, conditions):
+    """
+    This function returns the view of the movies that satisfy every condition.
+
+    Parameters
+    ----------
+    table : MovieTable
+        The dataset.
+    conditions : iterable
+        (column, operator, value) tuples, see where() and parse_condition().
+
+    Returns
+    -------
+    TableView
+        The selected movies.
+
+    """
+    selection = Selection.all(len(table))
+    for column, operator, value in conditions:
+        selection &= where(table, column, operator, value)
+    return TableView(table, selection)